@@ -15,17 +15,88 @@
 |   The amount value can be anything. If it is not a positive integer it will default to 0                      |
 +---------------------------------------------------------------------------------------------------------------+
 """
-import maya.cmds as cmds
-from maya import OpenMayaUI
-from shiboken2 import wrapInstance
-from collections import OrderedDict
-import sys
-from PySide2.QtWidgets import (QLineEdit, QPushButton, QApplication, QWidget,
-    QVBoxLayout, QDialog)
+from collections import OrderedDict, namedtuple
+import json
+import time
+import types
+import weakref
+from autoRig import geometry
+from autoRig import frames
+from autoRig import shapes
+from autoRig import profiler
+from autoRig import placements
+from autoRig import plan as buildPlan
+class MayaBackend():
+    """stands in for maya.cmds until the builder first talks to the scene, so importing the builder needs no maya.
+    
+    On first use maya.cmds is imported and takes over as the backend.
+    Outside of maya that import fails, use setBackend to give the builder a scene (see autoRig.memoryScene).
+    """
+    def __getattr__(self,name):
+        global cmds
+        try:
+            import maya.cmds as mayaCmds
+        except ImportError:
+            raise ImportError('maya.cmds is not available, use setBackend to give the builder a scene (see autoRig.memoryScene)')
+        if cmds is self:
+            cmds = mayaCmds
+        return getattr(mayaCmds,name)
+cmds = MayaBackend()  #the scene the builder talks to, see setBackend
+def setBackend(backend):
+    """Swap the scene the builder talks to.
+    
+    Every command the builder runs goes through this module's cmds, any object with the same functions as maya.cmds can be used.
+    
+    Arguments:
+        backend {module} -- maya.cmds or a stand in such as autoRig.memoryScene.MemoryScene().
+    
+    Returns:
+        module -- The backend that was in use before.
+    """
+    global cmds
+    previous = cmds
+    cmds = backend
+    return previous
+def getBackend():
+    """Get the scene the builder is talking to.
+    
+    Returns:
+        module -- The backend in use.
+    """
+    return cmds
+_profiler = None  #the profiler recording builds, see setProfiler
+_clock = getattr(time,'perf_counter',time.time)
+def setProfiler(buildProfiler):
+    """Record where builds spend their time.
+    
+    Wraps the current backend so every call is timed against the build stage it was made in.
+    
+    Arguments:
+        buildProfiler {autoRig.profiler.Profiler} -- The profiler to record with, None stops recording and puts the backend back.
+    
+    Returns:
+        autoRig.profiler.Profiler -- The profiler that was in use before.
+    """
+    global _profiler
+    previous = _profiler
+    if previous is not None:
+        setBackend(previous.backend)
+    _profiler = buildProfiler
+    if buildProfiler is not None:
+        setBackend(buildProfiler.wrap(cmds))
+    return previous
+def profileStage(name):
+    """A context that records its block as a stage, does nothing if no profiler is set."""
+    return profiler.Stage(_profiler,name)
+def profileMark(name):
+    """Move the current stage on to a new sub stage, does nothing if no profiler is set."""
+    if _profiler is not None:
+        _profiler.mark(name)
 def checkExists(nodeName):
     """handles the naming of items
     
     checks if the object exits inside maya and if it does iterate the suffix until a empty name is found
+    queries maya once per suffix, use a NameRegistry when creating lots of nodes with the same prefix
     
     Arguments:
         nodeName {string} -- input node name to check
@@ -34,24 +105,441 @@ def checkExists(nodeName):
         string -- output string for the given node
     """
     n = 1
-    nodeNameOut = nodeName + '_{:02d}'.format(n)            #adds 01 to the end of the input
-    while True:
-        if cmds.objExists(nodeNameOut):                     #while the name exists in Maya
-            nodeNameOut = nodeName + '_{:02d}'.format(n)    #apply the same rule
-            n += 1                                          #increment the value
+    while cmds.objExists(nodeName + '_{:02d}'.format(n)):  #while the name exists in Maya
+        n += 1                                              #increment the value
+    return nodeName + '_{:02d}'.format(n)                   #adds the first free suffix to the end of the input
+class NameRegistry():
+    """hands out unique node names.
+    
+    The first time a prefix is asked for, the names already in the scene are found with a single wildcard query.
+    After that suffixes are handed out from memory so naming a node doesn't need any more round trips to maya.
+    One registry should be used per build, nodes created outside of it while it is in use are not seen.
+    """
+    def __init__(self):
+        self.taken = {}  #prefix : set of suffix numbers already used
+        self.next = {}  #prefix : the next suffix number to try
+    def snapshot(self,nodeName):
+        """Find the suffixes already used for a prefix.
+        
+        Arguments:
+            nodeName {string} -- The prefix to look up.
+        
+        Returns:
+            set -- The suffix numbers that already exist in the scene.
+        """
+        used = set()
+        start = len(nodeName) + 1
+        for item in cmds.ls(nodeName + '_*') or []:  #one wildcard query for every node using the prefix
+            item = item.split('|')[-1]  #long names are returned if the short name isn't unique
+            suffix = item[start:]
+            if suffix.isdigit() and '{:02d}'.format(int(suffix)) == suffix:  #only suffixes this naming scheme would have made (skips _01_A, _007 ect)
+                used.add(int(suffix))
+        return used
+    def name(self,nodeName):
+        """Get a unique name.
+        
+        Drop in replacement for checkExists.
+        
+        Arguments:
+            nodeName {string} -- input node name to check
+        
+        Returns:
+            string -- output string for the given node
+        """
+        if nodeName not in self.taken:
+            self.taken[nodeName] = self.snapshot(nodeName)
+            self.next[nodeName] = 1
+        taken = self.taken[nodeName]
+        n = self.next[nodeName]
+        while n in taken:  #only steps over names that existed before the build, so this stays O(1) per name
+            n += 1
+        taken.add(n)
+        self.next[nodeName] = n + 1
+        return nodeName + '_{:02d}'.format(n)
+class BuildSession():
+    """runs a build as one step.
+    
+    Opens a single undo chunk, suspends the viewport refresh and stops the helpers clearing the selection after every step.
+    If anything inside raises, everything made is undone (or deleted when undo is turned off) and the selection is put back.
+    Sessions can be nested, only the outer one does anything.
+    
+        with BuildSession('spineRig'):
+            ...
+    """
+    active = 0  #how many sessions are open
+    serial = 0  #counts outer sessions, handle paths cached in an earlier one are looked up again
+    def __init__(self,name='autoRig'):
+        self.name = name
+        self.outer = False
+    def __enter__(self):
+        self.outer = BuildSession.active == 0
+        BuildSession.active += 1
+        if not self.outer:
+            return self
+        BuildSession.serial += 1
+        NodeHandle.paths = PathTree()  #the handles whose paths the session keeps up to date
+        with profileStage('session'):  #the sessions own calls, apart from the builds
+            try:
+                self.selection = cmds.ls(sl=1,long=1) or []
+                self.undo = cmds.undoInfo(q=1,state=1)
+            except Exception:  #no scene to build in, the session never opened
+                BuildSession.active -= 1
+                NodeHandle.paths = None
+                raise
+            self.before = None
+            if self.undo:
+                cmds.undoInfo(openChunk=1,chunkName=self.name)
+            else:
+                self.before = set(cmds.ls(uuid=1) or [])  #without undo we need to know what to delete
+            cmds.refresh(suspend=1)
+        return self
+    def __exit__(self,excType,excValue,traceback):
+        BuildSession.active -= 1
+        if not self.outer:
+            return False
+        NodeHandle.paths = None
+        with profileStage('session'):
+            try:
+                if self.undo:
+                    cmds.undoInfo(closeChunk=1)
+                if excType is not None:
+                    self.rollback()
+                else:
+                    NodeHandle.settle()  #handles made in the session get their uuids so they can be found after it
+                    cmds.select(cl=1)  #builds finish with nothing selected
+            finally:
+                cmds.refresh(suspend=0)
+        return False
+    def rollback(self):
+        """Remove everything made since the session opened and restore the selection.
+        
+        With undo on the whole chunk is undone, with it off only the new nodes can be removed, edits to nodes that already existed stay.
+        """
+        if self.undo:
+            cmds.undo()
+        else:
+            made = [uuid for uuid in cmds.ls(uuid=1) or [] if uuid not in self.before]
+            for node in cmds.ls(made) or []:
+                if cmds.objExists(node):  #children go with their parents
+                    cmds.delete(node)
+        selection = [node for node in self.selection if cmds.objExists(node)]
+        if selection:
+            cmds.select(selection)
         else:
-            break
-    return nodeNameOut
+            cmds.select(cl=1)
+class PathTree():
+    """the handles a BuildSession keeps up to date, by dag path.
+    
+    Every path with handles on or under it has a branch, the handles on it and the paths of its children,
+    so moving a node only walks the branches under it. Only lives as long as the session, so it holds the handles it has.
+    """
+    def __init__(self):
+        self.branches = {}  #full path : (handles, child paths)
+    def branch(self,path):
+        """The branch for a full path, made along with any of its parents that are missing."""
+        found = self.branches.get(path)
+        if found is None:
+            found = self.branches[path] = ([],[])
+            parent = path[:path.rindex('|')]
+            while parent:  #link it to its parents until one is already there
+                above = self.branches.get(parent)
+                if above is not None:
+                    above[1].append(path)
+                    break
+                self.branches[parent] = ([],[path])
+                path, parent = parent, parent[:parent.rindex('|')]
+        return found
+    def add(self,handle):
+        """Keep a handle's cached path up to date."""
+        self.branch(handle._path)[0].append(handle)
+    def move(self,old,new):
+        """Move the branches of a node that has been parented and set the path of every handle on them.
+        
+        Arguments:
+            old {string} -- The full path before.
+            new {string} -- The full path after.
+        """
+        if old not in self.branches:  #no handles on or under it
+            return
+        parent = self.branches.get(old[:old.rindex('|')])
+        if parent is not None:
+            parent[1].remove(old)
+        todo = [(old,None)]
+        while todo:  #parents are moved before their children
+            path, above = todo.pop()
+            handles, children = self.branches.pop(path)
+            moved = new + path[len(old):]
+            for handle in handles:
+                handle._path = moved
+            if above is None:  #the moved node itself, linked to its new parent
+                there = self.branch(moved)
+            else:
+                there = self.branches.get(moved)
+                if there is None:
+                    there = self.branches[moved] = ([],[])
+                    above[1].append(moved)
+            there[0].extend(handles)  #a node that was at the new path before keeps its handles there too
+            todo.extend((child,there) for child in children)
+class NodeHandle():
+    """a node that stays found when it is renamed, parented or its short name stops being unique.
+    
+    Backed by the nodes uuid with its full dag path cached.
+    Inside a BuildSession the path is kept up to date as the builder parents nodes (see reparent and PathTree), so using a handle costs no queries.
+    Outside of one the path is looked up from the uuid every time it is used, so it follows anything done to the node since.
+    A handle formats as its path so it goes wherever a node name did ('{}.tx'.format(handle), handle + '.tx'), give cmds str(handle).
+    """
+    unsettled = weakref.WeakSet()  #handles without a uuid yet, see settle
+    paths = None  #the open sessions PathTree
+    def __init__(self,path=None,uuid=None):
+        """Make a handle.
+        
+        Keyword Arguments:
+            path {string} -- The nodes full dag path, for nodes the builder has just made. (default: {None})
+            uuid {string} -- The nodes uuid, looked up when it is first needed if not given. (default: {None})
+        """
+        self._path = path
+        self._uuid = uuid
+        self._session = None  #the session the cached path was found in
+        if path is not None:
+            self.track()
+        if self._uuid is None:
+            NodeHandle.unsettled.add(self)
+    @classmethod
+    def fromName(cls,name):
+        """Get a handle for a node that already exists.
+        
+        Arguments:
+            name {string} -- The nodes name or path, it has to be unique.
+        
+        Returns:
+            NodeHandle -- The handle.
+        """
+        found = cmds.ls(name,uuid=1) or []
+        if len(found) != 1:
+            raise ValueError('{} objects match name: {}'.format('More than one' if found else 'No',name))
+        return cls(uuid=found[0])
+    @classmethod
+    def atWorld(cls,name):
+        """Get a handle for a node just made under the world, no queries.
+        
+        Arguments:
+            name {string} -- The name the create command returned.
+        
+        Returns:
+            NodeHandle -- The handle.
+        """
+        return cls('|' + name.split('|')[-1])
+    def child(self,name):
+        """Get a handle for a node just made under this one, no queries.
+        
+        Arguments:
+            name {string} -- The name the create command returned.
+        
+        Returns:
+            NodeHandle -- The handle.
+        """
+        return NodeHandle('{}|{}'.format(self.path,name.split('|')[-1]))
+    @property
+    def path(self):
+        """The full dag path."""
+        if self._uuid and (self._path is None or not BuildSession.active or self._session != BuildSession.serial):
+            found = cmds.ls(self._uuid,long=1)
+            if not found:
+                raise ValueError('No object matches name: {} (it has been deleted)'.format(self._path or self._uuid))
+            self._path = found[0]
+            self.track()
+        return self._path
+    def track(self):
+        """Have the open session keep the cached path up to date, outside of one the path is looked up from the uuid every time."""
+        self._session = None
+        if BuildSession.active and NodeHandle.paths is not None:
+            self._session = BuildSession.serial
+            NodeHandle.paths.add(self)
+        elif self._uuid is None:  #nothing would move the path, so it needs the uuid now
+            self._uuid = (cmds.ls(self._path,uuid=1) or [None])[0]
+    @property
+    def name(self):
+        """The short name."""
+        return self.path.split('|')[-1]
+    @property
+    def uuid(self):
+        """The uuid, looked up along with every other handle missing one the first time it is asked for."""
+        if self._uuid is None:
+            NodeHandle.settle()
+        return self._uuid
+    def exists(self):
+        """Check the node is still in the scene."""
+        if self._uuid:
+            return bool(cmds.ls(self._uuid))
+        return cmds.objExists(self._path)
+    def __str__(self):
+        return self.path
+    def __format__(self,spec):
+        return format(self.path,spec)
+    def __add__(self,other):
+        return self.path + other
+    def __radd__(self,other):
+        return other + self.path
+    def __repr__(self):
+        return 'NodeHandle({!r})'.format(self._path or self._uuid)
+    @classmethod
+    def moved(cls,old,new):
+        """Move the cached path of a node and everything under it after it has been parented.
+        
+        Arguments:
+            old {string} -- The full path before.
+            new {string} -- The full path after.
+        """
+        if BuildSession.active and cls.paths is not None:
+            cls.paths.move(old,new)
+    @classmethod
+    def settle(cls):
+        """Look up the uuid of every handle that doesn't have one yet, in one query."""
+        handles = [handle for handle in list(cls.unsettled) if handle._uuid is None and handle._path is not None]
+        cls.unsettled.clear()  #a deleted node never gets one, the handle keeps its last path
+        if not handles:
+            return
+        paths = [handle._path for handle in handles]
+        uuids = cmds.ls(paths,uuid=1) or []
+        if len(uuids) != len(paths):  #some have been deleted, look them up one at a time
+            uuids = [(cmds.ls(path,uuid=1) or [None])[0] for path in paths]
+        for handle, uuid in zip(handles,uuids):
+            handle._uuid = uuid
+def shortName(node):
+    """The short name of a handle or node name."""
+    return str(node).split('|')[-1]
+def reparent(children,parent):
+    """Parent nodes, moving the cached paths of their handles with them.
+    
+    Arguments:
+        children {list} -- The nodes to parent, handles or names.
+        parent {NodeHandle} -- The node to parent them under, a handle or name.
+    
+    Returns:
+        list -- The children's new names, what cmds.parent returns.
+    """
+    old = [child.path if isinstance(child,NodeHandle) else (cmds.ls(child,long=1) or [child])[0] for child in children]
+    parentPath = parent.path if isinstance(parent,NodeHandle) else (cmds.ls(parent,long=1) or [parent])[0]
+    names = cmds.parent(*(old + [parentPath])) or []
+    for path, name in zip(old,names):
+        NodeHandle.moved(path,'{}|{}'.format(parentPath,name.split('|')[-1]))
+    return names
+def clearSelection():
+    """Clear the selection, skipped while a BuildSession is open as the session clears it once at the end."""
+    if not BuildSession.active:
+        cmds.select(cl=1)
+SPINE_RECORD = 'autoRigSpine'  #string attribute on a spine rigs cog group holding what it was built from, see BuildRigs.recordSpineRig
+CONSTRAINT_MODES = ('constraints','matrix')  #how the spine rig is wired, constraint nodes or matrix nodes driving offsetParentMatrix (maya 2020+)
+class _Recorded():
+    """a spine rig setting that wasn't given, see RECORDED."""
+    def __repr__(self):
+        return 'RECORDED'
+RECORDED = _Recorded()  #a setting left out of buildSpineRig or updateSpineRig, an update keeps what the rig was built with and a new build uses SPINE_SETTINGS
+SPINE_SETTINGS = OrderedDict([('switchMode','network'),('fkFalloff','dropoff'),('constraintMode','constraints'),('bindJointAmount',None),('aimJoints',False)])  #the settings an update keeps unless they are given, with what a new build uses
+FLAT_GROUPS = ('hipOffset','chestOffset','chestCtrlGrp','ikChainGrp','fkChainGrp','resultChainGrp','lwrBndGrp','uprBndGrp','fk01Offset','fk02Offset','fk03Offset')  #the zero out groups a flattened spine rig doesn't make
+FitRig = namedtuple('FitRig',('hipCtrl','chestCtrl','hipLoc','chestLoc','rootCtrl','hipFinderLoc','chestFinderLoc','spineLineCrv','rootGrp'))  #the fit rig nodes, indexes still work as they did
+SpineRig = namedtuple('SpineRig',('cog','hipCtrl','chestCtrl','fkCtrls','fkCtrlGrps','bindJnts','chainGrps','doNotTouch','ikChain','fkChain','resultChain','spline','bindChain'))  #the spine rig nodes, see recordSpineRig
+TRANSFORM_CHANNELS = ('translateX','translateY','translateZ','rotateX','rotateY','rotateZ','scaleX','scaleY','scaleZ')
+COLOURS = { 'black':1,  #specified common colors with their numerical value
+            'white':16,
+            'red':13,
+            'blue':6,
+            'yellow':17,
+            'pink':9,
+            'rose':4,
+            'ocean':15
+            }
+class AttrStates():
+    """collects attribute states and applies them in one pass.
+    
+    Lock, keyable and channel box state plus plain values (rotation order, color overrides) are recorded per attribute during a build.
+    Asking for the same state twice only writes it once and a later request replaces an earlier one, so every attribute is written once when apply is called.
+    """
+    def __init__(self):
+        self.clear()
+    def clear(self):
+        """Forget everything recorded and reset the counts."""
+        self.states = OrderedDict()  #(node, attr) : {'lock','keyable','channelBox'}
+        self.values = OrderedDict()  #(node, attr) : value
+        self.report = {'requested':0,'applied':0,'skipped':0,'setAttr':0}
+    def setState(self,node,attrs,lock=None,keyable=None,channelBox=None):
+        """Record the channel box state of attributes.
+        
+        Arguments:
+            node {string} -- The node.
+            attrs {list} -- The attribute names ('tx','ry','v' ect).
+        
+        Keyword Arguments:
+            lock {bool} -- Lock or unlock, None leaves it alone. (default: {None})
+            keyable {bool} -- Keyable or not, None leaves it alone. (default: {None})
+            channelBox {bool} -- Shown in the channel box or not, None leaves it alone. (default: {None})
+        """
+        flags = [(flag,bool(value)) for flag, value in (('lock',lock),('keyable',keyable),('channelBox',channelBox)) if value is not None]
+        for attr in attrs:
+            self.report['requested'] += 1
+            self.states.setdefault((node,attr),{}).update(flags)
+    def setValue(self,node,attr,value):
+        """Record a value for an attribute.
+        
+        Arguments:
+            node {string} -- The node.
+            attr {string} -- The attribute name.
+            value {int} -- The value to set.
+        """
+        self.report['requested'] += 1
+        self.values[(node,attr)] = value
+    def apply(self):
+        """Write everything recorded since the last apply.
+        
+        Values are set first, then the lock, keyable and channel box states.
+        
+        Returns:
+            dict -- Running totals, 'requested' attributes asked for, 'applied' attributes written, 'skipped' requests that were redundant or replaced and 'setAttr' calls made.
+        """
+        for (node, attr), value in self.values.items():
+            cmds.setAttr('{}.{}'.format(node,attr),value)
+            self.report['setAttr'] += 1
+        for (node, attr), state in self.states.items():
+            plug = '{}.{}'.format(node,attr)
+            if self._keyableLast(state):
+                flags = dict((flag,value) for flag, value in state.items() if flag != 'keyable')
+                cmds.setAttr(plug,**flags)
+                cmds.setAttr(plug,keyable=1)
+                self.report['setAttr'] += 2
+            else:
+                cmds.setAttr(plug,**state)
+                self.report['setAttr'] += 1
+        self.report['applied'] += len(self.values) + len(self.states)
+        self.report['skipped'] = self.report['requested'] - self.report['applied']
+        self.states = OrderedDict()
+        self.values = OrderedDict()
+        return dict(self.report)
+    def calls(self):
+        """The setAttr calls apply would make for what is recorded so far."""
+        return len(self.values) + sum(2 if self._keyableLast(state) else 1 for state in self.states.values())
+    @staticmethod
+    def _keyableLast(state):
+        return state.get('keyable') and (state.get('lock') is False or state.get('channelBox'))  #keyable needs to be done after its shown on the channel box and unlocked otherwise it wont work
 class MakeNodes():
     """handles the creation of nodes.
     
     A collection of functions that help create nodes needed for the AutoRig.
     """
+    def __init__(self,names=None,templates=False):
+        """Set up the name registry.
+        
+        Keyword Arguments:
+            names {NameRegistry} -- The registry used to name nodes, a new one is made if not given. (default: {None})
+            templates {bool} -- Duplicate custom curves from a template instead of building each one, see createCurve. (default: {False})
+        """
+        self.names = names if names is not None else NameRegistry()
+        self.templates = templates
     def circleCtrl(self,charName,crvPrefix,nodeUse,amount,padding,radius,sweep):
         """Create cirlces.
         
         Creates 1 or more circles of a specified radius, sweep and uses padding to stack them.
-        It then parents the shape nodes under one transform.
+        The cvs of every circle are worked out first, already stacked and centered on the world origin.
+        Then one transform is made and each circle is added to it as a shape node.
         
         Arguments:
             charName {string} -- The characters name.
@@ -63,7 +551,7 @@ class MakeNodes():
             sweep {int} -- How much of the circumference is created.
         
         Returns:
-            string -- Return the shape name.
+            NodeHandle -- Return the shape node.
         """
         self.charName = charName
         self.crvPrefix = crvPrefix
@@ -72,27 +560,25 @@ class MakeNodes():
         self.padding = padding
         self.radius = radius
         self.sweep = sweep
-        circle01Name = checkExists('{}_{}_{}'.format(self.charName,self.crvPrefix,self.nodeUse))  #get valid name
-        circle01 = cmds.circle(n = circle01Name,c=(0,0,0),nr=(0,1,0),sw=self.sweep,r=self.radius,d=3,s=8,ch=0)[0]  #create circle
-        if amount > 1:  #if multiple circles to be made
-            for i in range(1,self.amount):
-                newShapeName = circle01Name + '_' + chr(i+65)  #adds A,B ect to end of shape node.
-                newCircle = cmds.circle(n = newShapeName,c=(0,0,0),nr=(0,1,0),sw=self.sweep,r=self.radius,d=3,s=8,ch=0)[0]  #create circle
-                circle02Shape = cmds.listRelatives(newCircle)  #get the shape node
-                cmds.xform(newCircle,translation=(0,self.padding * (i),0))  #move the circle up
-                cmds.makeIdentity(newCircle,a=1,t=1,r=1,s=1,n=0,pn=1)  #freeze its transforms
-                cmds.parent(circle02Shape,circle01,r=1,s=1)  #parent its shape to the original circle created outside the loop
-                cmds.delete(newCircle)  #delete the left over transform node
-        cmds.xform(circle01,cp=1)  #center the circles pivot
-        piv = cmds.xform(circle01,q=1,piv=1)[1]  #get the location of the pivot
-        cmds.xform(circle01,translation=(0,piv*-1,0))  #multiply that location by -1 and move it in that direction (putting it back in world center)
-        cmds.select(cl=1)  #clear selection
-        return circle01
+        circle01Name = self.names.name('{}_{}_{}'.format(self.charName,self.crvPrefix,self.nodeUse))  #get valid name
+        points, knots, periodic = geometry.circlePoints(self.radius,8,self.sweep,3,(0,1,0))
+        spans = len(points) - 3
+        centre = self.padding * (max(self.amount,1) - 1) / 2.0  #the middle of the stack goes on the world center
+        circle01 = cmds.createNode('transform',n=circle01Name,ss=1)
+        for i in range(0,max(self.amount,1)):
+            shapeName = circle01Name + 'Shape' if i == 0 else circle01Name + '_' + chr(i+65) + 'Shape'  #adds A,B ect to end of shape node.
+            offset = self.padding * i - centre  #stack the circles up
+            ring = [(p[0],p[1] + offset,p[2]) for p in points]
+            shape = cmds.createNode('nurbsCurve',n=shapeName,p=circle01,ss=1)
+            cmds.setAttr(shape + '.cc',3,spans,2 if periodic else 0,False,3,len(knots),knots,len(ring),*ring,type='nurbsCurve')  #degree, spans, form, rational, dimension, knots, cvs
+        clearSelection()  #clear selection
+        return NodeHandle.atWorld(circle01)
     def createCurve(self,charName,shape,crvPrefix,nodeUse):
         """Create custom curves.
         
-        Uses predefined point locations to create custom curve shapes.
+        Uses predefined point locations from the shape library (autoRig.shapes) to create custom curve shapes.
         Good for character controlleres.
+        In template mode the first curve of a shape is built once as a hidden template and every curve after is a duplicate of it.
         
         Arguments:
             charName {string} -- The characers name.
@@ -101,216 +587,39 @@ class MakeNodes():
             nodeUse {string} -- Adds a suffix to say the nodes use.
         
         Returns:
-            string -- Returns the shape node.
+            NodeHandle -- Returns the shape node.
         """
         self.charName = charName
         self.shape = shape
         self.crvPrefix = crvPrefix
         self.nodeUse = str(nodeUse)
-        shapeName = checkExists('{}_{}_{}'.format(self.charName,self.crvPrefix,self.nodeUse))  #validate name
-        sh01 = {    "points": [ (-1.5,1.5,1.5),  #a dictionary containing the custom shapes points and knot values
-                    (1.5,1.5,1.5),               #data was extracted from a shape using a xform over the nodes cvs and returning those values here
-                    (1.5,-1.5,1.5),              #knot range is len(cv) + d - 1
-                    (1.5,-1.5,-1.5),
-                    (1.5,1.5,-1.5),
-                    (-1.5,1.5,-1.5),
-                    (-1.5,-1.5,-1.5),
-                    (-1.5,-1.5,1.5),
-                    (-1.5,1.5,1.5),
-                    (-1.5,1.5,-1.5),
-                    (-1.5,-1.5,-1.5),
-                    (1.5,-1.5,-1.5),
-                    (1.5,1.5,-1.5),
-                    (1.5,1.5,1.5),
-                    (1.5,-1.5,1.5),
-                    (-1.5,-1.5,1.5) ],
-                    "knots": range(0,16)}
-        sh02 = {    "points": [ (-4.0,0.2,-4.0),
-                    (-4.0,-0.2,-4.0),
-                    (4.0,-0.2,-4.0),
-                    (4.0,0.2,-4.0),
-                    (4.0,0.2,4.0),
-                    (4.0,-0.2,4.0),
-                    (-4.0,-0.2,4.0),
-                    (-4.0,0.2,4.0),
-                    (-4.0,0.2,-4.0),
-                    (-4.0,-0.2,-4.0),
-                    (-4.0,-0.2,4.0),
-                    (-4.0,0.2,4.0),
-                    (4.0,0.2,4.0),
-                    (4.0,-0.2,4.0),
-                    (4.0,-0.2,-4.0),
-                    (4.0,0.2,-4.0),
-                    (-4.0,0.2,-4.0) ],
-                    "knots": range(0,17)}
-        sh03 = {    "points": [ (-1,0,-8.74228e-08),
-                    (0,2,0),
-                    (1.31134e-07,0,-1),
-                    (-1,0,-8.74228e-08),
-                    (-4.37114e-08,0,1),
-                    (0,2,0),
-                    (1,0,0),
-                    (-4.37114e-08,0,1),
-                    (0,2,0),
-                    (1.31134e-07,0,-1),
-                    (1,0,0) ],
-                    "knots": range(0,11)}
-        sh04 = {    "points": [ (0.934487, 1.275837, 2.01658e-008 ),
-                    (0.932697, 1.247176, -0.35686 ),
-                    (0.920752, 1.172835, -0.686003 ),
-                    (0.891476, 1.068829, -0.978435 ),
-                    (0.840076, 0.946678, -1.231929 ),
-                    (0.763591, 0.814991, -1.445766 ),
-                    (0.661715, 0.681111, -1.621424 ),
-                    (0.537155, 0.551427, -1.765671 ),
-                    (0.387617, 0.433133, -1.880322 ),
-                    (0.209586, 0.33878, -1.961541 ),
-                    (0, 0.297363, -1.993747 ),
-                    (-0.209586, 0.33878, -1.961541 ),
-                    (-0.387617, 0.433133, -1.880322 ),
-                    (-0.537155, 0.551427, -1.765671 ),
-                    (-0.661715, 0.681111, -1.621424 ),
-                    (-0.763591, 0.814991, -1.445766 ),
-                    (-0.840076, 0.946678, -1.231929 ),
-                    (-0.891476, 1.068829, -0.978435 ),
-                    (-0.920752, 1.172835, -0.686003 ),
-                    (-0.932697, 1.247176, -0.35686 ),
-                    (-0.934487, 1.275837, 2.01658e-008 ),
-                    (-0.917572, 1.470617, 0 ),
-                    (-0.856971, 1.657129, 0 ),
-                    (-0.758916, 1.826965, 0 ),
-                    (-0.627692, 1.972704, 0 ),
-                    (-0.469036, 2.087974, 0 ),
-                    (-0.28988, 2.167739, 0 ),
-                    (-0.0980551, 2.208513, 0 ),
-                    (0.0980551, 2.208513, 0 ),
-                    (0.28988, 2.167739, 0 ),
-                    (0.469036, 2.087974, 0 ),
-                    (0.627692, 1.972704, 0 ),
-                    (0.758916, 1.826965, 0 ),
-                    (0.856971, 1.657129, 0 ),
-                    (0.917572, 1.470617, 0 ),
-                    (0.934487, 1.275837, 2.01658e-008 ),
-                    (0.932697, 1.247176, 0.35686 ),
-                    (0.920752, 1.172834, 0.686003 ),
-                    (0.891476, 1.06883, 0.978435 ),
-                    (0.840076, 0.946678, 1.23193 ),
-                    (0.763591, 0.814992, 1.445765 ),
-                    (0.661715, 0.68111, 1.621426 ),
-                    (0.537155, 0.55143, 1.765669 ),
-                    (0.387617, 0.433127, 1.880326 ),
-                    (0.209586, 0.338788, 1.961536 ),
-                    (0, 0.297318, 1.993775 ),
-                    (-0.209586, 0.338788, 1.961536 ),
-                    (-0.387617, 0.433127, 1.880326 ),
-                    (-0.537155, 0.55143, 1.765669 ),
-                    (-0.661715, 0.68111, 1.621426 ),
-                    (-0.763591, 0.814992, 1.445765 ),
-                    (-0.840076, 0.946678, 1.23193 ),
-                    (-0.891476, 1.06883, 0.978435 ),
-                    (-0.920752, 1.172834, 0.686003 ),
-                    (-0.932697, 1.247176, 0.35686 ),
-                    (-0.934487, 1.275837, 2.01658e-008) ],
-                    "knots": range(0,56)}
-        sh05 = {    "points": [ (0,0,4),
-                    (0,-2,1),
-                    (0,-1,1),
-                    (0,-1,-4),
-                    (0,1,-4),
-                    (0,1,1),
-                    (0,2,1),
-                    (0,0,4) ],
-                    "knots": range(0,8)}
-        sh06 = {    "points": [ (0,0,0),
-                    (0,1,0) ],
-                    "knots": range(0,2)}
-        sh07 = {    "points": [ (2.57253,0,0),
-                    (3.235575,0,-0.738488),
-                    (2.552484,0,-0.738488),
-                    (2,0,-0.105773),
-                    (-2.457426,0,-0.102784),
-                    (-2,0,-1),
-                    (-4,0,0),
-                    (-2,0,1),
-                    (-2.457426,0,0.0956313),
-                    (2,0,0.0956313),
-                    (2.552484,0,0.738488),
-                    (3.235575,0,0.738488),
-                    (2.57253,0,0) ],
-                    "knots":range(0,13)}
-        sh08 = {    "points": [(3.9925971031188965, -0.7687759399414062, 0.0),
-                    (3.985194206237793, -0.6989054679870605, -0.7656424641609192),
-                    (3.9303150177001953, -0.5181548595428467, -1.5109076499938965),
-                    (3.795288562774658, -0.2553844451904297, -2.2154181003570557),
-                    (3.553771495819092, 0.03586721420288086, -2.8310279846191406),
-                    (3.1794209480285645, 0.3020601272583008, -3.3095905780792236),
-                    (2.6914026737213135, 0.5162158012390137, -3.6496047973632812),
-                    (2.108882188796997, 0.6513543128967285, -3.8495688438415527),
-                    (1.451664686203003, 0.734534740447998, -3.9495849609375),
-                    (0.739555299282074, 0.7928156852722168, -3.9897541999816895),
-                    (0.0, 0.8157315254211426, -3.994877576828003),
-                    (-0.739555299282074, 0.7928156852722168, -3.9897541999816895),
-                    (-1.451664686203003, 0.734534740447998, -3.9495849609375),
-                    (-2.108882188796997, 0.6513543128967285, -3.8495688438415527),
-                    (-2.6914026737213135, 0.5162158012390137, -3.6496047973632812),
-                    (-3.1794209480285645, 0.3020601272583008, -3.3095905780792236),
-                    (-3.553771495819092, 0.03586721420288086, -2.8310279846191406),
-                    (-3.795288562774658, -0.2553844451904297, -2.2154181003570557),
-                    (-3.9303150177001953, -0.5181548595428467, -1.5109076499938965),
-                    (-3.985194206237793, -0.6989054679870605, -0.7656424641609192),
-                    (-3.9925971031188965, -0.7687759399414062, 0.0),
-                    (-3.985194206237793, -0.6989054679870605, 0.7656424641609192),
-                    (-3.9303150177001953, -0.5181548595428467, 1.5109076499938965),
-                    (-3.795288562774658, -0.2553844451904297, 2.2154181003570557),
-                    (-3.553771495819092, 0.03586721420288086, 2.8310279846191406),
-                    (-3.1794209480285645, 0.3020601272583008, 3.3095905780792236),
-                    (-2.6914026737213135, 0.5162158012390137, 3.6496047973632812),
-                    (-2.108882188796997, 0.6513543128967285, 3.8495688438415527),
-                    (-1.451664686203003, 0.734534740447998, 3.9495849609375),
-                    (-0.739555299282074, 0.7928156852722168, 3.9897541999816895),
-                    (0.0, 0.8157315254211426, 3.994877576828003),
-                    (0.739555299282074, 0.7928156852722168, 3.9897541999816895),
-                    (1.451664686203003, 0.734534740447998, 3.9495849609375),
-                    (2.108882188796997, 0.6513543128967285, 3.8495688438415527),
-                    (2.6914026737213135, 0.5162158012390137, 3.6496047973632812),
-                    (3.1794209480285645, 0.3020601272583008, 3.3095905780792236),
-                    (3.553771495819092, 0.03586721420288086, 2.8310279846191406),
-                    (3.795288562774658, -0.2553844451904297, 2.2154181003570557),
-                    (3.9303150177001953, -0.5181548595428467, 1.5109076499938965),
-                    (3.985194206237793, -0.6989054679870605, 0.7656424641609192),
-                    (3.9925971031188965, -0.7687759399414062, 0.0) ],
-                    "knots":range(0,41)
-                    }
-        #add new shapes to end
-        availableCurveShapes = {'sh01':sh01,  #this handles input on the function and returns the corresponding dictionary
-                                'sh02':sh02,
-                                'sh03':sh03,
-                                'sh04':sh04,
-                                'sh05':sh05,
-                                'sh06':sh06,
-                                'sh07':sh07,
-                                'sh08':sh08}
-        #add new shapes to end
-        helpStr = OrderedDict([ ("sh01","A standard cube."),  #if a invalid argument is given, and string will tell the user to use 'help' which will return this.
-                                ("sh02","A short cube."),
-                                ("sh03","A square Pyramid."),
-                                ("sh04","A Horse Shoe."),
-                                ("sh05","A arrow in Z,Y."),
-                                ("sh06","A two point line."),
-                                ("sh07","A Arrow"),
-                                ("sh08","A Warped, soft square") ])
-
-        try:
-            if self.shape == 'help':  #return the help strings
-                for items in helpStr:
-                    print('{} : {}'.format(items,helpStr[items]))
-            else:
-                curveData = availableCurveShapes.get(self.shape)  #look in the availableCurveShapes for corresponding a value
-                shapeCrv = cmds.curve(n = shapeName, d=1,p=curveData['points'],k=curveData['knots'])  #create the curve based on the data
-                cmds.select(cl=True)  #clear select
-                return shapeCrv  #return the node
-        except TypeError:
+        if self.shape == 'help':  #return the help strings
+            helpStr = shapes.availableShapes()
+            for items in helpStr:
+                print('{} : {}'.format(items,helpStr[items]))
+            return
+        curveData = shapes.getShape(self.shape)  #look in the shape library for corresponding a value
+        if curveData is None:
             print("{} not in an available shape.\nUse 'help' to get a list of shapes.".format(self.shape))  #string returned if invalid arguement is given
+            return
+        shapeName = self.names.name('{}_{}_{}'.format(self.charName,self.crvPrefix,self.nodeUse))  #validate name
+        if self.templates:
+            template = 'autoRig_{}_template'.format(self.shape)  #one template per shape per scene
+            if not cmds.objExists(template):
+                template = cmds.curve(n = template, d=curveData['degree'],p=curveData['points'],k=curveData['knots'])
+                cmds.setAttr(template + '.visibility',0)
+            shapeCrv = cmds.duplicate(template,n = shapeName,rr=1)[0]  #copying the template is quicker than rebuilding every cv
+            cmds.setAttr(shapeCrv + '.visibility',1)
+        else:
+            shapeCrv = cmds.curve(n = shapeName, d=curveData['degree'],p=curveData['points'],k=curveData['knots'])  #create the curve based on the data
+        clearSelection()  #clear selection
+        return NodeHandle.atWorld(shapeCrv)  #return the node
+    def clearTemplates(self):
+        """Delete the shape templates made by createCurve in template mode."""
+        for shape in shapes.availableShapes():
+            template = 'autoRig_{}_template'.format(shape)
+            if cmds.objExists(template):
+                cmds.delete(template)
     def createLoc(self,charName,locSuffix,nodeUse):
         """Simple function to create locs.
         
@@ -322,14 +631,14 @@ class MakeNodes():
             nodeUse {string} -- Adds a suffix to say what the node is used for.
         
         Returns:
-            string -- Returns the locator.
+            NodeHandle -- Returns the locator.
         """
         self.charName = charName
         self.locSuffix = locSuffix
         self.nodeUse = str(nodeUse)
-        locName = checkExists('{}_{}_{}'.format(self.charName,self.locSuffix,self.nodeUse))  #validate name
+        locName = self.names.name('{}_{}_{}'.format(self.charName,self.locSuffix,self.nodeUse))  #validate name
         loc = cmds.spaceLocator(n=locName)  #create a locator node
-        return loc[0]  #return the node
+        return NodeHandle.atWorld(loc[0])  #return the node
     def createGrp(self,charName,grpSuffix,nodeUse):
         """Simple funciton to create groups.
         
@@ -341,98 +650,83 @@ class MakeNodes():
             nodeUse {string} -- Adds a suffix to say what the node is used for.
         
         Returns:
-            string -- Returns the group.
+            NodeHandle -- Returns the group.
         """
         self.charName = charName
         self.grpSuffix = grpSuffix
         self.nodeUse = str(nodeUse)
-        nodeName = checkExists('{}_{}_{}'.format(self.charName,self.grpSuffix,self.nodeUse))  #validate name
+        nodeName = self.names.name('{}_{}_{}'.format(self.charName,self.grpSuffix,self.nodeUse))  #validate name
         grp = cmds.group(n=nodeName, em=1)  #create a group node
-        return grp  #return the node
-    def createChain(self,charName,typeOfNode,fromNode,toNode,amount,scale,chainName,nodeUse):
+        return NodeHandle.atWorld(grp)  #return the node
+    def createChain(self,charName,typeOfNode,fromNode,toNode,amount,scale,chainName,nodeUse,parented=False,aim=None,positions=None):
         """Creats a chain between two select nodes.
         
         Uses two given nodes to create a chain of x amount.
         The chain can be either locators, groups or joints.
+        Every position and orientation is worked out in one go before any node is made (see frames.chainFrames).
+        Joints are made with a single joint command each, their orientation goes straight into the joint orient (rotate is left at 0).
         
         Arguments:
             charName {string} -- The character name.
             typeOfNode {string} -- Uses 'joint','group'or'loc' to pick the type of node created in the chain.
-            fromNode {string} -- Starts the chain here.
-            toNode {string} -- Ends the chain here.
+            fromNode {list} -- Starts the chain here, translation/rotation/scale values from matchNodes.
+            toNode {list} -- Ends the chain here, translation/rotation/scale values from matchNodes.
             amount {int} -- The amount of nodes created.
             scale {int} -- The scale of the nodes created.
             chainName {string} -- A suffix to say what type of node it is.
             nodeUse {string} -- A suffix to say what the chain is used for.
         
+        Keyword Arguments:
+            parented {bool} -- Build the chain as a hierarchy, each node is made under the one before it. (default: {False})
+            aim {string} -- The axis each node points at the next one, its z axis stays as close to fromNode's as it can, None copies fromNode's rotation. (default: {None})
+            positions {list} -- Where each node goes instead of evenly spaced between the two nodes (see geometry.curvePositions), amount is then ignored. (default: {None})
+        
         Returns:
-            list -- Returns a chain of nodes (the chain).
+            list -- Returns a chain of nodes (the chain) as NodeHandles.
         """
         self.charName = charName
         self.typeOfNode = typeOfNode
         self.fromNode = fromNode
         self.toNode = toNode
-        self.amount = amount - 2
+        self.amount = amount
         self.scale = float(scale)
         self.nodeUse = nodeUse
         self.chainName = chainName
-        typeOfNodeSelected = None
-        chain = []  #                                                
-        #this algorithm is used to get the points of a line. x,y = (x1 + k(x2 - x1),y1 + k(y2 - y1))
-        #That algorithm works for x and y, so to get z I modified it to only work in 1 direction at a time, then ran it over x, y and z. x = ((k/k+1) * x1) + ((1/k+1) * x2) - x1
-        gapTx = ((float(self.amount) / (float(self.amount) + 1) * self.fromNode[0][0]) + ((1 / (float(self.amount) + 1)) * self.toNode[0][0])) - self.fromNode[0][0]
-        gapTy = ((float(self.amount) / (float(self.amount) + 1) * self.fromNode[0][1]) + ((1 / (float(self.amount) + 1)) * self.toNode[0][1])) - self.fromNode[0][1]
-        gapTz = ((float(self.amount) / (float(self.amount) + 1) * self.fromNode[0][2]) + ((1 / (float(self.amount) + 1)) * self.toNode[0][2])) - self.fromNode[0][2]
-        if self.typeOfNode == 'group' or self.typeOfNode == 'loc' or self.typeOfNode == 'joint':  #check if input is either 'group','loc' or 'joint'
-            if self.typeOfNode == 'group': 
-                typeOfNodeSelected = 'cmds.group(n=nodeName,em=1)'  #If I return the command as a string I can store the command as a variable and use it with eval later
-            elif self.typeOfNode == 'loc':
-                typeOfNodeSelected = 'cmds.spaceLocator(n=nodeName)'
-            else:
-                typeOfNodeSelected = 'cmds.joint(n=nodeName)'
-            nodeName = checkExists('{}_{}_{}'.format(self.charName,self.chainName,self.nodeUse))  #validate name
-            hipNode = eval(typeOfNodeSelected)  #run the command to create the start node
-            cmds.xform(hipNode,translation=(fromNode[0][0],fromNode[0][1],fromNode[0][2]))  #position the start node
-            cmds.xform(hipNode,rotation=fromNode[1])  #rotate the start node
-            if self.typeOfNode == 'joint':  #if input was 'joint'
-                cmds.setAttr(hipNode + '.radius',self.scale)  #set the start joint scale using the radius
-            else:
-                cmds.xform(hipNode,scale=(self.scale,self.scale,self.scale))  #otherwise set the node scale using scale
-            chain.append(hipNode)  #append the start node to a list to return later
-            cmds.select(cl=True)  #clear select
-            for i in range(0, amount - 2):  #create the nodes that are placed between the start and end nodes
-                nodeName = checkExists('{}_{}_{}'.format(self.charName,self.chainName,self.nodeUse))  #validate name
-                posTx = self.fromNode[0][0] + (gapTx * (i + 1))  #get the gap from the algorithm above and nudge it based on how many iterations we have done
-                posTy = self.fromNode[0][1] + (gapTy * (i + 1))  #do the same for y
-                posTz = self.fromNode[0][2] + (gapTz * (i + 1))  #and z
-                posR = self.fromNode[1]  #rotation stays the same but needs to be added to each node created
-                chainNode = eval(typeOfNodeSelected)  #create the node using eval
-                cmds.xform(chainNode,translation=(posTx,posTy,posTz))  #move the node
-                cmds.xform(chainNode,rotation=posR)  #rotate the node
-                if self.typeOfNode == 'joint':  #do the same as above when checking if joint (joint = radius, group or loc = scale)
-                    cmds.setAttr(chainNode + '.radius',self.scale)
-                else:
-                    cmds.xform(chainNode,scale=(self.scale,self.scale,self.scale))
-                chain.append(chainNode)  #add node to list
-                cmds.select(cl=True)
-            nodeName = checkExists('{}_{}_{}'.format(self.charName,self.chainName,self.nodeUse))  #validate name
-            chestNode = eval(typeOfNodeSelected)  #create end node
-            cmds.xform(chestNode,translation=(toNode[0][0],toNode[0][1],toNode[0][2]))  #position end node
-            cmds.xform(chestNode,rotation=toNode[1])  #rotate end node
-            if self.typeOfNode == 'joint':  #the same radius scale thing again
-                cmds.setAttr(chestNode + '.radius',self.scale)
-            else:
-                cmds.xform(chestNode,scale=(self.scale,self.scale,self.scale))
-            chain.append(chestNode)  #add end node to list
-            cmds.select(cl=True)
-        else:
+        chain = []
+        if self.typeOfNode not in ('group','loc','joint'):  #check if input is either 'group','loc' or 'joint'
             print("{} not allow, use 'group', 'loc', or 'joint'.".format(self.typeOfNode)) #return if invalid input is recieved
+            return chain
+        chainFrames = frames.chainFrames(self.fromNode,self.toNode,self.amount,aim,parented=parented and self.typeOfNode == 'joint',positions=positions)  #joint orient is relative to the parent
+        positions = chainFrames.positions  #the start, end and evenly spaced points between them
+        rotations = chainFrames.rotations  #without an aim the rotation stays the same as the start node until the end node
+        orients = chainFrames.orients
+        prefix = '{}_{}_{}'.format(self.charName,self.chainName,self.nodeUse)
+        names = [self.names.name(prefix) for i in positions]  #validate names
+        cmds.select(cl=True)  #a selected joint would become the parent of the chain
+        if self.typeOfNode == 'joint':
+            for i in range(len(positions)):
+                joint = cmds.joint(n=names[i],p=positions[i],o=orients[i],rad=self.scale)  #position, orient and radius in one go
+                chain.append(chain[-1].child(joint) if parented and chain else NodeHandle.atWorld(joint))  #a selected joint is the parent of the next one
+                if not parented:
+                    cmds.select(cl=True)  #stops the next joint being made under this one
+        else:
+            for i in range(len(positions)):
+                if self.typeOfNode == 'group':
+                    node = cmds.group(n=names[i],em=1)
+                else:
+                    node = cmds.spaceLocator(n=names[i])[0]
+                cmds.xform(node,translation=positions[i],rotation=rotations[i],scale=(self.scale,self.scale,self.scale))  #move, rotate and scale the node
+                node = NodeHandle.atWorld(node)
+                if parented and chain:
+                    reparent([node],chain[-1])
+                chain.append(node)
+        clearSelection()
         return chain
-    def createIkSpline(self,charName,chain,ctrlJnt01,ctrlJnt02,ctrl01,ctrl02,pointguide):
+    def createIkSpline(self,charName,chain,ctrlJnt01,ctrlJnt02,ctrl01,ctrl02,points,constrain=True,upVectors=None):
         """Create a IK Spline Spine.
         
         Uses a chain of joints to create a IK spline.
-        Uses a chain of 4 nodes to create a curve for the IK spline.
+        Uses 4 points to create a curve for the IK spline.
         Uses two given joints to bind the IK curve created.
         Parent Constraint the given controls, and setup the advance twist.
         
@@ -443,54 +737,36 @@ class MakeNodes():
             ctrlJnt02 {string} -- The second joint bound to the IK curve.
             ctrl01 {string} -- The first control used to control the first IK curve bind joint.
             ctrl02 {string} -- The second control used to control the second IK curve bind joint
-            pointguide {list} -- A chain used to create the IK Spline curve.
+            points {list} -- The 4 world positions (x,y,z) of the IK Spline curve cvs, see geometry.chainPositions.
+        
+        Keyword Arguments:
+            constrain {bool} -- Parent constrain the bind joints to the controls, off when they already are. (default: {True})
+            upVectors {list} -- The z axis of ctrl01 and ctrl02 at rest (see frames.matrixAxes), None queries the controls. (default: {None})
         
         Returns:
-            string,string -- Returns the IK curve and IK handle.
+            NodeHandle,NodeHandle -- Returns the IK curve and IK handle.
         """
         self.charName = charName
         self.chain = chain
         self.ctrlJnt01 = ctrlJnt01
         self.ctrlJnt02 = ctrlJnt02
-        self.pointStart = pointguide[0]
-        self.midPointStart = pointguide[1]
-        self.midPointEnd = pointguide[2]
+        self.points = [tuple(i) for i in points]  #the 4 points are used to create a bezier curve
         self.ctrl01 = ctrl01
         self.ctrl02 = ctrl02
-        self.pointEnd = pointguide[3]
         startJoint = self.chain[0]
         endJoint = self.chain[len(self.chain)-1]
-        pointStartPos = cmds.xform(self.pointStart,q=1,t=1,a=1,ws=1)  #Creating the curve requires a chain to be created so we can plot the curve on those positions
-        pointEndPos = cmds.xform(self.pointEnd,q=1,t=1,a=1,ws=1)  #a 4 point chain was created and positions extracted
-        midPointStartPos = cmds.xform(self.midPointStart,q=1,t=1,a=1,ws=1)  #those 4 points are later used to create a bezier curve
-        midPointEndPos = cmds.xform(self.midPointEnd,q=1,t=1,a=1,ws=1)  #a bezier curve is used as the ik spline curve as it bends nicely when skinned to joints
-        for i in pointguide:  #we can now delete those points
-            cmds.delete(i)
-        psx = pointStartPos[0]  #for each point get the x,y,z translation values
-        psy = pointStartPos[1]
-        psz = pointStartPos[2]
-        pex = pointEndPos[0]
-        pey = pointEndPos[1]
-        pez = pointEndPos[2]
-        pmsx = midPointStartPos[0]
-        pmsy = midPointStartPos[1]
-        pmsz = midPointStartPos[2]
-        pmex = midPointEndPos[0]
-        pmey = midPointEndPos[1]
-        pmez = midPointEndPos[2]
-        splneCrvName = checkExists('{}_spline_crv'.format(self.charName))  #validate name
-        ikHdlName = checkExists('{}_spline_hdl'.format(self.charName))  #validate name
-        splineCrv = cmds.curve(n=splneCrvName,d=3,p=[(psx,psy,psz),(pmsx,pmsy,pmsz),(pmex,pmey,pmez),(pex,pey,pez)],k=[0,0,0,1,1,1])  #create the curve
-        ikHdl = cmds.ikHandle(n=ikHdlName,ccv=0,c=splineCrv,sj=startJoint,ee=endJoint,sol='ikSplineSolver')[0]  #create the ik handle
-        cmds.skinCluster(self.ctrlJnt01,self.ctrlJnt02,splineCrv,bindMethod=0,skinMethod=1,normalizeWeights=1,weightDistribution=0,mi=4,omi=1,dr=4,rui=1)  #skin the curve to a given joint chain
+        splneCrvName = self.names.name('{}_spline_crv'.format(self.charName))  #validate name
+        ikHdlName = self.names.name('{}_spline_hdl'.format(self.charName))  #validate name
+        splineCrv = cmds.curve(n=splneCrvName,d=3,p=self.points,k=[0,0,0,1,1,1])  #create the curve, a bezier curve bends nicely when skinned to joints
+        ikHdl = cmds.ikHandle(n=ikHdlName,ccv=0,c=splineCrv,sj=str(startJoint),ee=str(endJoint),sol='ikSplineSolver')[0]  #create the ik handle
+        cmds.skinCluster(str(self.ctrlJnt01),str(self.ctrlJnt02),splineCrv,bindMethod=0,skinMethod=1,normalizeWeights=1,weightDistribution=0,mi=4,omi=1,dr=4,rui=1)  #skin the curve to a given joint chain
         #this is hard coded because I dont have a method of giving the user control over joint orientation on rig creation yet
         #normally that orientation would control what part of the matrix is used for the advanced twist attributes
         #this can be accomplished by a control at the fit rig stage that allows the user to choose a orientation by rotating the controller
         #alternatively they can enter it in the gui
-        world_mat_ctrl01 = cmds.xform(self.ctrl01,q=1,m=1,ws=1)  #get the entire matrix for cltr01
-        world_mat_ctrl02 = cmds.xform(self.ctrl02,q=1,m=1,ws=1)  #get the entire matrix for ctrl02
-        ctrl01_axis = world_mat_ctrl01[8:11]  #return just the values for z for ctrl01
-        ctrl02_axis = world_mat_ctrl02[8:11]  #return just the values for z for ctrl02
+        if upVectors is None:  #worked out from the controls placements when the rig is planned, so usually no query is needed
+            upVectors = frames.matrixAxes([cmds.xform(str(self.ctrl01),q=1,m=1,ws=1),cmds.xform(str(self.ctrl02),q=1,m=1,ws=1)],'z')
+        ctrl01_axis, ctrl02_axis = upVectors  #the z axis of each control
         cmds.setAttr(ikHdl + '.dTwistControlEnable',1)  #turn on advanced twist
         cmds.setAttr(ikHdl + '.dWorldUpType',4)  #use objects
         cmds.setAttr(ikHdl + '.dForwardAxis',2)  #set forward axis
@@ -503,15 +779,24 @@ class MakeNodes():
         cmds.setAttr(ikHdl + '.dWorldUpVectorEndZ', ctrl02_axis[2] * -1)  #z up for ctrl02
         cmds.connectAttr(self.ctrl01 + '.worldMatrix[0]',ikHdl + '.dWorldUpMatrix',f=1)  #connect ctrl01 to up 1 input
         cmds.connectAttr(self.ctrl02 + '.worldMatrix[0]',ikHdl + '.dWorldUpMatrixEnd',f=1)  #connect ctrl02 to up 2 input
-        cmds.parentConstraint(self.ctrl01,self.ctrlJnt01,mo=1)  #constrain ctrl01 to the first joint skinned to the ik spline curve
-        cmds.parentConstraint(self.ctrl02,self.ctrlJnt02,mo=1)  #constrain ctrl02 to the second joint skinned to the ik spline curve
-        cmds.select(cl=1)  #clear selection
-        return splineCrv, ikHdl  #return the curve and ik handle nodes
+        if constrain:
+            cmds.parentConstraint(str(self.ctrl01),str(self.ctrlJnt01),mo=1)  #constrain ctrl01 to the first joint skinned to the ik spline curve
+            cmds.parentConstraint(str(self.ctrl02),str(self.ctrlJnt02),mo=1)  #constrain ctrl02 to the second joint skinned to the ik spline curve
+        clearSelection()  #clear selection
+        return NodeHandle.atWorld(splineCrv), NodeHandle.atWorld(ikHdl)  #return the curve and ik handle nodes
 class EditNodes():
     """handles editing attributes.
     
     A collection of functions to help alter various values on select nodes.
     """
+    def __init__(self,states=None):
+        """Set up the attribute state table.
+        
+        Keyword Arguments:
+            states {AttrStates} -- When given, lock/hide, rotation order and color changes are recorded in it instead of set straight away, call its apply to set them. (default: {None})
+        """
+        self.states = states
+        self.rotationSources = {}  #driver : (plugs, matrix) giving its world rotation, see matrixConstraint
     def lockHideAll(self,node):
         """Lock and hide channel box.
 
@@ -522,6 +807,9 @@ class EditNodes():
         """
         self.node = node
         valueAttr = ['.tx','.ty','.tz','.rx','.ry','.rz','.sx','.sy','.sz','.v']  #a list of values used to lock and hide
+        if self.states is not None:
+            self.states.setState(self.node,[i[1:] for i in valueAttr],lock=1,keyable=0,channelBox=0)
+            return
         for i in range(0, len(valueAttr)):
             cmds.setAttr('{}{}'.format(self.node,valueAttr[i]), lock = 1, keyable = 0, channelBox = 0)  #iterate over the values and lock hide them 1 by 1
     def unlockUnHideAll(self,node):
@@ -534,6 +822,9 @@ class EditNodes():
         """
         self.node = node
         valueAttr = ['.tx','.ty','.tz','.rx','.ry','.rz','.sx','.sy','.sz','.v']  #a list of values used to unlock and unhide
+        if self.states is not None:
+            self.states.setState(self.node,[i[1:] for i in valueAttr],lock=0,keyable=1,channelBox=1)
+            return
         for i in range(0, len(valueAttr)):
             cmds.setAttr('{}{}'.format(self.node,valueAttr[i]), lock = 0, channelBox = 1)  #iterate over the valuese and unlock unhide them 1 by 1
             cmds.setAttr('{}{}'.format(self.node,valueAttr[i]), keyable = 1)  #keyable needs to be done after its shown on the channel box and unlocked otherwise it wont work (can't key something that isn't visible or locked)
@@ -564,6 +855,9 @@ class EditNodes():
         sy = self.s[1]
         sz = self.s[2]
         valueAttr = {'.tx':tx,'.ty':ty,'.tz':tz,'.rx':rx,'.ry':ry,'.rz':rz,'.sx':sx,'.sy':sy,'.sz':sz,'.v':v}  #values used to lock and hide specified attributes on a given node
+        if self.states is not None:
+            self.states.setState(self.node,[i[1:] for i in valueAttr if valueAttr[i] == 1],lock=1,keyable=0,channelBox=0)
+            return
         for i in valueAttr:
             if valueAttr[i] == 1:
                 cmds.setAttr('{}{}'.format(self.node,i), lock = 1, keyable = 0, channelBox = 0)  #lock and hide specified attributes
@@ -594,6 +888,9 @@ class EditNodes():
         sy = self.s[1]
         sz = self.s[2]
         valueAttr = {'.tx':tx,'.ty':ty,'.tz':tz,'.rx':rx,'.ry':ry,'.rz':rz,'.sx':sx,'.sy':sy,'.sz':sz,'.v':v}  #values used to unlock and unhide specified attributes on a given node
+        if self.states is not None:
+            self.states.setState(self.node,[i[1:] for i in valueAttr if valueAttr[i] == 1],lock=0,keyable=1,channelBox=1)
+            return
         for i in valueAttr:
             if valueAttr[i] == 1:
                 cmds.setAttr('{}{}'.format(self.node,i), lock = 0, channelBox = 1)  #unlock and unhide specified attributes
@@ -607,17 +904,18 @@ class EditNodes():
             node {string} -- The node to move to center.
         """
         self.node = node
-        rpPos = cmds.xform(self.node, query=True, rp=True, worldSpace=True )  #find the nodes rotation pivot
+        rpPos = cmds.xform(str(self.node), query=True, rp=True, worldSpace=True )  #find the nodes rotation pivot
         center = []
         for v in rpPos:
             negV = v * -1  #multiply values by -1 and plae them in a list
             center.append(negV)
-        cmds.xform(self.node, translation=center)  #apply those valuese to the node
+        cmds.xform(str(self.node), translation=center)  #apply those valuese to the node
     def xformNode(self,node,t,r,s,rel,ws):
         """xform the select node.
         
         Uses inputs to move the selected node using the xform command.
         Supports using 'pass' to skip specified values.
+        Only channels that are locked get unlocked and locked again.
         
         Arguments:
             node {string} -- The node to xform.
@@ -633,60 +931,60 @@ class EditNodes():
         self.t = t
         self.r = r
         self.s = s
-        tx = self.t[0]
-        ty = self.t[1]
-        tz = self.t[2]
-        rx = self.r[0]
-        ry = self.r[1]
-        rz = self.r[2]
-        sx = self.s[0]
-        sy = self.s[1]
-        sz = self.s[2]
-        valueInput = [[tx,ty,tz],[rx,ry,rz],[sx,sy,sz]]
-        valueAttr = ['.tx','.ty','.tz','.rx','.ry','.rz','.sx','.sy','.sz']  #values to run xform on
-        preXformLockState = []  #is the value locked previously? store state here if so
-        for i in range(0, len(valueAttr)):
-            getLock = cmds.getAttr('{}{}'.format(self.node, valueAttr[i]), lock = 1)  #get the lock state of the attribute
-            preXformLockState.append(getLock)  #add it to the list
-            cmds.setAttr('{}{}'.format(self.node,valueAttr[i]), lock = 0)  #unlock
-        a = 0
-        t = []
-        r = []
-        s = []
-        for v in valueInput[0]:
-            if v == 'pass':  #if pass is used
-                t.append(cmds.getAttr('{}{}'.format(self.node,valueAttr[a])))  #append its value to t
-            else:
-                t.append(v)  #otherwise append the given value
-            a += 1
-        cmds.xform('{}'.format(self.node),translation=t,relative=self.relative,worldSpace=self.worldSpace)  #translate the object based on values in the 't' list
-        for v in valueInput[1]:  #exact same thing as before by for rotation
-            if v == 'pass':
-                r.append(cmds.getAttr('{}{}'.format(self.node,valueAttr[a])))
-            else:
-                r.append(v)
-            a += 1
-        cmds.xform('{}'.format(self.node),rotation=r,relative=self.relative,worldSpace=self.worldSpace)
-        for v in valueInput[2]:  #exact same thing as before by for scale
-            if v == 'pass':
-                s.append(cmds.getAttr('{}{}'.format(self.node,valueAttr[a])))
-            else:
-                s.append(v)
-            a += 1
-        cmds.xform('{}'.format(self.node),scale=s,relative=self.relative,worldSpace=self.worldSpace)
-        for i in range(0, len(valueAttr)):
-            cmds.setAttr('{}{}'.format(self.node,valueAttr[i]), lock = preXformLockState[i])  #get the lock state we created above and lock attributes that were previously locked again
+        valueInput = [self.t,self.r,self.s]
+        valueAttr = ['.translate','.rotate','.scale']  #values to run xform on
+        values = []
+        for i in range(0, len(valueInput)):
+            v = list(valueInput[i])
+            if 'pass' in v:  #if pass is used get the current values, one query for all three axis
+                current = cmds.getAttr('{}{}'.format(self.node,valueAttr[i]))[0]
+                v = [current[a] if v[a] == 'pass' else v[a] for a in range(3)]
+            values.append(v)
+        locked = self.unlockChannels(self.node)
+        cmds.xform('{}'.format(self.node),translation=values[0],rotation=values[1],scale=values[2],relative=self.relative,worldSpace=self.worldSpace)
+        for attr in locked:
+            cmds.setAttr('{}.{}'.format(self.node,attr), lock = 1)  #lock attributes that were previously locked again
+    def placeNodes(self,placements,ws=0):
+        """Place nodes with a matrix each.
+        
+        Every node is set with a single xform, its locked channels are found with one query and only those are unlocked and locked again.
+        
+        Arguments:
+            placements {list} -- (node, matrix) pairs, the matrix is 16 values in the order xform returns them.
+        
+        Keyword Arguments:
+            ws {int} -- The matrices are world matrices instead of local ones. (default: {0})
+        """
+        for node, matrix in placements:
+            node = str(node)
+            locked = self.unlockChannels(node)
+            cmds.xform(node,matrix=list(matrix),worldSpace=ws)
+            for attr in locked:
+                cmds.setAttr('{}.{}'.format(node,attr), lock = 1)
+    def unlockChannels(self,node):
+        """Unlock the transform channels that are locked.
+        
+        Arguments:
+            node {string} -- The node to unlock.
+        
+        Returns:
+            list -- The attributes that were unlocked.
+        """
+        locked = [attr for attr in cmds.listAttr(str(node),locked=1) or [] if attr in TRANSFORM_CHANNELS]
+        for attr in locked:
+            cmds.setAttr('{}.{}'.format(node,attr), lock = 0)
+        return locked
     def clusterCrv(self,node,point,suffix):
         self.node = node
         self.point = point
         self.suffix = suffix
         try:
-            crvCls = cmds.cluster(self.node + '.cv[{}]'.format(self.point),n=self.node + '_{}_cls_'.format(self.suffix))  #cluster cv
+            crvCls = cmds.cluster(self.node + '.cv[{}]'.format(self.point),n=shortName(self.node) + '_{}_cls_'.format(self.suffix))  #cluster cv
             handle = (cmds.listConnections(crvCls[0] + ".matrix") or [None])[0]  #get the cluster handle name
             if not handle:
                 return(crvCls)
             else:
-                return(handle)
+                return(NodeHandle.atWorld(handle))
         except TypeError:
             print("Input error : (curve name[str], point[int],suffix[str]")  #tell the user what type of data to enter
         except ValueError:
@@ -694,32 +992,20 @@ class EditNodes():
     def setCol(self,node,col):
         self.node = node
         self.col = col
-        colorValues = { 'black':1,  #specified common colors with their numerical value
-                        'white':16,
-                        'red':13,
-                        'blue':6,
-                        'yellow':17,
-                        'pink':9,
-                        'rose':4,
-                        'ocean':15
-                        }
-        failed = 0
-        for x, y in colorValues.items():
-            if self.col == 'help'.lower():  #print that dictionary if 'help' is used
-                helpList = ''
-                for colString in colorValues:
-                    print('{}'.format(colString))
-                break                   
-            if self.col.lower() == x:
-                colVal = y  #get the corresponding numerical value of the given  input
-                cmds.setAttr('{}.overrideEnabled'.format(self.node), 1)  #override enabled for the node
-                cmds.setAttr('{}.overrideColor'.format(self.node),colVal)  #set color for the node
-                failed = 0
-                break
-            else:
-                failed = 1  #set failed to 1 if the user entered a bad argument
-        if failed:
+        if self.col == 'help':  #print the colors if 'help' is used
+            for colString in COLOURS:
+                print('{}'.format(colString))
+            return
+        colVal = COLOURS.get(self.col.lower())  #get the corresponding numerical value of the given  input
+        if colVal is None:
             print("Error passing color value.\nIt probably wasn't in the list of available colors.\nUse 'help' to get a list of available colors.")  #a helpful string
+            return
+        if self.states is not None:
+            self.states.setValue(self.node,'overrideEnabled',1)
+            self.states.setValue(self.node,'overrideColor',colVal)
+            return
+        cmds.setAttr('{}.overrideEnabled'.format(self.node), 1)  #override enabled for the node
+        cmds.setAttr('{}.overrideColor'.format(self.node),colVal)  #set color for the node
     def parentNodes(self,c,p):
         """Parent in hierarchy 
         
@@ -731,8 +1017,8 @@ class EditNodes():
         """
         self.child = c
         self.parent = p
-        cmds.parent(self.child,self.parent)  #simply parent (c)hild to (p)arent
-        cmds.select(clear=True)  #clear selection
+        reparent([self.child],self.parent)  #simply parent (c)hild to (p)arent
+        clearSelection()  #clear selection
     def matchNodes(self,targetNode):
         """Get translation/rotation/scale of select node.
         
@@ -745,6 +1031,7 @@ class EditNodes():
             list -- Return a list of values relating to the matched node.
         """
         self.targetNode = targetNode
+        targetNode = str(targetNode)  #a handle is only looked up once
         values = []  #empty list
         values.append(cmds.xform(targetNode,q=1,t=1,a=1,ws=1))  #add translation values to list
         values.append(cmds.xform(targetNode,q=1,ro=1,ws=1))  #add rotation values to list
@@ -765,26 +1052,30 @@ class EditNodes():
         self.driver = driver
         self.aimV = aimV
         self.upV = upV
-        const = cmds.aimConstraint(driver, driven, aim=self.aimV, u=self.upV)  #simply aim constrain the node
+        const = cmds.aimConstraint(str(driver), str(driven), aim=self.aimV, u=self.upV)  #simply aim constrain the node
         return const
     def rotToOrient(self,nodes):
         """Convert rotation values to orient values
         
         Gets the rotation values on the given node and applies them to its orientation.
         Zeros the given rotation after.
+        The joints are found with one query, each one is then a get and two sets.
         
         Arguments:
-            nodes {string} -- The node to convert.
+            nodes {list} -- The nodes to convert, anything that isn't a joint is skipped.
         """
         self.nodes = nodes
-        for i in range(0, len(self.nodes)):
-            if cmds.nodeType(self.nodes[i]) == 'joint':
-                rotValue = cmds.xform(self.nodes[i], q=1, rotation=1)
-                cmds.xform(self.nodes[i],rotation=(0,0,0))
-                cmds.joint(self.nodes[i],edit=1,orientation=(rotValue[0],rotValue[1],rotValue[2]))
-                cmds.select(clear=1)
-            else:
-                print('{} was not a joint, skipping.'.format(self.nodes[i]))
+        nodes = [str(i) for i in self.nodes]
+        joints = cmds.ls(nodes,type='joint',l=1) or []  #one query finds every joint
+        if len(joints) != len(nodes):  #only looked at one at a time when something isn't a joint
+            for node in nodes:
+                if cmds.nodeType(node) != 'joint':
+                    print('{} was not a joint, skipping.'.format(node))
+        for joint in joints:
+            rotValue = cmds.getAttr(joint + '.rotate')[0]
+            cmds.setAttr(joint + '.rotate',0,0,0)
+            cmds.setAttr(joint + '.jointOrient',*rotValue)
+        clearSelection()
     def parentChain(self,chain):
         """Parents the given nodes into a hierarchy.
         
@@ -795,8 +1086,8 @@ class EditNodes():
         """
         self.chain = chain
         for i in range(0, len(self.chain) - 1,1):
-            cmds.parent(self.chain[i+1],self.chain[i])
-            cmds.select(clear=1)
+            reparent([self.chain[i+1]],self.chain[i])
+            clearSelection()
     def setRotateOrder(self,node,order,chain):
         """Set rotation order.
         
@@ -811,85 +1102,260 @@ class EditNodes():
         self.node = node
         self.order = order
         self.chain = chain
-        if self.chain == 1:
-            for i in range(0, len(self.node),1):
-                cmds.setAttr(self.node[i] + '.rotateOrder',self.order)
+        nodes = self.node if self.chain == 1 else [self.node]
+        for i in range(0, len(nodes),1):
+            if self.states is not None:
+                self.states.setValue(nodes[i],'rotateOrder',self.order)
+            else:
+                cmds.setAttr(nodes[i] + '.rotateOrder',self.order)
+    def matrixConstraint(self,drivers,driven,channels='parent',weights=None,weightPlug=None):
+        """Constrain with matrix nodes instead of a constraint node.
+        
+        Works like the constraint of the same kind made with maintain offset, the result drives the driven nodes offsetParentMatrix.
+        The driven nodes own translate (and for parent and orient its rotate, scale and joint orient) are cleared so it stays where it is.
+        Each driver is brought into the driven nodes parent space by a multMatrix, more than one driver (or orient and point) are mixed by a blendMatrix.
+        Orient drivers are read from their rotate and parent matrix, not their world matrix, so a driver can follow the driven node's position without a cycle.
+        
+        Arguments:
+            drivers {list} -- The driver nodes.
+            driven {string} -- The node to constrain.
+        
+        Keyword Arguments:
+            channels {string} -- 'parent', 'orient' or 'point', the constraint it stands in for. (default: {'parent'})
+            weights {list} -- A weight per driver, like a constraints weights they are shared out by their total. (default: {None})
+            weightPlug {string} -- Drives the blend towards the second driver instead of its weight, for two drivers. (default: {None})
+        
+        Returns:
+            string,list -- The node driving the offsetParentMatrix (the blendMatrix, or the multMatrix when one parent driver needs no blend) and the weight plug of each blend target, to connect or key.
+        """
+        drivers = [str(i) for i in drivers]
+        driven = str(driven)
+        weights = list(weights or [1.0] * len(drivers))
+        name = shortName(driven)
+        world = cmds.xform(driven,q=1,m=1,ws=1)
+        parentInverse = geometry.inverseMatrix(cmds.getAttr(driven + '.parentMatrix'))
+        local = geometry.multMatrix(world,parentInverse)  #what the offsetParentMatrix has to give once the channels are cleared
+        sources = []  #the plugs for each driver and the matrix they give now
+        for driver in drivers:
+            if channels != 'orient':
+                sources.append(([driver + '.worldMatrix[0]'],cmds.xform(driver,q=1,m=1,ws=1)))
+                continue
+            rotation = self.rotationSources.get(driver)
+            if rotation is None:  #one composeMatrix per driver, shared by everything it orients
+                compose = cmds.createNode('composeMatrix',n='{}_rotate_cm'.format(shortName(driver)),ss=1)
+                cmds.connectAttr(driver + '.rotate',compose + '.inputRotate')
+                cmds.connectAttr(driver + '.rotateOrder',compose + '.inputRotateOrder')
+                rest = geometry.multMatrix(geometry.eulerMatrix(cmds.getAttr(driver + '.rotate')[0],cmds.getAttr(driver + '.rotateOrder')),cmds.getAttr(driver + '.parentMatrix'))
+                rotation = self.rotationSources[driver] = ([compose + '.outputMatrix',driver + '.parentMatrix[0]'],rest)
+            sources.append(rotation)
+        if channels == 'point':  #the offset is a translation in the parent space, like a point constraints
+            total = sum(weights) or 1.0
+            target = [sum(w * v for w, v in zip(weights,column)) / total for column in zip(*[geometry.multMatrix(rest,parentInverse)[12:15] for plugs, rest in sources])]
+            shift = geometry.translateMatrix([a - b for a, b in zip(local[12:15],target)])
+            offsets = [None] * len(sources)
         else:
-            cmds.setAttr(self.node + '.rotateOrder',self.order)
-    def parentFk(self,chain,ctrls,guide,ctrlgrp02,ctrlgrp03):
+            offsets = [geometry.multMatrix(world,geometry.inverseMatrix(rest)) for plugs, rest in sources]
+        mixed = []
+        for i, (plugs, rest) in enumerate(sources):
+            mult = cmds.createNode('multMatrix',n='{}_{}_mm'.format(name,channels),ss=1)
+            inputs = ([offsets[i]] if offsets[i] is not None else []) + plugs + [driven + '.parentInverseMatrix[0]'] + ([shift] if channels == 'point' else [])
+            for index, value in enumerate(inputs):
+                if isinstance(value,list):
+                    cmds.setAttr('{}.matrixIn[{}]'.format(mult,index),value,type='matrix')
+                else:
+                    cmds.connectAttr(value,'{}.matrixIn[{}]'.format(mult,index))
+            mixed.append(mult + '.matrixSum')
+        blend = None
+        weightPlugs = []  #one per blend target
+        if channels == 'parent' and len(mixed) == 1:
+            cmds.connectAttr(mixed[0],driven + '.offsetParentMatrix',f=1)
+        else:
+            blend = cmds.createNode('blendMatrix',n='{}_{}_bm'.format(name,channels),ss=1)
+            if channels == 'parent':  #blend from the first driver to the rest
+                cmds.connectAttr(mixed.pop(0),blend + '.inputMatrix')
+                start = 1
+            else:  #start from the rest translation, orient and point only take one part from the drivers
+                held = geometry.translateMatrix(local[12:15]) if channels == 'orient' else geometry.identity()
+                cmds.setAttr(blend + '.inputMatrix',held,type='matrix')
+                start = 0
+            for i, plug in enumerate(mixed):
+                target = '{}.target[{}]'.format(blend,i)
+                driver = i + start  #the drivers index
+                cmds.connectAttr(plug,target + '.targetMatrix')
+                if channels != 'parent':
+                    cmds.setAttr(target + '.translateWeight',1 if channels == 'point' else 0)
+                    cmds.setAttr(target + '.rotateWeight',1 if channels == 'orient' else 0)
+                    cmds.setAttr(target + '.scaleWeight',0)
+                    cmds.setAttr(target + '.shearWeight',0)
+                if driver > 0 and weightPlug is not None:
+                    cmds.connectAttr(weightPlug,target + '.weight')
+                else:
+                    cmds.setAttr(target + '.weight',weights[driver] / (sum(weights[:driver + 1]) or 1.0))  #targets blend in turn, each takes its share of what has been blended so far
+                weightPlugs.append(target + '.weight')
+            cmds.connectAttr(blend + '.outputMatrix',driven + '.offsetParentMatrix',f=1)
+        cleared = [('translate',0.0)] if channels == 'point' else [('translate',0.0),('rotate',0.0),('scale',1.0)]
+        if channels != 'point' and cmds.nodeType(driven) == 'joint':
+            cleared.append(('jointOrient',0.0))
+        for attr, value in cleared:
+            cmds.setAttr('{}.{}'.format(driven,attr),value,value,value)
+        return blend or mult, weightPlugs
+    def parentFk(self,chain,ctrls,ctrlgrp02,ctrlgrp03,falloff='dropoff',constraintMode='constraints',positions=None):
         """Parent FK Ctrls to Joint chain.
         
-        Creates a curve and skins it to three joints.
-        Gets the bind values on the curves cvs.
+        Works out how far along the chain each joint is.
+        Weights each joint between the two closest fk controllers using the falloff curve.
         Parent constraint the fk controllers to the joint chain.
-        Uses the bind values to set parent constraint values.
+        Uses the weights to set parent constraint values.
+        In 'matrix' mode every constraint is made with matrixConstraint instead.
         
         Arguments:
             chain {list} -- The joint chain.
             ctrls {list} -- The FK controlleres.
-            guide {list} -- Joints to bind the curve to.
             ctrlgrp02 {string} -- offset group for the fk ctrl.
             ctrlgrp03 {string} -- offset group for the fk ctrl.
+        
+        Keyword Arguments:
+            falloff {string} -- How the weights fall off between controllers, one of geometry.FALLOFFS. (default: {'dropoff'})
+            constraintMode {string} -- One of CONSTRAINT_MODES. (default: {'constraints'})
+            positions {list} -- The world position of each joint when the chain was made, None queries them. (default: {None})
         """
-        self.chain = chain
-        self.ctrl01 = ctrls[0]
-        self.ctrl02 = ctrls[1]
-        self.ctrl03 = ctrls[2]
-        self.guide = guide
-        self.ctrlgrp02 = ctrlgrp02
-        self.ctrlgrp03 = ctrlgrp03
-        chainTranslationValues = []
-        for i in range(0, len(self.chain),1):
-            chainTranslationValues.append(cmds.xform(self.chain[i],q=1,t=1,a=1,ws=1))
-        knots = range(0,len(self.chain))
-        points = []
-        for i in range(0, len(chainTranslationValues),1):
-            points.append(tuple(chainTranslationValues[i]))
-        tempCrv = cmds.curve(n = 'temp_skin_bind_guide_crv',d=1,p=points,k=knots)
-        skin = cmds.skinCluster(self.guide[0],self.guide[1],guide[2],tempCrv,bindMethod=0,skinMethod=1,normalizeWeights=1,weightDistribution=0,mi=4,omi=1,dr=4,rui=1)
-        deg = cmds.getAttr(tempCrv + '.degree')
-        span = cmds.getAttr(tempCrv + '.spans')
-        if len(self.chain)%2 == 1:
-            for i in range(1,(deg+span)/2,1):
-                p = cmds.skinPercent( skin[0], tempCrv + '.cv[{}]'.format(i), query=True, value=True )
-                cmds.orientConstraint(self.ctrl01,self.chain[i],w = p[0],mo=1)
-                cmds.orientConstraint(self.ctrl02,self.chain[i],w = p[1],mo=1)
-            for i in range(deg+span/2,(deg+span)-1,1):
-                p = cmds.skinPercent( skin[0], tempCrv + '.cv[{}]'.format(i), query=True, value=True )
-                cmds.orientConstraint(self.ctrl02,self.chain[i],w = p[1],mo=1)
-                cmds.orientConstraint(self.ctrl03,self.chain[i],w = p[2],mo=1)
-            cmds.orientConstraint(self.ctrl02,self.chain[len(self.chain)/2],w=1,mo=1)
-            cmds.pointConstraint(self.chain[len(self.chain)/2],self.ctrl02,w=1,mo=1)
+        self.chain = [str(i) for i in chain]  #handles are looked up once, not once per constraint
+        chainTranslationValues = positions
+        if chainTranslationValues is None:
+            chainTranslationValues = [cmds.xform(self.chain[i],q=1,t=1,a=1,ws=1) for i in range(0, len(self.chain),1)]
+        weights = geometry.fkWeights(geometry.chainParameters(chainTranslationValues),falloff)  #first, middle and last controller weight for every joint
+        for channels, drivers, driven, jntWeights in self.fkConstraints(self.chain,[str(i) for i in ctrls],str(ctrlgrp02),str(ctrlgrp03),weights):
+            self.constrain(channels,drivers,driven,jntWeights,constraintMode)
+        clearSelection()
+    def fkConstraints(self,chain,ctrls,ctrlgrp02,ctrlgrp03,weights):
+        """The constraints parentFk makes, in the order it makes them.
+        
+        Arguments:
+            chain {list} -- The joint chain.
+            ctrls {list} -- The FK controlleres.
+            ctrlgrp02 {string} -- offset group for the fk ctrl.
+            ctrlgrp03 {string} -- offset group for the fk ctrl.
+            weights {list} -- The first, middle and last controller weight for every joint, see geometry.fkWeights.
+        
+        Returns:
+            list -- (channels, drivers, driven, weights) for each constraint, see constrain.
+        """
+        ctrl01, ctrl02, ctrl03 = ctrls
+        mid = len(chain)//2
+        if len(chain)%2 == 1:
+            lwrJnts = range(1,mid,1)
+            uprJnts = range(mid + 1,len(chain)-1,1)
         else:
-            for i in range(1,(deg+span)/2 - 1,1):
-                p = cmds.skinPercent( skin[0], tempCrv + '.cv[{}]'.format(i), query=True, value=True )
-                cmds.orientConstraint(self.ctrl01,self.chain[i],w = p[0],mo=1)
-                cmds.orientConstraint(self.ctrl02,self.chain[i],w = p[1],mo=1)
-            for i in range((deg+span)/2 + 1,(deg+span)-1 ,1):
-                p = cmds.skinPercent( skin[0], tempCrv + '.cv[{}]'.format(i), query=True, value=True )
-                cmds.orientConstraint(self.ctrl02,self.chain[i],w = p[1],mo=1)
-                cmds.orientConstraint(self.ctrl03,self.chain[i],w = p[2],mo=1)
-            lwr = self.chain[(len(self.chain)/2)-1]
-            upr = self.chain[len(self.chain)/2]
-            cmds.orientConstraint(self.ctrl02,lwr,w=1,mo=1)
-            cmds.orientConstraint(self.ctrl02,upr,w=1,mo=1)
-            cmds.pointConstraint(lwr,upr,self.ctrl02,w=.5,mo=1)
-        cmds.orientConstraint(self.ctrl01,self.chain[0],w=1,mo=1)
-        cmds.orientConstraint(self.ctrl03,self.chain[len(self.chain)-1],w=1,mo=1)
-        cmds.pointConstraint(self.chain[0],self.ctrl01,w=1,mo=1)
-        cmds.pointConstraint(self.chain[len(self.chain)-1],self.ctrl03,w=1,mo=1)
-        cmds.delete(skin)
-        cmds.delete(tempCrv)
-        cmds.parentConstraint(self.ctrl01,self.ctrlgrp02,mo=1)
-        cmds.parentConstraint(self.ctrl02,self.ctrlgrp03,mo=1)
-        cmds.select(cl=1)
-    def ikfk_switch(self,chain01,chain02,chain03,switchCtrl,ctrlfk,ctrlik):
+            lwrJnts = range(1,mid - 1,1)
+            uprJnts = range(mid + 1,len(chain)-1,1)
+        orients = []  #(controllers, weights, joint)
+        points = []  #(joints, weight, controller)
+        for i in lwrJnts:
+            orients.append(([ctrl01,ctrl02],[weights[i][0],weights[i][1]],chain[i]))
+        for i in uprJnts:
+            orients.append(([ctrl02,ctrl03],[weights[i][1],weights[i][2]],chain[i]))
+        if len(chain)%2 == 1:
+            orients.append(([ctrl02],[1],chain[mid]))
+            points.append(([chain[mid]],1,ctrl02))
+        else:
+            lwr = chain[mid-1]
+            upr = chain[mid]
+            orients.append(([ctrl02],[1],lwr))
+            orients.append(([ctrl02],[1],upr))
+            points.append(([lwr,upr],.5,ctrl02))
+        orients.append(([ctrl01],[1],chain[0]))
+        orients.append(([ctrl03],[1],chain[len(chain)-1]))
+        points.append(([chain[0]],1,ctrl01))
+        points.append(([chain[len(chain)-1]],1,ctrl03))
+        parents = [(ctrl01,ctrlgrp02),(ctrl02,ctrlgrp03)]
+        return ([('orient',drivers,joint,jntWeights) for drivers, jntWeights, joint in orients] +
+                [('point',joints,ctrl,[weight] * len(joints)) for joints, weight, ctrl in points] +
+                [('parent',[ctrl],grp,[1]) for ctrl, grp in parents])
+    def constrain(self,channels,drivers,driven,weights=None,constraintMode='constraints'):
+        """Constrain a node with maintain offset, by a constraint node or matrix nodes.
+        
+        Drivers with the same weight are added in one constraint command, otherwise each is added with its own weight.
+        
+        Arguments:
+            channels {string} -- 'parent', 'orient' or 'point'.
+            drivers {list} -- The driver nodes.
+            driven {string} -- The node to constrain.
+        
+        Keyword Arguments:
+            weights {list} -- A weight per driver. (default: {None})
+            constraintMode {string} -- One of CONSTRAINT_MODES, 'matrix' uses matrixConstraint. (default: {'constraints'})
+        
+        Returns:
+            string -- The constraint, or the matrix node driving the offsetParentMatrix.
+        """
+        drivers = [str(i) for i in drivers]
+        weights = list(weights or [1.0] * len(drivers))
+        if constraintMode == 'matrix':
+            return self.matrixConstraint(drivers,driven,channels,weights)[0]
+        constraint = getattr(cmds,channels + 'Constraint')
+        if len(set(weights)) == 1:
+            return constraint(*(drivers + [str(driven)]),w=weights[0],mo=1)[0]
+        for driver, weight in zip(drivers,weights):  #maya adds each driver after the first as another target
+            made = constraint(driver,str(driven),w=weight,mo=1)[0]
+        return made
+    def constraintCost(self,channels,drivers,constraintMode='constraints',weights=None,joint=False,composed=0):
+        """What constrain makes and how many scene calls it takes, for build plans.
+        
+        Arguments:
+            channels {string} -- 'parent', 'orient' or 'point'.
+            drivers {list} -- The driver nodes.
+        
+        Keyword Arguments:
+            constraintMode {string} -- One of CONSTRAINT_MODES. (default: {'constraints'})
+            weights {list} -- A weight per driver. (default: {None})
+            joint {bool} -- The driven node is a joint, matrix nodes clear its joint orient too. (default: {False})
+            composed {int} -- Orient drivers whose composeMatrix this constraint makes, it is made by the first constraint a driver orients. (default: {0})
+        
+        Returns:
+            tuple -- (dict of node type : amount, calls).
+        """
+        weights = list(weights or [1.0] * len(drivers))
+        if constraintMode != 'matrix':
+            return {channels + 'Constraint':1}, 1 if len(set(weights)) == 1 else len(drivers)
+        sources = len(drivers)
+        nodes = OrderedDict([('multMatrix',sources)])
+        calls = 2 + sources * (1 + (4 if channels == 'orient' else 3))  #the driven nodes matrices, then each multMatrix and its matrixIn plugs
+        if channels == 'orient':
+            if composed:
+                nodes['composeMatrix'] = composed
+            calls += 6 * composed  #made, connected to the drivers rotate and rotate order, and its rest rotation read
+        else:
+            calls += sources  #each drivers world matrix
+        if channels == 'parent' and sources == 1:
+            calls += 1  #the multMatrix drives it
+        else:
+            targets = sources - 1 if channels == 'parent' else sources
+            nodes['blendMatrix'] = 1
+            calls += 3 + targets * (2 if channels == 'parent' else 6)  #made, its input and output, each target's matrix, weight and for orient and point the weights of each part
+        calls += 1 if channels == 'point' else 4 + int(joint)  #the channels cleared, the node type checked for a joint orient
+        return nodes, calls
+    def addSwitch(self,node,attr,niceName,**kwargs):
+        """Add a switch attribute, a node that already has it keeps it (updates rebuild what it drives).
+        
+        Arguments:
+            node {string} -- The node it goes on.
+            attr {string} -- The attribute name.
+            niceName {string} -- The name shown in the channel box.
+        
+        Keyword Arguments:
+            Passed on to addAttr, the attribute type and range.
+        """
+        if not cmds.attributeQuery(attr,node=str(node),exists=1):
+            cmds.addAttr(str(node),ln=attr,nn=niceName,k=1,**kwargs)
+    def ikfk_switch(self,chain01,chain02,chain03,switchCtrl,ctrlfk,ctrlik,mode='keys',constraintMode='constraints'):
         """IK FK switching
         
         Places a ik/fk switch attribute on the select node.
         Takes 3 joint chains.
         Parents them together.
         Creates set driven keys and uses the ik/fk switch attribute to swap values.
+        In 'network' mode no keys are made, the switch and one reverse node drive every constraint weight and the control visibility directly.
+        With the 'matrix' constraint mode each result joint is a blendMatrix between the ik and fk joint (see matrixConstraint), its one weight is the switch.
         
         Arguments:
             chain01 {list} -- IK joint chain.
@@ -898,50 +1364,79 @@ class EditNodes():
             switchCtrl {string} -- Node with ik fk switch attribute.
             ctrlfk {list} -- The FK controls.
             ctrlik {list} -- The IK controls.
+        
+        Keyword Arguments:
+            mode {string} -- 'keys' to use set driven keys or 'network' to use a shared reverse node. (default: {'keys'})
+            constraintMode {string} -- One of CONSTRAINT_MODES. (default: {'constraints'})
+        
+        Returns:
+            string -- The reverse node in 'network' mode.
         """
-        self.ikChain = chain01
-        self.fkChain = chain02
-        self.resultChain = chain03
-        self.switchCtrl = switchCtrl
-        self.ctrlfk = ctrlfk
-        self.ctrlik = ctrlik
-        cmds.addAttr(self.switchCtrl,ln='ik_fk_switch',nn='IK/FK Switch',at='double',min=0,max=1,dv=0,k=1)  #create switch attribute on cog grp node
-        const = []
+        self.ikChain = [str(i) for i in chain01]  #handles are looked up once, not once per connection
+        self.fkChain = [str(i) for i in chain02]
+        self.resultChain = [str(i) for i in chain03]
+        self.switchCtrl = str(switchCtrl)
+        self.ctrlfk = [str(i) for i in ctrlfk]
+        self.ctrlik = [str(i) for i in ctrlik]
+        self.addSwitch(self.switchCtrl,'ik_fk_switch','IK/FK Switch',at='double',min=0,max=1,dv=0)  #create switch attribute on cog grp node
+        weightPlugs = []  #the (ik, fk) weight plugs of each result joint, there is no ik weight on a blendMatrix
         for i in range(0, len(self.ikChain),1):  #use ik chain to loop over function, can be any chain though
+            if constraintMode == 'matrix':
+                blend, plugs = self.matrixConstraint([self.ikChain[i],self.fkChain[i]],self.resultChain[i],'parent',[.5,.5])
+                weightPlugs.append((None,plugs[0]))
+                continue
             c = cmds.parentConstraint(self.ikChain[i],self.fkChain[i],self.resultChain[i],w=.5,mo=1)  #parent the ik and fk chain to result
-            const.append(c)  #append the parent constraint name to the const list
-        for i in range(0, len(self.ikChain),1):
-            cmds.setAttr('{}.{}W0'.format(const[i][0],self.ikChain[i]),1)  #the name of the ik joint parent constraint
-            cmds.setAttr('{}.{}W1'.format(const[i][0],self.fkChain[i]),0)  #the name of the fk joint parent cosntraint
+            weightPlugs.append(('{}.w0'.format(c[0]),'{}.w1'.format(c[0])))  #the weights by index so they don't depend on the joints names
+        if mode == 'network':
+            switch = '{}.ik_fk_switch'.format(self.switchCtrl)
+            reverse = cmds.createNode('reverse',n='{}_ik_fk_switch_rev'.format(shortName(self.switchCtrl)),ss=1)  #1 - switch, the weight for everything ik
+            cmds.connectAttr(switch,reverse + '.inputX')
+            for ikWeight, fkWeight in weightPlugs:
+                if ikWeight is not None:
+                    cmds.connectAttr(reverse + '.outputX',ikWeight,f=1)  #ik weight is 1 when the switch is 0
+                cmds.connectAttr(switch,fkWeight,f=1)  #fk weight follows the switch
+            for ctrl in self.ctrlik:  #visibility only needs connecting once per control
+                cmds.connectAttr(reverse + '.outputX',ctrl + '.visibility',f=1)
+            for ctrl in self.ctrlfk:
+                cmds.connectAttr(switch,ctrl + '.visibility',f=1)
+            clearSelection()  #clear selection
+            return reverse
+        for ikWeight, fkWeight in weightPlugs:
+            if ikWeight is not None:
+                cmds.setAttr(ikWeight,1)  #the ik joint weight
+            cmds.setAttr(fkWeight,0)  #the fk joint weight
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[0]),0)  #set the visibility of the ik and fk controls
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[1]),0)
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[2]),0)
             cmds.setAttr('{}.visibility'.format(self.ctrlik[0]),1)
             cmds.setAttr('{}.visibility'.format(self.ctrlik[1]),1)
-            cmds.setDrivenKeyframe('{}.{}W0'.format(const[i][0],self.ikChain[i]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')  #create a key between the cog ik/fk switch
-            cmds.setDrivenKeyframe('{}.{}W1'.format(const[i][0],self.fkChain[i]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')  #and the ik/fk parent constraints
+            if ikWeight is not None:
+                cmds.setDrivenKeyframe(ikWeight,cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')  #create a key between the cog ik/fk switch
+            cmds.setDrivenKeyframe(fkWeight,cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')  #and the ik/fk parent constraints
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[0]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')         #also set a key for the controllers visibility
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[1]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[2]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlik[0]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlik[1]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
         cmds.setAttr('{}.ik_fk_switch'.format(self.switchCtrl),1)  #set the ik/fk switch attribute to 1
-        for i in range(0, len(self.ikChain),1):
-            cmds.setAttr('{}.{}W0'.format(const[i][0],self.ikChain[i]),0)  #do the same again but in reverse
-            cmds.setAttr('{}.{}W1'.format(const[i][0],self.fkChain[i]),1)  #parent cosntraints and visibility flipped 
+        for ikWeight, fkWeight in weightPlugs:
+            if ikWeight is not None:  #do the same again but in reverse
+                cmds.setAttr(ikWeight,0)
+            cmds.setAttr(fkWeight,1)  #parent cosntraints and visibility flipped 
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[0]),1)
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[1]),1)
             cmds.setAttr('{}.visibility'.format(self.ctrlfk[2]),1)
             cmds.setAttr('{}.visibility'.format(self.ctrlik[0]),0)
             cmds.setAttr('{}.visibility'.format(self.ctrlik[1]),0)
-            cmds.setDrivenKeyframe('{}.{}W0'.format(const[i][0],self.ikChain[i]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
-            cmds.setDrivenKeyframe('{}.{}W1'.format(const[i][0],self.fkChain[i]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
+            if ikWeight is not None:
+                cmds.setDrivenKeyframe(ikWeight,cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
+            cmds.setDrivenKeyframe(fkWeight,cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[0]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[1]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlfk[2]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlik[0]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
             cmds.setDrivenKeyframe('{}.visibility'.format(self.ctrlik[1]),cd = '{}.ik_fk_switch'.format(self.switchCtrl),itt='linear',ott='linear')
-        cmds.select(clear=1)  #clear selection
+        clearSelection()  #clear selection
         """ if we didn't set the animation type to linear earlier we could do it with this.
         for i in range(0, len(self.ikChain),1):
             crv01 = cmds.listConnections(const[i][0],t='animCurve')  #get the first set of anim curves created
@@ -950,8 +1445,268 @@ class EditNodes():
             cmds.selectKey(crv02,add=1,k=1,f= (0.0,1.0))
         cmds.keyTangent(itt='linear',ott='linear')  #set those keys to linear
         """
-        cmds.select(cl=1)  #clear selection
+        clearSelection()  #clear selection
         cmds.setAttr('{}.ik_fk_switch'.format(self.switchCtrl),0)  #swap ik/fk back to 0
+    def interpolateChain(self,chain,drivers,weights,switchCtrl,constraintMode='constraints'):
+        """Drive a dense chain from a sparser one.
+        
+        Each joint follows the two driver joints either side of it, weighted by how far between them it is, so the dense chain bends with the drivers.
+        A bind_chain switch is added to the switch control, off blocks every node that drives the chain so it stops evaluating.
+        
+        Arguments:
+            chain {list} -- The dense chain.
+            drivers {list} -- The chain it follows.
+            weights {list} -- (index,weight) for each joint of the dense chain, see geometry.chainInterpolation.
+            switchCtrl {string} -- The node the bind_chain switch goes on.
+        
+        Keyword Arguments:
+            constraintMode {string} -- One of CONSTRAINT_MODES. (default: {'constraints'})
+        
+        Returns:
+            list -- The constraints or matrix nodes that drive the chain, one per joint.
+        """
+        chain = [str(i) for i in chain]
+        drivers = [str(i) for i in drivers]
+        switchCtrl = str(switchCtrl)
+        made = []
+        for joint, (index, weight) in zip(chain,weights):
+            targets = self.interpolationTargets(drivers,index,weight)
+            made.append(self.constrain('parent',[t[0] for t in targets],joint,[t[1] for t in targets],constraintMode))
+        self.addSwitch(switchCtrl,'bind_chain','Bind Chain',at='enum',en='on=0:off=2')  #the values are the nodeState each option sets, 2 is blocking
+        for node in made:
+            cmds.connectAttr(switchCtrl + '.bind_chain',node + '.nodeState',f=1)
+        clearSelection()
+        return made
+    def interpolationTargets(self,drivers,index,weight):
+        """The drivers a joint of an interpolated chain follows, see interpolateChain.
+        
+        Arguments:
+            drivers {list} -- The chain it follows.
+            index {int} -- The driver before the joint.
+            weight {float} -- How far the joint is towards the next driver.
+        
+        Returns:
+            list -- (driver, weight) pairs.
+        """
+        targets = [(drivers[index],1.0 - weight),(drivers[index + 1],weight)]
+        return [target for target in targets if target[1] > 1e-6]  #a joint on top of a driver only follows that one
+class PlanExecutor():
+    """runs a build plan in the scene.
+    
+    The steps are run a batch at a time in the order BuildPlan.order gives, every group is made before anything is parented and every node is parented before anything is placed.
+    Locks, colors and rotation orders from states steps go through one AttrStates, which the steps run by call steps can record in too (see EditNodes).
+    """
+    def __init__(self,makeNodes=None,editNodes=None):
+        """Set up the node classes the steps use.
+        
+        Keyword Arguments:
+            makeNodes {MakeNodes} -- Used by create steps, a new one is made if not given. (default: {None})
+            editNodes {EditNodes} -- Used by place steps and given to call steps, a new one recording in the executors AttrStates if not given. (default: {None})
+        """
+        self.states = AttrStates()
+        self.makeNodes = makeNodes if makeNodes is not None else MakeNodes()
+        self.editNodes = editNodes if editNodes is not None else EditNodes(self.states)
+        self.results = {}  #step key : what the step made
+        self.attrReport = None  #what the attribute state table did on the last states batch, see AttrStates.apply
+    def run(self,plan):
+        """Run every step of a plan.
+        
+        Arguments:
+            plan {BuildPlan} -- The plan.
+        
+        Returns:
+            dict -- What the steps with keys made, by key.
+        """
+        for _ in self.pieces(plan):
+            pass
+        return self.results
+    def pieces(self,plan):
+        """Run a plan a piece at a time, so a gui can keep drawing between pieces (see BuildJob).
+        
+        A piece is a batch, or one stage of a call step whose function returns a generator.
+        Those generators yield the name of each stage before they build it and then what the step made.
+        
+        Arguments:
+            plan {BuildPlan} -- The plan.
+        
+        Yields:
+            tuple -- (stage, batches done, batches in the plan) before each piece is run.
+        """
+        batches = plan.order()
+        for i, (kind, steps) in enumerate(batches):
+            profileMark(kind)
+            if kind != 'call':
+                yield kind, i, len(batches)
+                getattr(self,'run' + kind[0].upper() + kind[1:])(steps)
+                continue
+            for step in steps:  #call steps are a piece each, named by their label
+                yield step.label or kind, i, len(batches)
+                result = step.args[0](self,*self.resolve(step.args[1:]))
+                if isinstance(result,types.GeneratorType):
+                    stages, result = result, None
+                    for item in stages:
+                        if isinstance(item,placements.STRING_TYPES):
+                            yield item, i, len(batches)
+                        else:
+                            result = item
+                self.store(step,result)
+    def resolve(self,value):
+        """Swap the Refs in a value for the nodes that have been made."""
+        return buildPlan.resolve(value,self.results)
+    def store(self,step,result):
+        if step.key is not None:
+            self.results[step.key] = result
+    def runCreate(self,steps):
+        for step in steps:
+            args = self.resolve(step.args)
+            self.store(step,getattr(self.makeNodes,args[0])(*args[1:]))
+    def runSetAttr(self,steps):
+        for step in steps:
+            node, attr, value = self.resolve(step.args)
+            if isinstance(value,(list,tuple)):  #a matrix
+                cmds.setAttr('{}.{}'.format(node,attr),list(value),type='matrix')
+            else:
+                cmds.setAttr('{}.{}'.format(node,attr),value)
+    def runStates(self,steps):
+        for step in steps:
+            recorded = step.args[0]
+            for (node, attr), value in recorded.values.items():
+                self.states.setValue(self.resolve(node),attr,value)
+            for (node, attr), state in recorded.states.items():
+                self.states.setState(self.resolve(node),[attr],**state)
+        self.attrReport = self.states.apply()
+    def runParent(self,steps):
+        children = OrderedDict()  #parent : children, one parent command each
+        for step in steps:
+            child, parent = self.resolve(step.args)
+            children.setdefault(parent,[]).append(child)
+        for parent, nodes in children.items():
+            reparent(nodes,parent)
+        clearSelection()
+    def runPlace(self,steps):
+        self.editNodes.placeNodes([self.resolve(step.args) for step in steps])
+    def runConstraint(self,steps):
+        for step in steps:
+            self.store(step,self.editNodes.constrain(*self.resolve(step.args)))
+    def runConnect(self,steps):
+        for step in steps:
+            source, sourceAttr, destination, destinationAttr = self.resolve(step.args)
+            cmds.connectAttr('{}.{}'.format(source,sourceAttr),'{}.{}'.format(destination,destinationAttr),f=1)
+    def runKey(self,steps):
+        drivers = OrderedDict()  #driver plug : (plug, {driver value : value}) for each key on it
+        for step in steps:
+            node, attr, driver, driverAttr, keys = self.resolve(step.args)
+            drivers.setdefault('{}.{}'.format(driver,driverAttr),[]).append(('{}.{}'.format(node,attr),dict(keys)))
+        for driver, keyed in drivers.items():
+            values = sorted(set(value for plug, keys in keyed for value in keys))
+            for value in values:  #every key at this driver value in one go
+                cmds.setAttr(driver,value)
+                for plug, keys in keyed:
+                    if value in keys:
+                        cmds.setAttr(plug,keys[value])
+                        cmds.setDrivenKeyframe(plug,cd=driver,itt='linear',ott='linear')
+            cmds.setAttr(driver,values[0])  #back to where the keys start
+class BuildJob():
+    """a planned build run a piece at a time, so the gui stays responsive while big rigs build.
+    
+    The build's BuildSession stays open from the first piece to the last, so the whole build is still one undo step.
+    Cancelling, or any piece raising, rolls back everything the job made.
+    
+        job = rig.spineRigJob('mainRig',fitRig,200)
+        while job.step():
+            ...draw job.stage, job.done and job.total...
+        job.result  #the SpineRig
+    """
+    def __init__(self,rig,plan,data=None,countNodes=False):
+        """Set up a job, nothing runs until the first step.
+        
+        Arguments:
+            rig {BuildRigs} -- The builder the plan was made by.
+            plan {BuildPlan} -- The plan, see BuildRigs.planSpineRig.
+        
+        Keyword Arguments:
+            data {object} -- What the build was given, kept on the builder as it always has been. (default: {None})
+            countNodes {bool} -- Count the nodes in the scene before and after so nodesMade can be reported. (default: {False})
+        """
+        self.rig = rig
+        self.plan = plan
+        self.data = data
+        self.countNodes = countNodes
+        self.executor = PlanExecutor()
+        self.stage = None  #what the next step builds
+        self.done = 0  #batches of the plan finished
+        self.total = 0  #batches in the plan
+        self.result = None  #the SpineRig once finished
+        self.status = 'waiting'  #'waiting', 'running', 'finished', 'cancelled' or 'failed'
+        self.seconds = 0.0  #from the first step to the last, time between steps included
+        self.nodesMade = None  #nodes in the scene afterwards less the nodes before, when counted
+        self._start = None
+        self._before = None
+        self._pieces = None
+    def step(self):
+        """Run the next piece of the build.
+        
+        An error rolls the build back, marks the job failed and is raised again.
+        
+        Returns:
+            bool -- True while there is more to build.
+        """
+        if self.status not in ('waiting','running'):
+            return False
+        if self._pieces is None:
+            self._start = _clock()
+            self._before = len(cmds.ls() or []) if self.countNodes else None
+            self._pieces = self.pieces()
+            self.status = 'running'
+        try:
+            self.stage, self.done, self.total = next(self._pieces)
+            return True
+        except StopIteration:
+            self.finish('finished')
+            return False
+        except Exception:
+            self.finish('failed')
+            raise
+    def run(self):
+        """Run the whole build in one go.
+        
+        Returns:
+            SpineRig -- What was built.
+        """
+        while self.step():
+            pass
+        return self.result
+    def cancel(self):
+        """Stop the build and roll back everything it made, does nothing once it has finished."""
+        if self.status != 'running':
+            self.status = 'cancelled' if self.status == 'waiting' else self.status
+            return
+        self._pieces.close()  #the sessions exit sees the GeneratorExit and rolls back
+        self.finish('cancelled')
+    def finish(self,status):
+        self.status = status
+        self.seconds = _clock() - self._start
+        if self.countNodes:
+            self.nodesMade = len(cmds.ls() or []) - self._before
+    def pieces(self):
+        with BuildSession(self.plan.name):  #one undo step, rolled back if anything fails or the job is cancelled
+            self.rig.data = self.data
+            for progress in self.executor.pieces(self.plan):
+                yield progress
+            self.rig.attrReport = self.executor.attrReport
+        self.done = self.total
+        self.stage = 'done'
+        self.result = self.rig.spineRigResult(self.executor.results['record'])
+    def summary(self):
+        """A line for the artist saying how the build went."""
+        if self.status == 'finished':
+            made = '' if self.nodesMade is None else ', {} nodes created'.format(self.nodesMade)
+            return '{} built in {:.2f}s{}'.format(self.plan.name,self.seconds,made)
+        if self.status == 'cancelled':
+            return '{} cancelled after {:.2f}s, nothing was kept'.format(self.plan.name,self.seconds)
+        if self.status == 'failed':
+            return '{} failed after {:.2f}s during {}, nothing was kept'.format(self.plan.name,self.seconds,self.stage)
+        return '{} {} {}/{}'.format(self.plan.name,self.stage or 'waiting',self.done,self.total)
 class BuildRigs():
     """Build the rigs
     
@@ -959,6 +1714,7 @@ class BuildRigs():
     """
     def __init__(self,charName):
         self.charName = charName
+        self.attrReport = None  #what the attribute state table did on the last build, see AttrStates.apply
     def buildFitRig(self, rigName):
         """Builds the fit rig.
         
@@ -967,361 +1723,773 @@ class BuildRigs():
         Arguments:
             rigName {string} -- The rig name.
         Returns:
-            *string -- Returns nodes needed to build the spine rig.
+            FitRig -- Returns nodes needed to build the spine rig as NodeHandles.
+        """
+        with profileStage('buildFitRig'), BuildSession('{}_{}'.format(self.charName,rigName)):  #one undo step, rolled back if anything fails
+            self.rigName = rigName  #rig name ('fit rig')
+            _makeNodeInstance = MakeNodes()  #instance the make and edit classes
+            states = AttrStates()  #locks, colors and rotation orders are collected and set together
+            _editNodeInstance = EditNodes(states)
+            profileMark('controls')
+            #-------------------------- crate the controlls, locators and groups needed for the fit rig ----------------------------#
+            rootCtrl = _makeNodeInstance.circleCtrl(self.charName,'{}_root'.format(self.rigName),'ctrl',1,0,7,360)                  #
+            hipLoc = _makeNodeInstance.createLoc(self.charName,'{}_hip'.format(self.rigName),'pivPoint_loc')                        #
+            chestLoc = _makeNodeInstance.createLoc(self.charName,'{}_chest'.format(self.rigName),'pivPoint_loc')                    #
+            hipFinderLoc = _makeNodeInstance.createLoc(self.charName,'{}_root'.format(self.rigName),'finder_loc')                   #
+            chestFinderLoc = _makeNodeInstance.createLoc(self.charName,'{}_chest'.format(self.rigName),'finder_loc')                #
+            chestFinderGrp = _makeNodeInstance.createGrp(self.charName,'{}_chestFinder'.format(self.rigName),'offset')              #
+            hipFinderGrp = _makeNodeInstance.createGrp(self.charName,'{}_rootFinder'.format(self.rigName),'offset')                 #
+            hipGrp = _makeNodeInstance.createGrp(self.charName,'{}_hip'.format(self.rigName),'offset')                              #
+            chestGrp = _makeNodeInstance.createGrp(self.charName,'{}_chest'.format(self.rigName),'offset')                          #
+            rootGrp = _makeNodeInstance.createGrp(self.charName,'{}_root'.format(self.rigName),'offset')                            #
+            pivConstGrp = _makeNodeInstance.createGrp(self.charName,'{}_piv'.format(self.rigName),'const')                          #
+            aimGuideGrp = _makeNodeInstance.createGrp(self.charName,'{}_aimGuide'.format(self.rigName),'offset')                    #
+            hipChestLineCrvGrp = _makeNodeInstance.createGrp(self.charName,'{}_hipChestLineCrv'.format(self.rigName),'grp')         #
+            hipCtrl = _makeNodeInstance.createCurve(self.charName,'sh02','{}_hip'.format(self.rigName),'ctrl')                      #
+            chestCtrl = _makeNodeInstance.createCurve(self.charName,'sh02','{}_chest'.format(self.rigName),'ctrl')                  #
+            hipChestLineCrv = _makeNodeInstance.createCurve(self.charName,'sh06','{}_spineLine'.format(self.rigName),'guide')       #
+            aimGuide = _makeNodeInstance.createCurve(self.charName,'sh07','{}_spineArrow'.format(self.rigName),'guide')             #
+            #-----------------------------------------------------------------------------------------------------------------------+
+            hipChestLineCrv_cls_lwr = _editNodeInstance.clusterCrv(hipChestLineCrv,0,'lwr')  #create clusters on the curve
+            hipChestLineCrv_cls_upr = _editNodeInstance.clusterCrv(hipChestLineCrv,1,'upr')
+            _editNodeInstance.setRotateOrder(rootCtrl,1,0)  #set rotation order on root ctrl
+            states.apply()  #rotation orders need to be set before anything is moved
+            _editNodeInstance.centerWorld(hipChestLineCrv_cls_upr)  #center the cluster grp
+            profileMark('hierarchy')
+            #--------------------------------------------- Create hierarchy for fit rig --------------------------------------------#
+            _editNodeInstance.parentNodes(hipFinderLoc,hipFinderGrp)                                                                #
+            _editNodeInstance.parentNodes(chestFinderLoc,chestFinderGrp)                                                            #
+            _editNodeInstance.parentNodes(rootCtrl,rootGrp)                                                                         #
+            _editNodeInstance.parentNodes(pivConstGrp,rootCtrl)                                                                     #
+            _editNodeInstance.parentNodes(hipChestLineCrv_cls_lwr,hipFinderLoc)                                                     #
+            _editNodeInstance.parentNodes(hipChestLineCrv_cls_upr,chestFinderLoc)                                                   #
+            _editNodeInstance.parentNodes(hipLoc,hipCtrl)                                                                           #
+            _editNodeInstance.parentNodes(hipCtrl,hipGrp)                                                                           #
+            _editNodeInstance.parentNodes(hipGrp,rootCtrl)                                                                          #
+            _editNodeInstance.parentNodes(chestLoc,chestCtrl)                                                                       #
+            _editNodeInstance.parentNodes(chestCtrl,chestGrp)                                                                       #
+            _editNodeInstance.parentNodes(aimGuide,aimGuideGrp)                                                                     #
+            _editNodeInstance.parentNodes(hipChestLineCrv,hipChestLineCrvGrp)                                                       #
+            _editNodeInstance.parentNodes(aimGuideGrp,pivConstGrp)                                                                  #
+            _editNodeInstance.parentNodes(hipChestLineCrvGrp,pivConstGrp)                                                           #
+            _editNodeInstance.parentNodes(chestGrp,pivConstGrp)                                                                     #
+            _editNodeInstance.parentNodes(chestFinderGrp,chestCtrl)                                                                 #
+            _editNodeInstance.parentNodes(hipFinderGrp,hipCtrl)                                                                     #
+            #-----------------------------------------------------------------------------------------------------------------------#
+            _editNodeInstance.xformNode(aimGuideGrp,['pass','pass','pass'],[90,90,'pass'],['pass','pass','pass'],0,0)  #position the aim guide grp
+            _editNodeInstance.xformNode(chestGrp,[0,10,0],['pass','pass','pass'],['pass','pass','pass'],0,0)  #position the chest grp
+            cmds.pointConstraint(str(hipLoc),str(aimGuideGrp),mo=0)  #point constraint the hip loc to the aim guide grp
+            cmds.pointConstraint(str(chestLoc),str(aimGuideGrp),mo=0)  #point constraint the chest loc to theaim guide grp
+            cmds.setAttr(hipChestLineCrvGrp + '.inheritsTransform',0)  #turn off the curve inherit transform attribute
+            cmds.setAttr(hipLoc + '.visibility',0)  #set hip loc visibility to 0
+            cmds.setAttr(chestLoc + '.visibility',0)  #set chest loc visibility to 0
+            cmds.setAttr(hipChestLineCrv_cls_lwr + '.visibility',0)  #set curve clusters visibility to 0
+            cmds.setAttr(hipChestLineCrv_cls_upr + '.visibility',0)
+            profileMark('lock/hide')
+            #--------------------------------- lock and hide nodes ---------------------------------#
+            _editNodeInstance.lockHideAll(hipGrp)                                                   #
+            _editNodeInstance.lockHideAll(hipLoc)                                                   #
+            _editNodeInstance.lockHideAll(aimGuideGrp)                                              #
+            _editNodeInstance.lockHideAll(hipChestLineCrvGrp)                                       #
+            _editNodeInstance.lockHideAll(chestGrp)                                                 #
+            _editNodeInstance.lockHideAll(chestLoc)                                                 #
+            _editNodeInstance.lockHideAll(hipChestLineCrv_cls_lwr)                                  #
+            _editNodeInstance.lockHideAll(hipChestLineCrv_cls_upr)                                  #
+            _editNodeInstance.lockHideAll(pivConstGrp)                                              #
+            _editNodeInstance.lockHideAll(chestFinderGrp)                                           #
+            _editNodeInstance.lockHideAll(hipFinderGrp)                                             #
+            _editNodeInstance.lockHideSpecific(hipCtrl,[0,0,0],[1,1,1],[0,1,0],0)                   #
+            _editNodeInstance.lockHideSpecific(chestCtrl,[0,0,0],[1,1,1],[0,1,0],0)                 #
+            _editNodeInstance.lockHideSpecific(rootCtrl,[0,0,0],[0,0,0],[0,0,0],0)                  #
+            _editNodeInstance.lockHideSpecific(rootGrp,[1,1,1],[1,1,1],[1,1,1],0)                   #
+            _editNodeInstance.lockHideSpecific(chestFinderLoc,[0,0,0],[1,1,1],[1,1,1],0)            #
+            _editNodeInstance.lockHideSpecific(hipFinderLoc,[0,0,0],[1,1,1],[1,1,1],0)              #
+            _editNodeInstance.lockHideSpecific(aimGuide,[1,1,1],[1,1,1],[1,1,1],0)                  #
+            _editNodeInstance.lockHideSpecific(hipChestLineCrv,[1,1,1],[1,1,1],[1,1,1],0)           #
+            #------------------------------ set node color overrides -------------------------------#
+            _editNodeInstance.setCol(hipCtrl, 'yellow')                                             #
+            _editNodeInstance.setCol(chestCtrl, 'yellow')                                           #
+            _editNodeInstance.setCol(aimGuide, 'red')                                               #
+            _editNodeInstance.setCol(hipChestLineCrv, 'red')                                        #
+            _editNodeInstance.setCol(rootCtrl,'white')                                              #
+            _editNodeInstance.setCol(chestFinderLoc,'pink')                                         #
+            _editNodeInstance.setCol(hipFinderLoc,'pink')                                           #
+            #---------------------------------------------------------------------------------------#
+            cmds.connectAttr(rootCtrl + '.scaleY',rootCtrl + '.scaleX')  #connect root ctrl scale y to its scale z and x
+            cmds.connectAttr(rootCtrl + '.scaleY',rootCtrl + '.scaleZ')
+            _editNodeInstance.lockHideSpecific(rootCtrl,[0,0,0],[0,0,0],[1,0,1],0)  #lock its scale x and z
+            self.attrReport = states.apply()  #set every lock, color and rotation order in one go
+            return FitRig(hipCtrl,chestCtrl,hipLoc,chestLoc,rootCtrl,hipFinderLoc,chestFinderLoc,hipChestLineCrv,rootGrp)  #return nodes to be used to create the spine rig
+    def captureFitRig(self,data,path=None):
+        """Capture where the fit rig has been placed.
+        
+        The spine rig can be rebuilt from the placements without a fit rig in the scene.
+        
+        Arguments:
+            data {list} -- The nodes created by the fit rig.
+        
+        Keyword Arguments:
+            path {string} -- A json file to save the placements to. (default: {None})
+        
+        Returns:
+            FitPlacements -- The world placements of the fit rig nodes the spine rig is built from.
         """
-        self.rigName = rigName  #rig name ('fit rig')
-        _makeNodeInstance = MakeNodes()  #instance the make and edit classes
         _editNodeInstance = EditNodes()
-        #-------------------------- crate the controlls, locators and groups needed for the fit rig ----------------------------#
-        rootCtrl = _makeNodeInstance.circleCtrl(self.charName,'{}_root'.format(self.rigName),'ctrl',1,0,7,360)                  #
-        hipLoc = _makeNodeInstance.createLoc(self.charName,'{}_hip'.format(self.rigName),'pivPoint_loc')                        #
-        chestLoc = _makeNodeInstance.createLoc(self.charName,'{}_chest'.format(self.rigName),'pivPoint_loc')                    #
-        hipFinderLoc = _makeNodeInstance.createLoc(self.charName,'{}_root'.format(self.rigName),'finder_loc')                   #
-        chestFinderLoc = _makeNodeInstance.createLoc(self.charName,'{}_chest'.format(self.rigName),'finder_loc')                #
-        chestFinderGrp = _makeNodeInstance.createGrp(self.charName,'{}_chestFinder'.format(self.rigName),'offset')              #
-        hipFinderGrp = _makeNodeInstance.createGrp(self.charName,'{}_rootFinder'.format(self.rigName),'offset')                 #
-        hipGrp = _makeNodeInstance.createGrp(self.charName,'{}_hip'.format(self.rigName),'offset')                              #
-        chestGrp = _makeNodeInstance.createGrp(self.charName,'{}_chest'.format(self.rigName),'offset')                          #
-        rootGrp = _makeNodeInstance.createGrp(self.charName,'{}_root'.format(self.rigName),'offset')                            #
-        pivConstGrp = _makeNodeInstance.createGrp(self.charName,'{}_piv'.format(self.rigName),'const')                          #
-        aimGuideGrp = _makeNodeInstance.createGrp(self.charName,'{}_aimGuide'.format(self.rigName),'offset')                    #
-        hipChestLineCrvGrp = _makeNodeInstance.createGrp(self.charName,'{}_hipChestLineCrv'.format(self.rigName),'grp')         #
-        hipCtrl = _makeNodeInstance.createCurve(self.charName,'sh02','{}_hip'.format(self.rigName),'ctrl')                      #
-        chestCtrl = _makeNodeInstance.createCurve(self.charName,'sh02','{}_chest'.format(self.rigName),'ctrl')                  #
-        hipChestLineCrv = _makeNodeInstance.createCurve(self.charName,'sh06','{}_spineLine'.format(self.rigName),'guide')       #
-        aimGuide = _makeNodeInstance.createCurve(self.charName,'sh07','{}_spineArrow'.format(self.rigName),'guide')             #
-        #-----------------------------------------------------------------------------------------------------------------------+
-        hipChestLineCrv_cls_lwr = _editNodeInstance.clusterCrv(hipChestLineCrv,0,'lwr')  #create clusters on the curve
-        hipChestLineCrv_cls_upr = _editNodeInstance.clusterCrv(hipChestLineCrv,1,'upr')
-        _editNodeInstance.setRotateOrder(rootCtrl,1,0)  #set rotation order on root ctrl
-        _editNodeInstance.centerWorld(hipChestLineCrv_cls_upr)  #center the cluster grp
-        #--------------------------------------------- Create hierarchy for fit rig --------------------------------------------#
-        _editNodeInstance.parentNodes(hipFinderLoc,hipFinderGrp)                                                                #
-        _editNodeInstance.parentNodes(chestFinderLoc,chestFinderGrp)                                                            #
-        _editNodeInstance.parentNodes(rootCtrl,rootGrp)                                                                         #
-        _editNodeInstance.parentNodes(pivConstGrp,rootCtrl)                                                                     #
-        _editNodeInstance.parentNodes(hipChestLineCrv_cls_lwr,hipFinderLoc)                                                     #
-        _editNodeInstance.parentNodes(hipChestLineCrv_cls_upr,chestFinderLoc)                                                   #
-        _editNodeInstance.parentNodes(hipLoc,hipCtrl)                                                                           #
-        _editNodeInstance.parentNodes(hipCtrl,hipGrp)                                                                           #
-        _editNodeInstance.parentNodes(hipGrp,rootCtrl)                                                                          #
-        _editNodeInstance.parentNodes(chestLoc,chestCtrl)                                                                       #
-        _editNodeInstance.parentNodes(chestCtrl,chestGrp)                                                                       #
-        _editNodeInstance.parentNodes(aimGuide,aimGuideGrp)                                                                     #
-        _editNodeInstance.parentNodes(hipChestLineCrv,hipChestLineCrvGrp)                                                       #
-        _editNodeInstance.parentNodes(aimGuideGrp,pivConstGrp)                                                                  #
-        _editNodeInstance.parentNodes(hipChestLineCrvGrp,pivConstGrp)                                                           #
-        _editNodeInstance.parentNodes(chestGrp,pivConstGrp)                                                                     #
-        _editNodeInstance.parentNodes(chestFinderGrp,chestCtrl)                                                                 #
-        _editNodeInstance.parentNodes(hipFinderGrp,hipCtrl)                                                                     #
-        #-----------------------------------------------------------------------------------------------------------------------#
-        _editNodeInstance.xformNode(aimGuideGrp,['pass','pass','pass'],[90,90,'pass'],['pass','pass','pass'],0,0)  #position the aim guide grp
-        _editNodeInstance.xformNode(chestGrp,[0,10,0],['pass','pass','pass'],['pass','pass','pass'],0,0)  #position the chest grp
-        cmds.pointConstraint(hipLoc,aimGuideGrp,mo=0)  #point constraint the hip loc to the aim guide grp
-        cmds.pointConstraint(chestLoc,aimGuideGrp,mo=0)  #point constraint the chest loc to theaim guide grp
-        cmds.setAttr(hipChestLineCrvGrp + '.inheritsTransform',0)  #turn off the curve inherit transform attribute
-        cmds.setAttr(hipLoc + '.visibility',0)  #set hip loc visibility to 0
-        cmds.setAttr(chestLoc + '.visibility',0)  #set chest loc visibility to 0
-        cmds.setAttr(hipChestLineCrv_cls_lwr + '.visibility',0)  #set curve clusters visibility to 0
-        cmds.setAttr(hipChestLineCrv_cls_upr + '.visibility',0)
-        #--------------------------------- lock and hide nodes ---------------------------------#
-        _editNodeInstance.lockHideAll(hipGrp)                                                   #
-        _editNodeInstance.lockHideAll(hipLoc)                                                   #
-        _editNodeInstance.lockHideAll(aimGuideGrp)                                              #
-        _editNodeInstance.lockHideAll(hipChestLineCrvGrp)                                       #
-        _editNodeInstance.lockHideAll(chestGrp)                                                 #
-        _editNodeInstance.lockHideAll(chestLoc)                                                 #
-        _editNodeInstance.lockHideAll(hipChestLineCrv_cls_lwr)                                  #
-        _editNodeInstance.lockHideAll(hipChestLineCrv_cls_upr)                                  #
-        _editNodeInstance.lockHideAll(pivConstGrp)                                              #
-        _editNodeInstance.lockHideAll(chestFinderGrp)                                           #
-        _editNodeInstance.lockHideAll(hipFinderGrp)                                             #
-        _editNodeInstance.lockHideSpecific(hipCtrl,[0,0,0],[1,1,1],[0,1,0],0)                   #
-        _editNodeInstance.lockHideSpecific(chestCtrl,[0,0,0],[1,1,1],[0,1,0],0)                 #
-        _editNodeInstance.lockHideSpecific(rootCtrl,[0,0,0],[0,0,0],[0,0,0],0)                  #
-        _editNodeInstance.lockHideSpecific(rootGrp,[1,1,1],[1,1,1],[1,1,1],0)                   #
-        _editNodeInstance.lockHideSpecific(chestFinderLoc,[0,0,0],[1,1,1],[1,1,1],0)            #
-        _editNodeInstance.lockHideSpecific(hipFinderLoc,[0,0,0],[1,1,1],[1,1,1],0)              #
-        _editNodeInstance.lockHideSpecific(aimGuide,[1,1,1],[1,1,1],[1,1,1],0)                  #
-        _editNodeInstance.lockHideSpecific(hipChestLineCrv,[1,1,1],[1,1,1],[1,1,1],0)           #
-        #------------------------------ set node color overrides -------------------------------#
-        _editNodeInstance.setCol(hipCtrl, 'yellow')                                             #
-        _editNodeInstance.setCol(chestCtrl, 'yellow')                                           #
-        _editNodeInstance.setCol(aimGuide, 'red')                                               #
-        _editNodeInstance.setCol(hipChestLineCrv, 'red')                                        #
-        _editNodeInstance.setCol(rootCtrl,'white')                                              #
-        _editNodeInstance.setCol(chestFinderLoc,'pink')                                         #
-        _editNodeInstance.setCol(hipFinderLoc,'pink')                                           #
-        #---------------------------------------------------------------------------------------#
-        cmds.connectAttr(rootCtrl + '.scaleY',rootCtrl + '.scaleX')  #connect root ctrl scale y to its scale z and x
-        cmds.connectAttr(rootCtrl + '.scaleY',rootCtrl + '.scaleZ')
-        cmds.setAttr(rootCtrl + '.sx',lock=1,keyable=0,channelBox = 0)  #lock its scale x and z
-        cmds.setAttr(rootCtrl + '.sz',lock=1,keyable=0,channelBox = 0)
-        return(hipCtrl,chestCtrl,hipLoc,chestLoc,rootCtrl,hipFinderLoc,chestFinderLoc,hipChestLineCrv,rootGrp)  #return nodes to be used to create the spine rig
-    def buildSpineRig(self,rigName,data,jointAmount):
+        fit = placements.FitPlacements(*[_editNodeInstance.matchNodes(data[i]) for i in placements.FIT_NODES.values()],charName=self.charName)
+        if path is not None:
+            fit.save(path)
+        return fit
+    def fitPlacements(self,data):
+        """Get fit rig placements from whatever buildSpineRig was given.
+        
+        Arguments:
+            data {list} -- The nodes created by the fit rig, a FitPlacements or the path to a saved one.
+        
+        Returns:
+            FitPlacements -- The placements.
+        """
+        if isinstance(data,placements.FitPlacements):
+            return data
+        if isinstance(data,placements.STRING_TYPES):
+            return placements.FitPlacements.load(data)
+        return self.captureFitRig(data)
+    def buildSpineRig(self,rigName,data,jointAmount,switchMode=RECORDED,fkFalloff=RECORDED,update=False,dryRun=False,constraintMode=RECORDED,flatten=False,bindJointAmount=RECORDED,aimJoints=RECORDED,distribution='line'):
         """Build spine rig.
         
         Uses fit rig placements to build the spine rig.
+        The build is planned first (see planSpineRig) then run in batches by a PlanExecutor, see spineRigJob to run it a piece at a time.
+        With update on, a spine rig already built for the character is found and only its joint amount is changed (see updateSpineRig).
+        Settings left as RECORDED are kept from the rig on an update and are the SPINE_SETTINGS defaults on a new build.
         
         Arguments:
             rigName {string} -- The name of the rig.
-            data {list} -- The nodes created by the fit rig used to build the spine rig.
+            data {list} -- The nodes created by the fit rig used to build the spine rig, or its captured placements (see captureFitRig) as a FitPlacements or the path to their file.
             jointAmount {int} -- The amount of joints created for the spine rig.
+        
+        Keyword Arguments:
+            switchMode {string} -- How the ik/fk switch is wired, 'network' or 'keys' (see EditNodes.ikfk_switch), 'network' for a new build. (default: {RECORDED})
+            fkFalloff {string} -- How the fk controllers weights fall off along the chain, one of geometry.FALLOFFS, 'dropoff' for a new build, the weighting the original skinCluster bind gave. (default: {RECORDED})
+            update {bool} -- Update an existing rig instead of building a new one, data is only used when there isn't one. (default: {False})
+            dryRun {bool} -- Only plan the build, print what it would make and return the plan, nothing in the scene is changed. (default: {False})
+            constraintMode {string} -- 'constraints' or 'matrix', matrix drives the chains and fk controls with matrix nodes and no constraint nodes (maya 2020+, see EditNodes.matrixConstraint), 'constraints' for a new build. (default: {RECORDED})
+            flatten {bool} -- Leave out the offset and ctrl_grp groups (FLAT_GROUPS), the hip and chest controls rest in their offsetParentMatrix (maya 2020+), an update keeps what the rig was built with. (default: {False})
+            bindJointAmount {int} -- Level of detail mode, the ik, fk and result chains get jointAmount joints and a bind chain of this many joints is interpolated between the result joints (see EditNodes.interpolateChain), None has no bind chain, None for a new build. (default: {RECORDED})
+            aimJoints {bool} -- Aim each chain joints y axis at the next joint, z as close to the hips as it can be, instead of copying the hip rotation (see frames.chainFrames), off for a new build. (default: {RECORDED})
+            distribution {string} -- How the joints are spread from hip to chest, one of geometry.DISTRIBUTIONS, 'line' evenly on a straight line, 'length' evenly along the spine curve and 'curvature' closer together where it bends (see geometry.curveParams), the curve modes aim the joints, an update keeps what the rig was built with. (default: {'line'})
+        
+        Returns:
+            SpineRig -- The rigs nodes as NodeHandles, the BuildPlan instead when dryRun is on.
+        """
+        if update and not dryRun:
+            record = self.updateSpineRig(rigName,jointAmount,switchMode,fkFalloff,constraintMode,bindJointAmount,aimJoints)
+            if record is not None:
+                return self.spineRigResult(record)
+        settings = self.spineSettings(switchMode=switchMode,fkFalloff=fkFalloff,constraintMode=constraintMode,bindJointAmount=bindJointAmount,aimJoints=aimJoints)
+        switchMode, fkFalloff, constraintMode, bindJointAmount, aimJoints = settings.values()
+        with profileStage('buildSpineRig'):
+            job = self.spineRigJob(rigName,data,jointAmount,switchMode,fkFalloff,constraintMode=constraintMode,flatten=flatten,bindJointAmount=bindJointAmount,aimJoints=aimJoints,
+                                   distribution=distribution)
+            if dryRun:
+                print(job.plan.describe())
+                print('  curve deviation: {:.4f}'.format(self.chainDeviation(data,jointAmount,distribution)))
+                return job.plan
+            return job.run()
+    def spineSettings(self,record=None,**settings):
+        """Fill in the spine rig settings left as RECORDED.
+        
+        Keyword Arguments:
+            record {dict} -- The record of the rig being updated, None for a new build. (default: {None})
+            settings {dict} -- The settings by name, see SPINE_SETTINGS.
+        
+        Returns:
+            OrderedDict -- Every setting in SPINE_SETTINGS, from the record or its default when it wasn't given.
         """
+        out = OrderedDict()
+        for key, default in SPINE_SETTINGS.items():
+            value = settings.get(key,RECORDED)
+            if value is RECORDED:
+                value = default if record is None else record.get(key,default)
+            out[key] = value
+        return out
+    def spineRigJob(self,rigName,data,jointAmount,switchMode='network',fkFalloff='dropoff',countNodes=False,constraintMode='constraints',flatten=False,bindJointAmount=None,aimJoints=False,distribution='line'):
+        """Plan a spine rig build to be run a piece at a time.
+        
+        Only the plan is made, the scene is left alone until the jobs first step.
+        
+        Arguments:
+            rigName {string} -- The name of the rig.
+            data {list} -- The fit rig nodes or its captured placements, see buildSpineRig.
+            jointAmount {int} -- The amount of joints created for the spine rig.
+        
+        Keyword Arguments:
+            switchMode {string} -- How the ik/fk switch is wired, 'network' or 'keys'. (default: {'network'})
+            fkFalloff {string} -- How the fk controllers weights fall off along the chain. (default: {'dropoff'})
+            countNodes {bool} -- Count the nodes the build makes, see BuildJob. (default: {False})
+            constraintMode {string} -- 'constraints' or 'matrix'. (default: {'constraints'})
+            flatten {bool} -- Leave out the zero out groups, see buildSpineRig. (default: {False})
+            bindJointAmount {int} -- Joints in the interpolated bind chain, None has none. (default: {None})
+            aimJoints {bool} -- Aim the chain joints down the chain, see buildSpineRig. (default: {False})
+            distribution {string} -- How the joints are spread from hip to chest, see buildSpineRig. (default: {'line'})
+        
+        Returns:
+            BuildJob -- The job.
+        """
+        profileMark('plan')
+        fit = self.fitPlacements(data)
+        fitRig = None if isinstance(data,(placements.FitPlacements,) + placements.STRING_TYPES) else data[8]  #built from a fit rig, not from placements
+        plan = self.planSpineRig(rigName,fit,jointAmount,switchMode,fkFalloff,fitRig,constraintMode,flatten,bindJointAmount,aimJoints,distribution)
+        return BuildJob(self,plan,data,countNodes)
+    def planSpineRig(self,rigName,fit,jointAmount,switchMode='network',fkFalloff='dropoff',fitRig=None,constraintMode='constraints',flatten=False,bindJointAmount=None,aimJoints=False,distribution='line'):
+        """Plan a spine rig build.
+        
+        Every control, group, parent, placement, lock and color the build makes is a step, nothing in the scene is touched.
+        The parts that depend on the joint amount are planned by planSpineChains, the same steps an update runs.
+        
+        Arguments:
+            rigName {string} -- The name of the rig.
+            fit {FitPlacements} -- Where the fit rig was placed.
+            jointAmount {int} -- The amount of joints created for the spine rig.
+        
+        Keyword Arguments:
+            switchMode {string} -- How the ik/fk switch is wired, 'network' or 'keys'. (default: {'network'})
+            fkFalloff {string} -- How the fk controllers weights fall off along the chain. (default: {'dropoff'})
+            fitRig {string} -- The fit rigs top group, deleted once the rig is built, None keeps it. (default: {None})
+            constraintMode {string} -- 'constraints' or 'matrix'. (default: {'constraints'})
+            flatten {bool} -- Leave out the zero out groups, see buildSpineRig. (default: {False})
+            bindJointAmount {int} -- Joints in the interpolated bind chain, None has none. (default: {None})
+            aimJoints {bool} -- Aim the chain joints down the chain, see buildSpineRig. (default: {False})
+            distribution {string} -- How the joints are spread from hip to chest, see buildSpineRig. (default: {'line'})
+        
+        Returns:
+            BuildPlan -- The plan, run it with a PlanExecutor.
+        """
+        if constraintMode not in CONSTRAINT_MODES:
+            raise ValueError('unknown constraint mode {!r}, use one of {}'.format(constraintMode,', '.join(CONSTRAINT_MODES)))
+        if distribution not in geometry.DISTRIBUTIONS:
+            raise ValueError('unknown distribution {!r}, use one of {}'.format(distribution,', '.join(geometry.DISTRIBUTIONS)))
         self.rigName = rigName
-        self.data = data
         self.jointAmount = jointAmount
-        _makeNodeInstance = MakeNodes()  #instance the make and edit classes
-        _editNodeInstance = EditNodes()
-        #----------------------------------------- crate the controlls, locators and groups needed for the fit rig -----------------------------------------#
-        hipCtrl = _makeNodeInstance.createCurve(self.charName,'sh08','{}_hip'.format(self.rigName),'ctrl')                                                  #
-        chestCtrl = _makeNodeInstance.createCurve(self.charName,'sh08','{}_chest'.format(self.rigName),'ctrl')                                              #
-        fkCtrl01 = _makeNodeInstance.circleCtrl(self.charName,'{}_spine'.format(self.rigName),'FK_ctrl_01',2,.125,4,360)                                    #
-        fkCtrl02 = _makeNodeInstance.circleCtrl(self.charName,'{}_spine'.format(self.rigName),'FK_ctrl_02',2,.125,4,360)                                    #
-        fkCtrl03 = _makeNodeInstance.circleCtrl(self.charName,'{}_spine'.format(self.rigName),'FK_ctrl_03',2,.125,4,360)                                    #
-        indHipCtrlTempgrp = _makeNodeInstance.createGrp(self.charName,'{}_ind_hip_temp_grp'.format(self.rigName),'replace_with_your_indipendent_hip_ctrl')  #
-        cogGrp = _makeNodeInstance.createGrp(self.charName,'{}_cog'.format(self.rigName),'replace_with_your_cog_ctrl')                                      #
-        hipOffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_hip'.format(self.rigName),'offset')                                                    #
-        chestOffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_chest'.format(self.rigName),'offset')                                                #
-        chestCtrlGrp = _makeNodeInstance.createGrp(self.charName,'{}_chest'.format(self.rigName),'ctrl_grp')                                                #
-        ikJntChainOffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_IK_jnt_chain'.format(self.rigName),'offset')                                    #
-        fkJntChainOffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_FK_jnt_chain'.format(self.rigName),'offset')                                    #
-        resultJntChainOffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_result_jnt_chain'.format(self.rigName),'offset')                            #
-        ikSplineLwrBndJnt = _makeNodeInstance.createGrp(self.charName,'{}_spline_crv_lwr_bnd_jnt'.format(self.rigName),'offset')                            #
-        ikSplineUprBndJnt = _makeNodeInstance.createGrp(self.charName,'{}_spline_crv_upr_bnd_jnt'.format(self.rigName),'offset')                            #
-        doNotTouchGrp = _makeNodeInstance.createGrp(self.charName,'{}_spine_do_not_touch'.format(self.rigName),'grp')                                       #
-        fk01OffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_FK_ctrl_01'.format(self.rigName),'offset')                                            #
-        fk02OffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_FK_ctrl_02'.format(self.rigName),'offset')                                            #
-        fk03OffsetGrp = _makeNodeInstance.createGrp(self.charName,'{}_FK_ctrl_03'.format(self.rigName),'offset')                                            #
-        fk01CtrlGrp = _makeNodeInstance.createGrp(self.charName,'{}_fk_ctrl_01'.format(self.rigName),'ctrl_grp')                                            #
-        fk02CtrlGrp = _makeNodeInstance.createGrp(self.charName,'{}_fk_ctrl_02'.format(self.rigName),'ctrl_grp')                                            #
-        fk03CtrlGrp = _makeNodeInstance.createGrp(self.charName,'{}_fk_ctrl_03'.format(self.rigName),'ctrl_grp')                                            #
-        #---------------------------------------------------------------------------------------------------------------------------------------------------#
-        cmds.setAttr(doNotTouchGrp + '.inheritsTransform',0)  #turn off inherit transform attribute on the do not touch grp
-        #---------------- Set node color rotation order ----------------#
-        _editNodeInstance.setRotateOrder(hipCtrl,3,0)                   #
-        _editNodeInstance.setRotateOrder(chestCtrl,3,0)                 #
-        _editNodeInstance.setRotateOrder(chestCtrlGrp,3,0)              #
-        _editNodeInstance.setRotateOrder(fkCtrl01,3,0)                  #
-        _editNodeInstance.setRotateOrder(fkCtrl02,3,0)                  #
-        _editNodeInstance.setRotateOrder(fkCtrl03,3,0)                  #
-        _editNodeInstance.setRotateOrder(indHipCtrlTempgrp,3,0)         #
-        _editNodeInstance.setRotateOrder(fk01CtrlGrp,3,0)               #
-        _editNodeInstance.setRotateOrder(fk02CtrlGrp,3,0)               #
-        _editNodeInstance.setRotateOrder(fk03CtrlGrp,3,0)               #
-        #---------------------- create hierarchy -----------------------#
-        _editNodeInstance.parentNodes(hipCtrl,hipOffsetGrp)             #
-        _editNodeInstance.parentNodes(chestCtrlGrp,chestOffsetGrp)      #
-        _editNodeInstance.parentNodes(chestCtrl,chestCtrlGrp)           #
-        _editNodeInstance.parentNodes(fkCtrl01,fk01CtrlGrp)             #
-        _editNodeInstance.parentNodes(fkCtrl02,fk02CtrlGrp)             #
-        _editNodeInstance.parentNodes(fkCtrl03,fk03CtrlGrp)             #
-        _editNodeInstance.parentNodes(indHipCtrlTempgrp,cogGrp)         #
-        #------------------- find node positions -----------------------#
-        hipMatch = _editNodeInstance.matchNodes(self.data[5])           #
-        chestMatch = _editNodeInstance.matchNodes(self.data[6])         #
-        rootPivMatch = _editNodeInstance.matchNodes(self.data[0])       #
-        chestPivMatch = _editNodeInstance.matchNodes(self.data[1])      #
-        #------------------------------------------ move nodes using xform -----------------------------------------#
-        _editNodeInstance.xformNode(hipOffsetGrp,rootPivMatch[0],rootPivMatch[1],rootPivMatch[2],0,0)               #
-        _editNodeInstance.xformNode(chestOffsetGrp,chestPivMatch[0],chestPivMatch[1],chestPivMatch[2],0,0)          #
-        _editNodeInstance.xformNode(ikJntChainOffsetGrp,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)         #
-        _editNodeInstance.xformNode(fkJntChainOffsetGrp,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)         #
-        _editNodeInstance.xformNode(resultJntChainOffsetGrp,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)     #
-        _editNodeInstance.xformNode(ikSplineLwrBndJnt,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)           #
-        _editNodeInstance.xformNode(ikSplineUprBndJnt,chestMatch[0],chestMatch[1],['pass','pass','pass'],0,0)       #
-        _editNodeInstance.xformNode(cogGrp,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)                      #
-        #-----------------------------------------------------------------------------------------------------------#
-        ikJointChain = _makeNodeInstance.createChain(self.charName,'joint',hipMatch,chestMatch,self.jointAmount,.5,'spine','ik_jnt')  #create the ik chain
-        fkJointChain = _makeNodeInstance.createChain(self.charName,'joint',hipMatch,chestMatch,self.jointAmount,.1,'spine','fk_jnt')  #create the fk chain
-        resultJointChain = _makeNodeInstance.createChain(self.charName,'joint',hipMatch,chestMatch,self.jointAmount,.3,'spine','result_jnt')  #create the result bind chain
-        ikSplineBndJnts = _makeNodeInstance.createChain(self.charName,'joint',hipMatch,chestMatch,0,.2,'bind','ik_jnt')  #create a chain to extract skin weights from for fk control setup
-        #----------- convert rotation to orient ------------#
-        _editNodeInstance.rotToOrient(ikJointChain)         #
-        _editNodeInstance.rotToOrient(fkJointChain)         #
-        _editNodeInstance.rotToOrient(resultJointChain)     #
-        _editNodeInstance.rotToOrient(ikSplineBndJnts)      #
-        #--------- parent chain nodes into a chain ---------#
-        _editNodeInstance.parentChain(ikJointChain)         #
-        _editNodeInstance.parentChain(fkJointChain)         #
-        _editNodeInstance.parentChain(resultJointChain)     #
-        #---------------------------------------------------#
-        splineCrvGuide = _makeNodeInstance.createChain(self.charName,'loc',hipMatch,chestMatch,4,.1,'spline','guide_loc')  #create a chain of locs to guide the creation of the ik spline curve
-        ikSpline = _makeNodeInstance.createIkSpline(self.charName,ikJointChain,ikSplineBndJnts[0],ikSplineBndJnts[1],hipCtrl,chestCtrl,splineCrvGuide)  #create the ik spline
-        fkCtrlGuide = _makeNodeInstance.createChain(self.charName,'loc',hipMatch,chestMatch,3,.1,'FK_ctrl','guide_loc')  #create a chain of locs to guide the positioning of the fk controllers
-        fk01Match = _editNodeInstance.matchNodes(fkCtrlGuide[0])  #find the positions of the locs
-        fk02Match = _editNodeInstance.matchNodes(fkCtrlGuide[1])
-        fk03Match = _editNodeInstance.matchNodes(fkCtrlGuide[2])
-        cmds.setAttr(ikSpline[0] + '.inheritsTransform',0)  #turn off inherit transforms on the ik spline curve
-        #------------------------------------------ move nodes using xform ---------------------------------#
-        _editNodeInstance.xformNode(fk01OffsetGrp,fk01Match[0],fk01Match[1],['pass','pass','pass'],0,0)     #
-        _editNodeInstance.xformNode(fk02OffsetGrp,fk01Match[0],fk01Match[1],['pass','pass','pass'],0,0)     #
-        _editNodeInstance.xformNode(fk03OffsetGrp,fk02Match[0],fk02Match[1],['pass','pass','pass'],0,0)     #
-        _editNodeInstance.xformNode(fk01CtrlGrp,fk01Match[0],fk01Match[1],['pass','pass','pass'],0,0)       #
-        _editNodeInstance.xformNode(fk02CtrlGrp,fk02Match[0],fk02Match[1],['pass','pass','pass'],0,0)       #
-        _editNodeInstance.xformNode(fk03CtrlGrp,fk03Match[0],fk03Match[1],['pass','pass','pass'],0,0)       #
-        #---------------------------------------------------------------------------------------------------#
-        for i in fkCtrlGuide: #delete the nodes create to guide the creation of the fk controllers
-            cmds.delete(i)
-        _editNodeInstance.parentNodes(doNotTouchGrp,indHipCtrlTempgrp)  #parent do not touch group under the hip temp grp node
-        _editNodeInstance.xformNode(doNotTouchGrp,hipMatch[0],hipMatch[1],['pass','pass','pass'],0,0)  #move the do not touch group
-        #------------------------------ create hierarchy -------------------------------#
-        _editNodeInstance.parentNodes(ikJointChain[0],ikJntChainOffsetGrp)              #
-        _editNodeInstance.parentNodes(fkJointChain[0],fkJntChainOffsetGrp)              #
-        _editNodeInstance.parentNodes(resultJointChain[0],resultJntChainOffsetGrp)      #
-        _editNodeInstance.parentNodes(ikSplineBndJnts[0],ikSplineLwrBndJnt)             #
-        _editNodeInstance.parentNodes(ikSplineBndJnts[1],ikSplineUprBndJnt)             #
-        _editNodeInstance.parentNodes(ikSpline[0],doNotTouchGrp)                        #
-        _editNodeInstance.parentNodes(ikSpline[1],doNotTouchGrp)                        #
-        _editNodeInstance.parentNodes(fk01CtrlGrp,fk01OffsetGrp)                        #
-        _editNodeInstance.parentNodes(fk02CtrlGrp,fk02OffsetGrp)                        #
-        _editNodeInstance.parentNodes(fk03CtrlGrp,fk03OffsetGrp)                        #
-        #-------------------------------------------------------------------------------#
-        fkChainGuide = _makeNodeInstance.createChain(self.charName,'joint',hipMatch,chestMatch,3,.1,'fk_temp_bind','guide')  #temp fk join chain to help find the parent constraint values to use with the fk controllers
-        _editNodeInstance.parentFk(fkJointChain,[fkCtrl01,fkCtrl02,fkCtrl03],fkChainGuide,fk02CtrlGrp,fk03CtrlGrp)  #parent the fk controllers to fk joints
-        for i in fkChainGuide:  #delete the fk chain guide we just made
-            cmds.delete(i)
-        _editNodeInstance.ikfk_switch(ikJointChain,fkJointChain,resultJointChain,cogGrp,[fkCtrl01,fkCtrl02,fkCtrl03],[hipCtrl,chestCtrl])  #create the ik/fk switch
-        _editNodeInstance.parentNodes(ikSplineLwrBndJnt,doNotTouchGrp)  #parent the ik skin joints under the do not touch group
-        _editNodeInstance.parentNodes(ikSplineUprBndJnt,doNotTouchGrp)
-        #----------- set node visibility attributes ------------#
-        cmds.setAttr(doNotTouchGrp + '.visibility',1)           #
-        cmds.setAttr(ikSplineLwrBndJnt + '.visibility',1)       #
-        cmds.setAttr(ikSplineUprBndJnt + '.visibility',1)       #
-        cmds.setAttr(ikSplineBndJnts[0] + '.visibility',0)      #
-        cmds.setAttr(ikSplineBndJnts[1] + '.visibility',0)      #
-        cmds.setAttr(ikSpline[0] + '.visibility',0)             #
-        cmds.setAttr(ikSpline[1] + '.visibility',0)             #
-        for i in range(0, len(ikJointChain),1):                 #
-            cmds.setAttr(ikJointChain[i] + '.visibility',0)     #
-        for i in range(0, len(fkJointChain),1):                 #
-            cmds.setAttr(fkJointChain[i] + '.visibility',0)     #
-        #-------------------------- create hierarchy ---------------------------#
-        _editNodeInstance.parentNodes(ikJntChainOffsetGrp,indHipCtrlTempgrp)    #
-        _editNodeInstance.parentNodes(fkJntChainOffsetGrp,indHipCtrlTempgrp)    #
-        _editNodeInstance.parentNodes(fk01OffsetGrp,indHipCtrlTempgrp)          #
-        _editNodeInstance.parentNodes(fk02OffsetGrp,indHipCtrlTempgrp)          #
-        _editNodeInstance.parentNodes(fk03OffsetGrp,indHipCtrlTempgrp)          #
-        _editNodeInstance.parentNodes(hipOffsetGrp,indHipCtrlTempgrp)           #
-        _editNodeInstance.parentNodes(chestOffsetGrp,cogGrp)                    #
-        #------------------------- lock and hide nodes -------------------------#
-        _editNodeInstance.lockHideAll(ikSpline[0])                              #
-        _editNodeInstance.lockHideAll(doNotTouchGrp)                            #
-        _editNodeInstance.lockHideAll(ikSplineLwrBndJnt)                        #
-        _editNodeInstance.lockHideAll(ikSplineUprBndJnt)                        #
-        _editNodeInstance.lockHideAll(doNotTouchGrp)                            #
-        _editNodeInstance.lockHideAll(doNotTouchGrp)                            #
-        _editNodeInstance.lockHideAll(ikJntChainOffsetGrp)                      #
-        _editNodeInstance.lockHideAll(fkJntChainOffsetGrp)                      #
-        _editNodeInstance.lockHideAll(resultJntChainOffsetGrp)                  #
-        _editNodeInstance.lockHideAll(chestOffsetGrp)                           #
-        _editNodeInstance.lockHideAll(chestCtrlGrp)                             #
-        _editNodeInstance.lockHideAll(hipOffsetGrp)                             #
-        _editNodeInstance.lockHideAll(fk01OffsetGrp)                            #
-        _editNodeInstance.lockHideAll(fk01CtrlGrp)                              #
-        _editNodeInstance.lockHideAll(fk02OffsetGrp)                            #
-        _editNodeInstance.lockHideAll(fk02CtrlGrp)                              #
-        _editNodeInstance.lockHideAll(fk03OffsetGrp)                            #
-        _editNodeInstance.lockHideAll(fk03CtrlGrp)                              #
-        _editNodeInstance.lockHideSpecific(fkCtrl01,[1,1,1],[0,0,0],[1,1,1],1)  #
-        _editNodeInstance.lockHideSpecific(fkCtrl02,[1,1,1],[0,0,0],[1,1,1],1)  #
-        _editNodeInstance.lockHideSpecific(fkCtrl03,[1,1,1],[0,0,0],[1,1,1],1)  #
-        _editNodeInstance.lockHideSpecific(chestCtrl,[0,0,0],[0,0,0],[1,1,1],1) #
-        _editNodeInstance.lockHideSpecific(hipCtrl,[0,0,0],[0,0,0],[1,1,1],1)   #
-        #------------------------- set color overrides -------------------------#
-        _editNodeInstance.setCol(chestCtrl,'yellow')                            #
-        _editNodeInstance.setCol(hipCtrl,'yellow')                              #
-        _editNodeInstance.setCol(fkCtrl01,'rose')                               #
-        _editNodeInstance.setCol(fkCtrl02,'rose')                               #
-        _editNodeInstance.setCol(fkCtrl03,'rose')                               #
-        #-----------------------------------------------------------------------#
-        cmds.delete(data[8])  #delete the fit rig
-def maya_main_window():
-    """gets the main window in maya
-    
-    returns the main window for maya so we can parent our gui to it
-    
-    Returns:
-        class -- Maya main window
-    """
-    main_window_ptr=OpenMayaUI.MQtUtil.mainWindow()
-    return wrapInstance(long(main_window_ptr), QWidget)  #return mayas main window
-class Window(QDialog):
-    def __init__(self, parent=maya_main_window()):
-        """Build the GUI.
-        
-        A gui with a build fit button, amount of joints text field, and a build spine rig button.
-        """
-        super(Window, self).__init__(parent)  #parent the gui to mayas main window so it stays ontop
-        self.runName = 0
-        self.amount = 0
-        self.runFit = 0
-        res = QApplication.desktop().screenGeometry()  #get desktop size
-        screenWidth, screenHeight, windowWidth, windowHeight = res.width(), res.height(), 400, 100  #position in middle of screen with 400,100 res
-        self.setGeometry(screenWidth/2 - windowWidth, screenHeight/2 - windowHeight, windowWidth, windowHeight)
-        self.characterName = QLineEdit('Enter Characters Name')  #character name input field
-        self.fitRigBtn = QPushButton("Create Fit Rig")  #create fit rig button
-        self.amountInput = QLineEdit('Amount Of Joints')  #amount of joints input field
-        self.rigBtn = QPushButton("Create Rig")  #create rig button
-        layout = QVBoxLayout()  #layout
-        layout.addWidget(self.characterName)
-        layout.addWidget(self.fitRigBtn)
-        layout.addWidget(self.amountInput)
-        layout.addWidget(self.rigBtn)
-        self.setLayout(layout)
-        self.fitRigBtn.clicked.connect(self.fitRig)  #connect buttons to functions
-        self.rigBtn.clicked.connect(self.rig)
-        self.amountInput.textChanged.connect(self.jntAmount)
-        self.characterName.textChanged.connect(self.charName)
-    def charName(self):
-        """Character name input field.
-        
-        Get the characters name.
-        """
-        sender = self.sender()
-        self.characterName = sender.text()  #get the text entered into the field
-        try:
-            (int(self.characterName))  #see if we can convert the first character to int, we dont want this
-            self.runName = 0  #dont allow the fit rig to be built
-            #self.characterName.setStyleSheet("color: red;")  #change field color to red
-        except ValueError:
-            self.runName = 1  #allow the fit rig to be built
-    def jntAmount(self):
-        """Joint amount input field.
+        self.switchMode = switchMode
+        self.fkFalloff = fkFalloff
+        self.constraintMode = constraintMode
+        self.flatten = flatten
+        self.bindJointAmount = bindJointAmount
+        self.aimJoints = aimJoints
+        self.distribution = distribution
+        Ref = buildPlan.Ref
+        plan = buildPlan.BuildPlan('{}_{}'.format(self.charName,rigName))
+        hipMatch, chestMatch, rootPivMatch, chestPivMatch = fit.hipPivot, fit.chestPivot, fit.hip, fit.chest
+        fk01Match, fk02Match, fk03Match = geometry.chainPlacements(hipMatch,chestMatch,3)  #where the fk controllers go
+        if distribution != 'line':  #on the spine curve
+            for match, point in zip((fk01Match,fk02Match,fk03Match),self.chainPoints(hipMatch,chestMatch,3,distribution)):
+                match[0] = point
+        flatGroups = FLAT_GROUPS if flatten else ()
+        #-------------------------------------------------------- the controls and groups --------------------------------------------------------#
+        for key, part in (('hipCtrl','hip'),('chestCtrl','chest')):
+            plan.add('create',('createCurve',self.charName,'sh08','{}_{}'.format(rigName,part),'ctrl'),key,nodes={'transform':1,'nurbsCurve':1},calls=2)
+        for i in range(1,4):
+            plan.add('create',('circleCtrl',self.charName,'{}_spine'.format(rigName),'FK_ctrl_0{}'.format(i),2,.125,4,360),'fkCtrl0{}'.format(i),
+                     nodes={'transform':1,'nurbsCurve':2},calls=6)
+        for key, grpSuffix, nodeUse in (('indHip','ind_hip_temp_grp','replace_with_your_indipendent_hip_ctrl'),
+                                        ('cog','cog','replace_with_your_cog_ctrl'),
+                                        ('hipOffset','hip','offset'),
+                                        ('chestOffset','chest','offset'),
+                                        ('chestCtrlGrp','chest','ctrl_grp'),
+                                        ('ikChainGrp','IK_jnt_chain','offset'),
+                                        ('fkChainGrp','FK_jnt_chain','offset'),
+                                        ('resultChainGrp','result_jnt_chain','offset'),
+                                        ('lwrBndGrp','spline_crv_lwr_bnd_jnt','offset'),
+                                        ('uprBndGrp','spline_crv_upr_bnd_jnt','offset'),
+                                        ('doNotTouch','spine_do_not_touch','grp'),
+                                        ('fk01Offset','FK_ctrl_01','offset'),
+                                        ('fk02Offset','FK_ctrl_02','offset'),
+                                        ('fk03Offset','FK_ctrl_03','offset'),
+                                        ('fk01CtrlGrp','fk_ctrl_01','ctrl_grp'),
+                                        ('fk02CtrlGrp','fk_ctrl_02','ctrl_grp'),
+                                        ('fk03CtrlGrp','fk_ctrl_03','ctrl_grp')):
+            if key in flatGroups:
+                continue
+            plan.add('create',('createGrp',self.charName,'{}_{}'.format(rigName,grpSuffix),nodeUse),key,nodes={'transform':1},calls=2)
+        plan.add('create',('createChain',self.charName,'joint',hipMatch,chestMatch,0,.2,'bind','ik_jnt'),'bindJnts',nodes={'joint':2},calls=6)  #a chain to extract skin weights from for fk control setup
+        noInherit = plan.add('setAttr',(Ref('doNotTouch'),'inheritsTransform',0))  #turn off inherit transform attribute on the do not touch grp
+        #------------------------------------------- rotation orders, set before anything is moved -------------------------------------------#
+        orders = AttrStates()
+        for key in ('hipCtrl','chestCtrl','chestCtrlGrp','fkCtrl01','fkCtrl02','fkCtrl03','indHip','fk01CtrlGrp','fk02CtrlGrp','fk03CtrlGrp'):
+            if key not in flatGroups:
+                EditNodes(orders).setRotateOrder(Ref(key),3,0)
+        rotateOrders = plan.add('states',(orders,),calls=orders.calls(),label='rotate orders')
+        #------------------------------------------------------------ hierarchy ------------------------------------------------------------#
+        ctrlParents = (('hipCtrl','indHip'),('chestCtrl','cog')) if flatten else (('hipCtrl','hipOffset'),('chestCtrlGrp','chestOffset'),('chestCtrl','chestCtrlGrp'))
+        hierarchy = [plan.add('parent',(Ref(child),Ref(parent))) for child, parent in ctrlParents + (('fkCtrl01','fk01CtrlGrp'),('fkCtrl02','fk02CtrlGrp'),('fkCtrl03','fk03CtrlGrp'),
+                                                                                                    ('indHip','cog'))]
+        hierarchy.append(plan.add('parent',(Ref('doNotTouch'),Ref('indHip')),deps=[noInherit]))
+        #-------------------------- place nodes, one matrix each, the fk ctrl grps are built with the yxz rotation order --------------------------#
+        hip, chest, hipRest, chestRest, fk01, fk02 = frames.placementMatrices([hipMatch[:2],chestMatch[:2],rootPivMatch,chestPivMatch,fk01Match,fk02Match])
+        fkGrps = frames.placementMatrices([fk01Match,fk02Match,fk03Match],3)
+        placed = [plan.add('place',(Ref(key),matrix),deps=hierarchy + [rotateOrders],calls=2) for key, matrix in (
+                  ('hipOffset',hipRest),
+                  ('chestOffset',chestRest),
+                  ('ikChainGrp',hip),
+                  ('fkChainGrp',hip),
+                  ('resultChainGrp',hip),
+                  ('lwrBndGrp',hip),
+                  ('uprBndGrp',chest),
+                  ('cog',hip),
+                  ('fk01Offset',fk01),
+                  ('fk02Offset',fk01),
+                  ('fk03Offset',fk02),
+                  ('fk01CtrlGrp',fkGrps[0]),
+                  ('fk02CtrlGrp',fkGrps[1]),
+                  ('fk03CtrlGrp',fkGrps[2]),
+                  ('doNotTouch',hip)) if key not in flatGroups]
+        if flatten:  #the hip and chest controls rest in their offsetParentMatrix, relative to the ind hip group and cog, which sit at the hip
+            for key, rest in (('hipCtrl',hipRest),('chestCtrl',chestRest)):
+                placed.append(plan.add('setAttr',(Ref(key),'offsetParentMatrix',geometry.multMatrix(rest,geometry.inverseMatrix(hip))),deps=hierarchy))
+            parents = (('bindJnts',0,'doNotTouch'),('bindJnts',1,'doNotTouch'),('fk01CtrlGrp',None,'indHip'),('fk02CtrlGrp',None,'indHip'),('fk03CtrlGrp',None,'indHip'))
+        else:
+            parents = (('bindJnts',0,'lwrBndGrp'),('bindJnts',1,'uprBndGrp'),('fk01CtrlGrp',None,'fk01Offset'),('fk02CtrlGrp',None,'fk02Offset'),('fk03CtrlGrp',None,'fk03Offset'))
+        hierarchy = [plan.add('parent',(Ref(child,index),Ref(parent)),deps=placed) for child, index, parent in parents]
+        #-------------------------------------------- everything that depends on the joint amount --------------------------------------------#
+        spineNodes = OrderedDict([('cog',Ref('cog')),('hipCtrl',Ref('hipCtrl')),('chestCtrl',Ref('chestCtrl')),('fkCtrls',[Ref('fkCtrl01'),Ref('fkCtrl02'),Ref('fkCtrl03')]),
+                                  ('fkCtrlGrps',[Ref('fk02CtrlGrp'),Ref('fk03CtrlGrp')]),('bindJnts',[Ref('bindJnts',0),Ref('bindJnts',1)]),
+                                  ('chainGrps',[Ref('indHip'),Ref('indHip')] if flatten else [Ref('ikChainGrp'),Ref('fkChainGrp'),Ref('resultChainGrp')]),
+                                  ('doNotTouch',Ref('doNotTouch'))])
+        upVectors = frames.matrixAxes([hipRest,chestRest],'z')  #the hip and chest controls z axis at rest, for the ik splines advanced twist
+        first = len(plan.steps)
+        chains = self.planSpineChains(plan,spineNodes,hipMatch,chestMatch,distribution,hierarchy,upVectors=upVectors)
+        chainSteps = plan.steps[first:]
+        #-------------------------------------------------------- finish the hierarchy --------------------------------------------------------#
+        for node, value in (('doNotTouch',1),('lwrBndGrp',1),('uprBndGrp',1),(Ref('bindJnts',0),0),(Ref('bindJnts',1),0)):
+            if node in flatGroups:
+                continue
+            plan.add('setAttr',(node if isinstance(node,buildPlan.Ref) else Ref(node),'visibility',value),deps=chainSteps)
+        for child, parent in (('lwrBndGrp','doNotTouch'),('uprBndGrp','doNotTouch'),('ikChainGrp','indHip'),('fkChainGrp','indHip'),('fk01Offset','indHip'),
+                              ('fk02Offset','indHip'),('fk03Offset','indHip'),('hipOffset','indHip'),('chestOffset','cog')):
+            if child in flatGroups:  #flattened controls and chains were parented to these already
+                continue
+            plan.add('parent',(Ref(child),Ref(parent)),deps=chainSteps)
+        #-------------------------------------------------------- lock, hide and color --------------------------------------------------------#
+        locks = AttrStates()
+        editLocks = EditNodes(locks)
+        for key in ('doNotTouch','lwrBndGrp','uprBndGrp','ikChainGrp','fkChainGrp','resultChainGrp','chestOffset','chestCtrlGrp','hipOffset',
+                    'fk01Offset','fk01CtrlGrp','fk02Offset','fk02CtrlGrp','fk03Offset','fk03CtrlGrp'):
+            if key not in flatGroups:
+                editLocks.lockHideAll(Ref(key))
+        self.lockSpineCtrls(editLocks,spineNodes)
+        for key, col in (('chestCtrl','yellow'),('hipCtrl','yellow'),('fkCtrl01','rose'),('fkCtrl02','rose'),('fkCtrl03','rose')):
+            editLocks.setCol(Ref(key),col)
+        lockStep = plan.add('states',(locks,),deps=list(plan.steps),calls=locks.calls(),label='lock/hide')
+        plan.add('call',(lambda run, nodes, chains: self.recordSpineRig(nodes,chains,fit),spineNodes,chains),'record',deps=[lockStep],calls=4,label='recordSpineRig')  #lets a later build with update=True find this rig, the uuids of the nodes made are looked up in one query
+        if fitRig is not None:
+            plan.add('call',(lambda run, node: cmds.delete(str(node)),fitRig),deps=['record'],label='delete fit rig')
+        return plan
+    def buildSpineChains(self,nodes,hipMatch,chestMatch,distribution,makeNodes=None,editNodes=None,constrainBindJnts=True,upVectors=None):
+        """Build the parts of the spine rig that depend on the joint amount.
+        
+        Plans them with planSpineChains and runs the plan straight away, how an update builds them again.
+        
+        Arguments:
+            nodes {dict} -- The spine rig nodes they hook up to, see recordSpineRig.
+            hipMatch {list} -- Where the chains start, translation/rotation/scale values from matchNodes.
+            chestMatch {list} -- Where the chains end, translation/rotation/scale values from matchNodes.
+            distribution {string} -- How the joints are spread from hip to chest, see buildSpineRig.
+        
+        Keyword Arguments:
+            makeNodes {MakeNodes} -- The builds MakeNodes, a new one if not given. (default: {None})
+            editNodes {EditNodes} -- The builds EditNodes, a new one if not given. (default: {None})
+            constrainBindJnts {bool} -- Constrain the ik spline bind joints to the hip and chest controls, off when they already are. (default: {True})
+            upVectors {list} -- The hip and chest controls z axis at rest, for the ik splines advanced twist, None queries the controls. (default: {None})
         
-        Get the amount text field.
+        Returns:
+            OrderedDict -- 'ikChain', 'fkChain', 'resultChain', 'spline' (curve and handle) and 'bindChain' (empty without bindJointAmount).
         """
-        sender = self.sender()
-        self.amount = int(sender.text())  #get the text entered into the field and try to convert to int, otherwise just use 0 as defaulted above
-    def fitRig(self):
-        """Build Fit Rig.
-
-        Command ran to build fit rig and send data to spine rig function.
-
+        plan = buildPlan.BuildPlan('{}_{}_chains'.format(self.charName,self.rigName))
+        chains = self.planSpineChains(plan,nodes,hipMatch,chestMatch,distribution,constrainBindJnts=constrainBindJnts,upVectors=upVectors)
+        executor = PlanExecutor(makeNodes,editNodes)
+        executor.run(plan)
+        return executor.resolve(chains)
+    def planSpineChains(self,plan,nodes,hipMatch,chestMatch,distribution,deps=(),constrainBindJnts=True,upVectors=None):
+        """Plan the parts of the spine rig that depend on the joint amount.
+        
+        The ik, fk and result chains, the ik spline, the fk constraints, the ik/fk switch and the bind chain.
+        Every chain, parent, constraint, connection and key is a step of its own, so the executor batches them and dry runs count them.
+        Constraints wait for the chains to be parented, every step waits for deps so a build and an update take them in the same order.
+        
+        Arguments:
+            plan {BuildPlan} -- The plan the steps are added to.
+            nodes {dict} -- The spine rig nodes they hook up to (see recordSpineRig), as Refs when they are made by the same plan.
+            hipMatch {list} -- Where the chains start, translation/rotation/scale values from matchNodes.
+            chestMatch {list} -- Where the chains end, translation/rotation/scale values from matchNodes.
+            distribution {string} -- How the joints are spread from hip to chest, see buildSpineRig.
+        
+        Keyword Arguments:
+            deps {list} -- Steps every step waits for, the controls and groups being placed. (default: {()})
+            constrainBindJnts {bool} -- Constrain the ik spline bind joints to the hip and chest controls, off when they already are. (default: {True})
+            upVectors {list} -- The hip and chest controls z axis at rest, for the ik splines advanced twist, None queries the controls. (default: {None})
+        
+        Returns:
+            OrderedDict -- What buildSpineChains returns, as Refs.
         """
-        if self.runName == 1:  #if a character name is added
-            self._rig = BuildRigs(self.characterName)  #build the fit rig using that name
-            self.fitRigBuild = self._rig.buildFitRig('fitRig')
-            self.runFit = 1  #allow the spine rig to be built
-        else:
-            self.runFit = 0  #dont allow the spine rig to be built
-    def rig(self):
-        """Build spine rig.
+        Ref = buildPlan.Ref
+        deps = list(deps)
+        costs = EditNodes()  #what each constraint makes, nothing is made with it
+        hipCtrl, chestCtrl, fkCtrls, cog = nodes['hipCtrl'], nodes['chestCtrl'], nodes['fkCtrls'], nodes['cog']
+        aim = 'y' if self.aimJoints or distribution != 'line' else None  #the ik splines forward axis, joints on a curve point along it
+        table = None if distribution == 'line' else geometry.curveTable(geometry.spineCurve(hipMatch,chestMatch))  #sampled once for every chain
+        positions = self.chainPoints(hipMatch,chestMatch,self.jointAmount,distribution,table)
+        amount = len(positions)
+        #------------------------------------------------------------ the chains ------------------------------------------------------------#
+        for key, scale, nodeUse in (('ikChain',.5,'ik_jnt'),('fkChain',.1,'fk_jnt'),('resultChain',.3,'result_jnt')):
+            plan.add('create',('createChain',self.charName,'joint',hipMatch,chestMatch,amount,scale,'spine',nodeUse,True,aim,positions),key,deps,
+                     nodes={'joint':amount},calls=amount + 2)  #a name query, clearing the selection and a joint command each
+        ikChain, fkChain, resultChain = [[Ref(key,i) for i in range(amount)] for key in ('ikChain','fkChain','resultChain')]
+        #------------------------------------------------------------ ik spline ------------------------------------------------------------#
+        splinePoints = geometry.chainPositions(hipMatch[0],chestMatch[0],4) if table is None else table.cvs  #the ik spline curve cvs, evenly spaced from hip to chest or the spine curve
+        spline = plan.add('create',('createIkSpline',self.charName,Ref('ikChain'),nodes['bindJnts'][0],nodes['bindJnts'][1],hipCtrl,chestCtrl,splinePoints,False,upVectors),'spline',deps,
+                          nodes={'transform':1,'nurbsCurve':1,'ikHandle':1,'ikEffector':1,'skinCluster':1},
+                          calls=17 if upVectors is not None else 19)  #two name queries, the curve, handle and skinCluster, 10 twist settings and 2 connections, the controls queried for their up vectors
+        if constrainBindJnts:
+            bindMode = self.bindConstraintMode()  #a flattened rigs bind joints follow the controls through their offsetParentMatrix
+            for ctrl, joint in ((hipCtrl,nodes['bindJnts'][0]),(chestCtrl,nodes['bindJnts'][1])):
+                made, calls = costs.constraintCost('parent',[ctrl],bindMode,joint=True)
+                plan.add('constraint',('parent',[ctrl],joint,[1],bindMode),deps=deps + [spline],nodes=made,calls=calls)
+        noInherit = plan.add('setAttr',(Ref('spline',0),'inheritsTransform',0),deps=deps)  #turn off inherit transforms on the ik spline curve
+        #------------------------------------------------------------ hierarchy ------------------------------------------------------------#
+        hierarchy = [plan.add('parent',(chain[0],grp),deps=deps + [spline]) for chain, grp in zip((ikChain,fkChain,resultChain),nodes['chainGrps'])]  #a flattened rig leaves the result chain in the world
+        hierarchy += [plan.add('parent',(Ref('spline',i),nodes['doNotTouch']),deps=deps + [noInherit]) for i in (0,1)]
+        #------------------------------------------------------------ fk parenting ------------------------------------------------------------#
+        fkWeights = geometry.fkWeights(geometry.chainParameters(positions),self.fkFalloff)  #first, middle and last controller weight for every joint
+        composed = set()  #fk controls that have their composeMatrix, see EditNodes.matrixConstraint
+        for channels, drivers, driven, weights in costs.fkConstraints(fkChain,fkCtrls,nodes['fkCtrlGrps'][0],nodes['fkCtrlGrps'][1],fkWeights):
+            new = [driver for driver in drivers if driver not in composed] if channels == 'orient' else []
+            composed.update(new)
+            made, calls = costs.constraintCost(channels,drivers,self.constraintMode,weights,channels == 'orient',len(new))
+            plan.add('constraint',(channels,drivers,driven,weights,self.constraintMode),deps=deps + hierarchy,nodes=made,calls=calls)
+        #------------------------------------------------------------ ik/fk switch ------------------------------------------------------------#
+        switch = plan.add('call',(lambda run, node: run.editNodes.addSwitch(node,'ik_fk_switch','IK/FK Switch',at='double',min=0,max=1,dv=0),cog),deps=deps,
+                          calls=2,label='ik/fk switch')  #kept when the rig is updated
+        switchPlug = (cog,'ik_fk_switch')
+        weightPlugs = []  #the (ik, fk) weight plugs of each result joint, there is no ik weight on a blendMatrix
+        for i in range(amount):
+            key = 'resultDriver{}'.format(i)
+            made, calls = costs.constraintCost('parent',[ikChain[i],fkChain[i]],self.constraintMode,[.5,.5],True)
+            plan.add('constraint',('parent',[ikChain[i],fkChain[i]],resultChain[i],[.5,.5],self.constraintMode),key,deps + hierarchy,nodes=made,calls=calls)
+            if self.constraintMode == 'matrix':
+                weightPlugs.append((None,(Ref(key),'target[0].weight')))
+            else:
+                weightPlugs.append(((Ref(key),'w0'),(Ref(key),'w1')))  #the weights by index so they don't depend on the joints names
+        if self.switchMode == 'network':  #the switch and one reverse node drive every weight and the controls visibility
+            plan.add('call',(lambda run, node: cmds.createNode('reverse',n='{}_ik_fk_switch_rev'.format(shortName(node)),ss=1),cog),'switchReverse',deps,
+                     nodes={'reverse':1},label='ik/fk reverse')  #1 - switch, the weight for everything ik
+            reverse = (Ref('switchReverse'),'outputX')
+            connections = [(switchPlug,(Ref('switchReverse'),'inputX'))]
+            for ikWeight, fkWeight in weightPlugs:
+                if ikWeight is not None:
+                    connections.append((reverse,ikWeight))
+                connections.append((switchPlug,fkWeight))
+            connections += [(reverse,(ctrl,'visibility')) for ctrl in (hipCtrl,chestCtrl)] + [(switchPlug,(ctrl,'visibility')) for ctrl in fkCtrls]
+            for source, destination in connections:
+                plan.add('connect',source + destination,deps=deps + [switch])
+        else:  #a driven key for every weight and the controls visibility, at switch 0 and 1
+            ikKeys, fkKeys = ((0,1),(1,0)), ((0,0),(1,1))
+            keys = []
+            for ikWeight, fkWeight in weightPlugs:
+                if ikWeight is not None:
+                    keys.append((ikWeight,ikKeys))
+                keys.append((fkWeight,fkKeys))
+            keys += [((ctrl,'visibility'),fkKeys) for ctrl in fkCtrls] + [((ctrl,'visibility'),ikKeys) for ctrl in (hipCtrl,chestCtrl)]
+            for plug, values in keys:
+                plan.add('key',plug + switchPlug + (values,),deps=deps + [switch],nodes={'animCurveUU':1})  #a curve per driven attribute
+        #------------------------------------------------------------ bind chain ------------------------------------------------------------#
+        bindChain = []
+        if self.bindJointAmount:
+            bindPositions = self.chainPoints(hipMatch,chestMatch,self.bindJointAmount,distribution,table)
+            plan.add('create',('createChain',self.charName,'joint',hipMatch,chestMatch,len(bindPositions),.4,'spine','bind_jnt',True,aim,bindPositions),'bindChain',deps,
+                     nodes={'joint':len(bindPositions)},calls=len(bindPositions) + 2)  #the dense chain to skin to
+            bindChain = Ref('bindChain')
+            bindHierarchy = list(hierarchy)
+            if len(nodes['chainGrps']) > 2:  #with the result chain
+                bindHierarchy.append(plan.add('parent',(Ref('bindChain',0),nodes['chainGrps'][2]),deps=deps))
+            bindSwitch = plan.add('call',(lambda run, node: run.editNodes.addSwitch(node,'bind_chain','Bind Chain',at='enum',en='on=0:off=2'),cog),deps=deps,
+                                  calls=2,label='bind chain switch')  #the values are the nodeState each option sets, 2 is blocking
+            interpolation = geometry.chainInterpolation(geometry.chainParameters(bindPositions),geometry.chainParameters(positions))
+            for i, (index, weight) in enumerate(interpolation):
+                key = 'bindDriver{}'.format(i)
+                targets = costs.interpolationTargets(resultChain,index,weight)
+                drivers, weights = [t[0] for t in targets], [t[1] for t in targets]
+                made, calls = costs.constraintCost('parent',drivers,self.constraintMode,weights,True)
+                plan.add('constraint',('parent',drivers,Ref('bindChain',i),weights,self.constraintMode),key,deps + bindHierarchy,nodes=made,calls=calls)
+                plan.add('connect',(cog,'bind_chain',Ref(key),'nodeState'),deps=deps + [bindSwitch])  #the switch blocks what drives the chain
+        #------------------------------------------------------------ visibility ------------------------------------------------------------#
+        for node in [Ref('spline',0),Ref('spline',1)] + ikChain + fkChain:
+            plan.add('setAttr',(node,'visibility',0),deps=deps)
+        locks = AttrStates()
+        EditNodes(locks).lockHideAll(Ref('spline',0))
+        plan.add('states',(locks,),deps=deps + hierarchy,calls=locks.calls(),label='lock spline')
+        return OrderedDict([('ikChain',Ref('ikChain')),('fkChain',Ref('fkChain')),('resultChain',Ref('resultChain')),('spline',[Ref('spline',0),Ref('spline',1)]),('bindChain',bindChain)])
+    def chainPoints(self,hipMatch,chestMatch,amount,distribution,table=None):
+        """Where each joint of a chain goes for a distribution.
         
-        Command ran to build spine rig.
+        Arguments:
+            hipMatch {list} -- Translation and rotation values of the hip pivot.
+            chestMatch {list} -- Translation and rotation values of the chest pivot.
+            amount {int} -- The amount of joints.
+            distribution {string} -- How the joints are spread from hip to chest, see buildSpineRig.
+        
+        Keyword Arguments:
+            table {CurveTable} -- The spine curve already sampled, None samples it when the distribution needs it (see geometry.curveTable). (default: {None})
+        
+        Returns:
+            list -- The world position (x,y,z) of each joint.
         """
-        if self.runFit == 1:  #if the fit rig was built
-            try:
-                self._rig.buildSpineRig('mainRig',self.fitRigBuild,self.amount)  #build the spine rig
-                self.runFit = 0  #since fit rig is deleted we disable the ability to build more spine rigs until its created again
-            except TypeError:
-                pass
+        if distribution == 'line':
+            return geometry.chainPositions(hipMatch[0],chestMatch[0],amount)
+        if table is None:
+            table = geometry.curveTable(geometry.spineCurve(hipMatch,chestMatch))
+        return geometry.curvePositions(table,amount,distribution)
+    def chainDeviation(self,data,jointAmount,distribution='curvature'):
+        """How far a chain would stray from the spine curve, without building anything.
+        
+        Arguments:
+            data {list} -- The fit rig nodes or its captured placements, see buildSpineRig.
+            jointAmount {int} -- The amount of joints in the chain.
+        
+        Keyword Arguments:
+            distribution {string} -- How the joints are spread from hip to chest, one of geometry.DISTRIBUTIONS. (default: {'curvature'})
+        
+        Returns:
+            float -- The largest distance from the spine curve to the chain, see geometry.curveDeviation.
+        """
+        if distribution not in geometry.DISTRIBUTIONS:
+            raise ValueError('unknown distribution {!r}, use one of {}'.format(distribution,', '.join(geometry.DISTRIBUTIONS)))
+        fit = self.fitPlacements(data)
+        table = geometry.curveTable(geometry.spineCurve(fit.hipPivot,fit.chestPivot))
+        if distribution == 'line':
+            points = geometry.chainPositions(fit.hipPivot[0],fit.chestPivot[0],jointAmount)
         else:
-            pass
+            points = geometry.curvePositions(table,jointAmount,distribution)
+        return geometry.curveDeviation(table,points)
+    def bindConstraintMode(self,constraintMode=None,flatten=None):
+        """How the ik spline bind joints follow the hip and chest controls.
+        
+        A flattened controls rest placement is in its offsetParentMatrix, which only its world matrix includes, so they always use matrix nodes.
+        
+        Keyword Arguments:
+            constraintMode {string} -- The rigs constraint mode, the current build's if None. (default: {None})
+            flatten {bool} -- Whether the rig is flattened, the current build's if None. (default: {None})
+        
+        Returns:
+            string -- 'constraints' or 'matrix'.
+        """
+        constraintMode = self.constraintMode if constraintMode is None else constraintMode
+        flatten = self.flatten if flatten is None else flatten
+        return 'matrix' if flatten else constraintMode
+    def matrixDrivers(self,nodes):
+        """Find the matrix nodes a matrix mode rig drives nodes with.
+        
+        Follows each nodes offsetParentMatrix back through every multMatrix, blendMatrix and composeMatrix, see EditNodes.matrixConstraint.
+        
+        Arguments:
+            nodes {list} -- The driven nodes.
+        
+        Returns:
+            list -- The matrix nodes, each once.
+        """
+        found = []
+        queue = []
+        for node in nodes:
+            queue.extend(cmds.listConnections(str(node) + '.offsetParentMatrix',s=1,d=0) or [])
+        while queue:
+            node = queue.pop()
+            if node in found or cmds.nodeType(node) not in ('multMatrix','blendMatrix','composeMatrix'):
+                continue
+            found.append(node)
+            queue.extend(cmds.listConnections(node,s=1,d=0) or [])
+        return found
+    def lockSpineCtrls(self,editNodes,nodes):
+        """Lock and hide the channels the spine controls don't use.
+        
+        Arguments:
+            editNodes {EditNodes} -- The builds EditNodes.
+            nodes {dict} -- The spine rig nodes, see recordSpineRig.
+        """
+        for ctrl in nodes['fkCtrls']:
+            editNodes.lockHideSpecific(ctrl,[1,1,1],[0,0,0],[1,1,1],1)
+        editNodes.lockHideSpecific(nodes['chestCtrl'],[0,0,0],[0,0,0],[1,1,1],1)
+        editNodes.lockHideSpecific(nodes['hipCtrl'],[0,0,0],[0,0,0],[1,1,1],1)
+    def recordSpineRig(self,nodes,chains,fit):
+        """Store what a spine rig was built from on its cog group.
+        
+        Nodes are stored by uuid so the rig is still found after they have been renamed or moved.
+        
+        Arguments:
+            nodes {dict} -- 'cog', 'hipCtrl', 'chestCtrl', 'fkCtrls', 'fkCtrlGrps', 'bindJnts', 'chainGrps' (ik, fk, result, a flattened rig has the ind hip group for ik and fk) and 'doNotTouch'.
+            chains {dict} -- What buildSpineChains made.
+            fit {FitPlacements} -- The placements the rig was built from.
+        
+        Returns:
+            OrderedDict -- The record, with the nodes as NodeHandles.
+        """
+        record = OrderedDict([('version',2),('rigName',self.rigName),('jointAmount',self.jointAmount),('switchMode',self.switchMode),('fkFalloff',self.fkFalloff),
+                              ('constraintMode',self.constraintMode),('flatten',self.flatten),('bindJointAmount',self.bindJointAmount),('aimJoints',self.aimJoints),('distribution',self.distribution),
+                              ('placements',fit.toDict()),('nodes',nodes),('chains',chains)])
+        stored = OrderedDict(record)
+        stored['nodes'], stored['chains'] = self.recordNodes(nodes,'uuid'), self.recordNodes(chains,'uuid')
+        cog = str(nodes['cog'])
+        if not cmds.attributeQuery(SPINE_RECORD,node=cog,exists=1):
+            cmds.addAttr(cog,ln=SPINE_RECORD,dt='string')
+        cmds.setAttr('{}.{}'.format(cog,SPINE_RECORD),json.dumps(stored,separators=(',',':')),type='string')
+        return record
+    def recordNodes(self,value,to):
+        """Swap the nodes in a records 'nodes' or 'chains' between NodeHandles and what is stored.
+        
+        Arguments:
+            value {object} -- A node, or a list or dict of them.
+            to {string} -- 'uuid' to store handles, 'handle' for stored uuids and 'name' for the names version 1 records stored.
+        
+        Returns:
+            object -- A copy with the nodes swapped.
+        """
+        if isinstance(value,dict):
+            return OrderedDict((k,self.recordNodes(v,to)) for k, v in value.items())
+        if isinstance(value,(list,tuple)):
+            return [self.recordNodes(i,to) for i in value]
+        if to == 'uuid':
+            return value.uuid if isinstance(value,NodeHandle) else NodeHandle.fromName(value).uuid
+        if to == 'name':
+            return NodeHandle.fromName(value)
+        return NodeHandle(uuid=value)
+    def spineRigResult(self,record):
+        """Get the SpineRig for a record.
+        
+        Arguments:
+            record {dict} -- From recordSpineRig.
+        
+        Returns:
+            SpineRig -- The rigs nodes.
+        """
+        return SpineRig(**dict([('bindChain',[])] + list(record['nodes'].items()) + list(record['chains'].items())))  #older records have no bind chain
+    def findSpineRig(self,rigName):
+        """Find a spine rig already built for this character.
+        
+        Arguments:
+            rigName {string} -- The rig name it was built with.
+        
+        Returns:
+            dict -- What recordSpineRig stored with the nodes as NodeHandles, None if there isn't a rig.
+        """
+        for node in cmds.ls('{}_{}_cog_replace_with_your_cog_ctrl_*'.format(self.charName,rigName)) or []:
+            if cmds.attributeQuery(SPINE_RECORD,node=node,exists=1):
+                record = json.loads(cmds.getAttr('{}.{}'.format(node,SPINE_RECORD)),object_pairs_hook=OrderedDict)
+                to = 'name' if record.get('version',1) < 2 else 'handle'  #version 1 stored names
+                record['nodes'], record['chains'] = self.recordNodes(record['nodes'],to), self.recordNodes(record['chains'],to)
+                return record
+        return None
+    def updateSpineRig(self,rigName,jointAmount,switchMode=RECORDED,fkFalloff=RECORDED,constraintMode=RECORDED,bindJointAmount=RECORDED,aimJoints=RECORDED):
+        """Change the joint amount of an existing spine rig.
+        
+        Only the parts that depend on the joint amount are deleted and built again (see buildSpineChains).
+        The controls, groups, control shapes, colors and locks are left as they are.
+        The chains are built from the placements the rig was first built with, following the rig if it has been moved since.
+        Settings left as RECORDED keep what the rig was built with.
+        
+        Arguments:
+            rigName {string} -- The rig name it was built with.
+            jointAmount {int} -- The new amount of joints.
+        
+        Keyword Arguments:
+            switchMode {string} -- How the ik/fk switch is wired, 'network' or 'keys'. (default: {RECORDED})
+            fkFalloff {string} -- How the fk controllers weights fall off along the chain. (default: {RECORDED})
+            constraintMode {string} -- 'constraints' or 'matrix', the rig can be switched from one to the other. (default: {RECORDED})
+            bindJointAmount {int} -- Joints in the interpolated bind chain, None removes it. (default: {RECORDED})
+            aimJoints {bool} -- Aim the chain joints down the chain, see buildSpineRig. (default: {RECORDED})
+        
+        Returns:
+            dict -- The updated record, None if no rig was found.
+        """
+        record = self.findSpineRig(rigName)
+        if record is None:
+            return None
+        nodes, chains = record['nodes'], record['chains']
+        settings = self.spineSettings(record,switchMode=switchMode,fkFalloff=fkFalloff,constraintMode=constraintMode,bindJointAmount=bindJointAmount,aimJoints=aimJoints)
+        switchMode, fkFalloff, constraintMode, bindJointAmount, aimJoints = settings.values()
+        with profileStage('updateSpineRig'), BuildSession('{}_{}'.format(self.charName,rigName)):  #one undo step, rolled back if anything fails
+            self.rigName = rigName
+            self.jointAmount = jointAmount
+            self.switchMode = switchMode
+            self.fkFalloff = fkFalloff
+            self.constraintMode = constraintMode
+            self.flatten = record.get('flatten',False)  #the groups are there or they aren't
+            self.bindJointAmount = bindJointAmount
+            self.aimJoints = aimJoints
+            distribution = self.distribution = record.get('distribution','line')  #the fk controls were placed on it
+            _makeNodeInstance = MakeNodes()
+            states = AttrStates()
+            _editNodeInstance = EditNodes(states)
+            profileMark('cleanup')
+            ctrls = nodes['fkCtrls'] + [nodes['hipCtrl'],nodes['chestCtrl']]
+            bindChain = chains.get('bindChain') or []
+            doomed = [str(i) for i in [chains['ikChain'][0],chains['fkChain'][0],chains['resultChain'][0]] + chains['spline'] + bindChain[:1]]  #constraints, the effector and skinCluster go with them
+            for node in cmds.listConnections('{}.ik_fk_switch'.format(nodes['cog']),s=0,d=1) or []:  #the reverse node or driven keys of the switch
+                if cmds.nodeType(node) == 'reverse' or cmds.nodeType(node).startswith('animCurve'):
+                    doomed.append(node)
+            for node in nodes['fkCtrls']:
+                doomed.extend(cmds.listRelatives(str(node),type='pointConstraint',f=1) or [])
+            for node in nodes['fkCtrlGrps']:
+                doomed.extend(cmds.listRelatives(str(node),type='parentConstraint',f=1) or [])
+            builtMode = record.get('constraintMode','constraints')
+            builtBindMode = self.bindConstraintMode(builtMode)
+            bindJnts = [str(i) for i in nodes['bindJnts']] if builtBindMode != self.bindConstraintMode() else []  #only rebuilt when the mode changes
+            if builtMode == 'matrix':  #matrix nodes aren't deleted with the nodes they drive
+                doomed.extend(self.matrixDrivers(chains['fkChain'] + chains['resultChain'] + bindChain + nodes['fkCtrls'] + nodes['fkCtrlGrps']))
+            if builtBindMode == 'matrix':
+                doomed.extend(self.matrixDrivers(bindJnts))
+            else:
+                for node in bindJnts:
+                    doomed.extend(cmds.listRelatives(node,type='parentConstraint',f=1) or [])
+            cmds.delete(doomed)
+            unlock = EditNodes()  #the controls channels are unlocked straight away so they can be constrained and connected again
+            for ctrl in ctrls:
+                for plug in cmds.listConnections(ctrl + '.visibility',s=1,d=0,p=1) or []:
+                    cmds.disconnectAttr(plug,ctrl + '.visibility')
+                unlock.unlockUnHideSpecific(ctrl,[1,1,1] if ctrl in nodes['fkCtrls'] else [0,0,0],[0,0,0],[0,0,0],1)
+            for grp in nodes['fkCtrlGrps']:
+                unlock.unlockUnHideAll(grp)
+            if builtMode == 'matrix' and constraintMode != 'matrix':  #constraints don't allow for the offsetParentMatrix the matrix nodes left behind
+                for node in [str(i) for i in nodes['fkCtrls'] + nodes['fkCtrlGrps']] + bindJnts:
+                    world = cmds.xform(node,q=1,m=1,ws=1)
+                    cmds.setAttr(node + '.offsetParentMatrix',geometry.identity(),type='matrix')
+                    cmds.xform(node,m=world,ws=1)
+            fit = placements.FitPlacements.fromDict(record['placements'])
+            hipMatch, chestMatch = fit.hipPivot, fit.chestPivot
+            built, hipRest, chestRest = frames.placementMatrices([hipMatch[:2],fit.hip,fit.chest])  #where the chain offset groups and the hip and chest controls were placed
+            current = cmds.xform(str(nodes['chainGrps'][0]),q=1,m=1,ws=1)
+            if max(abs(a - b) for a, b in zip(built,current)) > 1e-6:  #the rig has been moved since it was built
+                moved = geometry.multMatrix(geometry.inverseMatrix(built),current)
+                hipMatch = geometry.transformPlacement(hipMatch,moved)
+                chestMatch = geometry.transformPlacement(chestMatch,moved)
+                hipRest, chestRest = geometry.multMatrix(hipRest,moved), geometry.multMatrix(chestRest,moved)
+            chains = self.buildSpineChains(nodes,hipMatch,chestMatch,distribution,_makeNodeInstance,_editNodeInstance,constrainBindJnts=bool(bindJnts),
+                                           upVectors=frames.matrixAxes([hipRest,chestRest],'z'))
+            self.lockSpineCtrls(_editNodeInstance,nodes)
+            for grp in nodes['fkCtrlGrps']:
+                _editNodeInstance.lockHideAll(grp)
+            self.attrReport = states.apply()
+            record = self.recordSpineRig(nodes,chains,fit)
+        return record
+def showWindow():
+    """Show the spine auto rig window, Qt and maya's ui are only imported now.
+    
+    Returns:
+        autoRig.ui.Window -- The window.
+    """
+    from autoRig import ui
+    return ui.show()
+def __getattr__(name):
+    """Window and maya_main_window moved to autoRig.ui, they still load from here on first use (python 3.7+)."""
+    if name in ('Window','maya_main_window'):
+        from autoRig import ui
+        return getattr(ui,name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,name))
 if __name__ == '__main__':
-    if not QApplication.instance():  #Create the Qt Application
-        app = QApplication(sys.argv)
-    else:
-        app = QApplication.instance()
-    GUI = Window()  #Create and show the form
-    GUI.show()
\ No newline at end of file
+    GUI = showWindow()  #Create and show the form
@@ -0,0 +1,14 @@
+"""
+Support modules for the spine auto rig.
+
+geometry -- Matrix, rotation and chain maths worked out before anything is created.
+frames -- Whole chain positions, orients, matrices and up vectors in one call, with numpy when it is there.
+memoryScene -- A pure python stand in for maya.cmds so the builder can run without maya.
+shapes -- The control curve shape library, studios can register their own shapes.
+placements -- Fit rig placements saved to a file so spine rigs can be rebuilt without a fit rig.
+profiler -- Times every scene call a build makes against the stage it was made in.
+benchmark -- Scaling benchmarks over joint amount and scene size, checked against a stored baseline.
+batch -- Headless builds of every character in a manifest, one worker process each.
+plan -- Build plans, every step of a build and what it waits for, worked out before the scene is touched.
+ui -- The spine auto rig window, the only module that needs Qt, imported when the window is shown.
+"""
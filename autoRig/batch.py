@@ -0,0 +1,245 @@
+"""
+Headless batch builder for the spine auto rig.
+
+Builds every character in a manifest without the Window, each one in its own worker process so a bad character only fails its own job.
+
+    python -m autoRig.batch characters.json --jobs 4 --output rigs/
+    python -m autoRig.batch characters.json --timeout 600    #stop and fail a character still building after 10 minutes
+
+The manifest is json, a list of characters or {"characters": [...]}:
+    {"characters": [
+        {"name": "bob", "jointAmount": 7,
+         "root": {"t": [0, 0, 0], "r": [0, 0, 0], "s": 1},
+         "hip": {"t": [0, 9, 0]},
+         "chest": {"t": [0, 4, 0]},
+         "hipPivot": {"t": [0, 0, 0]},
+         "chestPivot": {"t": [0, 0, 0]}}]}
+
+Placements are the values an artist would key on the fit rig controls, anything left out keeps the fit rig default:
+    root -- The root control, translate, rotate and a uniform scale.
+    hip, chest -- The hip and chest controls, translate and scale (their Y scale is locked).
+    hipPivot, chestPivot -- The finder locators under the hip and chest controls, where the joint chain starts and ends.
+An entry can give "placements", the path to a file saved by BuildRigs.captureFitRig, instead, then no fit rig is built at all.
+
+In mayapy every character is saved as <output>/<name>.ma, anywhere else it is built in an autoRig.memoryScene and saved as <output>/<name>.json.
+A batch_report.json next to them holds the status, time and error of every job, the exit code is 1 if any job failed.
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections import OrderedDict
+_clock = getattr(time,'perf_counter',time.time)
+PLACEMENTS = OrderedDict([('root',4),('hip',0),('chest',1),('hipPivot',5),('chestPivot',6)])  #manifest key : index of the node in buildFitRig's return
+CHANNELS = OrderedDict([('t',('translateX','translateY','translateZ')),
+                        ('r',('rotateX','rotateY','rotateZ')),
+                        ('s',('scaleY','scaleX','scaleZ'))])  #scale Y first, the root control drives X and Z from it
+def loadManifest(path):
+    """Read the characters from a manifest.
+    
+    Arguments:
+        path {string} -- The manifest json.
+    
+    Returns:
+        list -- A dict per character.
+    """
+    with open(path) as f:
+        manifest = json.load(f,object_pairs_hook=OrderedDict)
+    if isinstance(manifest,dict):
+        manifest = manifest.get('characters',[])
+    return list(manifest)
+def placeFitRig(cmds,fitRig,character):
+    """Move the fit rig controls to a characters placements.
+    
+    Only channels that change are set, so locked channels can be given as long as they hold their current value.
+    
+    Arguments:
+        cmds {module} -- The backend the fit rig was built in.
+        fitRig {list} -- The nodes buildFitRig returned.
+        character {dict} -- The manifest entry.
+    """
+    for key, index in PLACEMENTS.items():
+        placement = character.get(key) or {}
+        for flag, channels in CHANNELS.items():
+            if flag not in placement:
+                continue
+            values = placement[flag]
+            if not isinstance(values,(list,tuple)):  #a single number for a uniform scale
+                values = [values] * 3
+            else:
+                values = [values[1],values[0],values[2]] if flag == 's' else values
+            for channel, value in zip(channels,values):
+                plug = '{}.{}'.format(fitRig[index],channel)
+                if abs(cmds.getAttr(plug) - value) > 1e-9:
+                    cmds.setAttr(plug,value)
+def sceneDump(cmds):
+    """Describe a scene as json ready data.
+    
+    Arguments:
+        cmds {module} -- The backend to describe.
+    
+    Returns:
+        list -- A dict per node with its name, type, parent and world matrix if it has one.
+    """
+    nodes = []
+    transforms = set(cmds.ls(type=['transform','joint']))
+    for name in cmds.ls():
+        parent = cmds.listRelatives(name,p=1)
+        node = OrderedDict([('name',name),('type',cmds.nodeType(name)),('parent',parent[0] if parent else None)])
+        if name in transforms:
+            node['matrix'] = cmds.xform(name,q=1,ws=1,m=1)
+        nodes.append(node)
+    return nodes
+def _backend(name):
+    if name == 'maya':
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        import maya.cmds as cmds
+        return cmds
+    from .memoryScene import MemoryScene
+    return MemoryScene()
+def buildCharacter(job):
+    """Build one character, run in a worker process.
+    
+    Never raises, a failure is reported in the result so the rest of the batch carries on.
+    
+    Arguments:
+        job {tuple} -- (manifest entry, output directory, backend name).
+    
+    Returns:
+        OrderedDict -- 'name', 'status' ('ok' or 'failed'), 'seconds', 'output' and 'error'.
+    """
+    character, outputDir, backendName = job
+    result = OrderedDict([('name',character.get('name') if isinstance(character,dict) else None),('status','failed'),('seconds',0.0),('output',None),('error',None)])
+    start = _clock()
+    try:
+        import JasonWhyttes_autoRig as spineRig
+        name = character['name']
+        jointAmount = int(character['jointAmount'])
+        cmds = _backend(backendName)
+        spineRig.setBackend(cmds)
+        rig = spineRig.BuildRigs(name)
+        if character.get('placements'):  #captured placements, no fit rig needed
+            fitRig = character['placements']
+        else:
+            fitRig = rig.buildFitRig(character.get('fitRigName','fitRig'))
+            placeFitRig(cmds,fitRig,character)
+        rig.buildSpineRig(character.get('rigName','mainRig'),fitRig,jointAmount)
+        if backendName == 'maya':
+            output = os.path.join(outputDir,name + '.ma')
+            cmds.file(rename=output)
+            cmds.file(save=1,type='mayaAscii',force=1)
+        else:
+            output = os.path.join(outputDir,name + '.json')
+            with open(output,'w') as f:
+                json.dump(OrderedDict([('name',name),('jointAmount',jointAmount),('nodes',sceneDump(cmds))]),f,indent=1)
+        result['output'] = output
+        result['status'] = 'ok'
+    except Exception:
+        result['error'] = traceback.format_exc()
+    result['seconds'] = _clock() - start
+    return result
+def defaultBackend():
+    """'maya' when maya.standalone can be imported (mayapy), otherwise 'memory'."""
+    try:
+        importlib.import_module('maya.standalone')
+        return 'maya'
+    except ImportError:
+        return 'memory'
+def _work(job,connection):
+    """A worker process, sends the result of buildCharacter back to run."""
+    connection.send(buildCharacter(job))
+    connection.close()
+def _lost(character,message,seconds):
+    """The result of a job whose worker never sent one back."""
+    return OrderedDict([('name',character.get('name') if isinstance(character,dict) else None),('status','failed'),('seconds',seconds),('output',None),('error',message)])
+def run(characters,outputDir,jobs=1,backend=None,log=None,timeout=None):
+    """Build every character.
+    
+    Each character gets a fresh worker process, at most jobs of them run at once.
+    A worker that dies without a result (a crash, the out of memory killer) or runs past the timeout fails its own job, the rest carry on.
+    
+    Arguments:
+        characters {list} -- Manifest entries.
+        outputDir {string} -- Where the rigs are saved.
+    
+    Keyword Arguments:
+        jobs {int} -- Worker processes to run at once. (default: {1})
+        backend {string} -- 'maya' or 'memory', see defaultBackend if None. (default: {None})
+        log {file} -- Where to write a line per job as it finishes, None is quiet. (default: {None})
+        timeout {float} -- Seconds a job may run before its worker is stopped, None has no limit. (default: {None})
+    
+    Returns:
+        list -- The result of every job (see buildCharacter) in manifest order.
+    """
+    backend = backend or defaultBackend()
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    jobList = [(character,outputDir,backend) for character in characters]
+    results = [None] * len(jobList)
+    waiting = list(range(len(jobList)))
+    running = OrderedDict()  #job index : (process, connection, start)
+    try:
+        while waiting or running:
+            while waiting and len(running) < max(1,jobs):  #one character per process, nothing leaks between them
+                i = waiting.pop(0)
+                receive, send = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=_work,args=(jobList[i],send))
+                process.daemon = True
+                process.start()
+                send.close()  #only the worker writes, so a dead worker shows up as the pipe closing
+                running[i] = (process,receive,_clock())
+            finished = []
+            for i, (process, connection, start) in running.items():
+                seconds = _clock() - start
+                if connection.poll():
+                    try:
+                        results[i] = connection.recv()
+                    except EOFError:  #the worker died, its end of the pipe closed with it
+                        process.join()
+                        results[i] = _lost(jobList[i][0],'the worker exited with code {} before sending a result'.format(process.exitcode),seconds)
+                elif timeout is not None and seconds > timeout:
+                    process.terminate()
+                    results[i] = _lost(jobList[i][0],'the build took longer than {}s and was stopped'.format(timeout),seconds)
+                else:
+                    continue
+                finished.append(i)
+            for i in finished:
+                process, connection = running.pop(i)[:2]
+                connection.close()
+                process.join()
+                if results[i]['name'] is None:  #entries without a name are reported by their place in the manifest
+                    results[i]['name'] = 'entry {}'.format(i + 1)
+                if log is not None:
+                    log.write('{:<24}{:>8}{:>10.3f}s  {}\n'.format(results[i]['name'],results[i]['status'],results[i]['seconds'],
+                                                                  results[i]['output'] or results[i]['error'].strip().splitlines()[-1]))
+            if running and not finished:
+                time.sleep(0.01)
+    finally:
+        for process, connection, start in running.values():  #interrupted, nothing is left running
+            process.terminate()
+            connection.close()
+    return results
+def main(argv=None):
+    """Command line entry point, returns the exit code."""
+    parser = argparse.ArgumentParser(prog='python -m autoRig.batch',description='Build spine rigs for every character in a manifest.')
+    parser.add_argument('manifest',help='json manifest of characters')
+    parser.add_argument('--jobs','-j',type=int,default=multiprocessing.cpu_count(),help='worker processes to run at once')
+    parser.add_argument('--output','-o',default='rigs',help='directory to save the rigs to')
+    parser.add_argument('--backend',choices=('maya','memory'),help='build in maya.standalone or an in memory scene, maya when available')
+    parser.add_argument('--timeout',type=float,help='seconds a character may take before its worker is stopped and the job failed')
+    args = parser.parse_args(argv)
+    start = _clock()
+    results = run(loadManifest(args.manifest),args.output,args.jobs,args.backend,sys.stdout,args.timeout)
+    failed = [result['name'] for result in results if result['status'] != 'ok']
+    report = OrderedDict([('seconds',_clock() - start),('jobs',args.jobs),('built',len(results) - len(failed)),('failed',failed),('results',results)])
+    with open(os.path.join(args.output,'batch_report.json'),'w') as f:
+        json.dump(report,f,indent=2)
+    sys.stdout.write('{} built, {} failed in {:.2f}s\n'.format(report['built'],len(failed),report['seconds']))
+    return 1 if failed else 0
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Scaling benchmarks for the spine auto rig.
+
+Builds the fit rig and the spine rig on a MemoryScene for a range of joint amounts, in scenes padded with nodes that use the same names the build does.
+Every case records the wall time, the cmds calls made (per stage, from autoRig.profiler) and the nodes created.
+The results are checked against a stored baseline so naming or ik/fk setup that starts growing with the scene or the joint count fails the run.
+
+    python -m autoRig.benchmark                              #run everything and check against benchmark_baseline.json
+    python -m autoRig.benchmark --joints 3 50 --padding 0    #a quick subset
+    python -m autoRig.benchmark --update                     #store this run as the new baseline
+    python -m autoRig.benchmark --compare-modes --joints 7   #node counts of the constraint and matrix builds side by side
+
+The run fails only on what the build does, which is the same on every machine:
+    calls and nodes -- Must not go over the baseline for the same case.
+    call growth -- How calls grow between the two largest joint amounts (the slope on a log-log plot, 1 is linear, 2 is quadratic).
+    estimates -- The calls and nodes a dry run plans must match a counted build in every mode, see estimateErrors.
+Times depend on the machine and its load, so they are reported next to the baseline without failing the run:
+    time growth -- How time grows between the two largest joint amounts, in the empty scene.
+    scene growth -- How much slower each joint amount gets in the largest padded scene compared to an empty one.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+import JasonWhyttes_autoRig as spineRig
+from . import profiler
+from .memoryScene import MemoryScene
+_clock = getattr(time,'perf_counter',time.time)
+JOINTS = (3,10,50,200,1000)  #joint amounts to build
+PADDING = (0,10000,100000)  #nodes already in the scene before the build
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),'benchmark_baseline.json')
+TOLERANCE = {'calls':0.02,  #fraction over the baseline calls allowed
+             'nodes':0.0,  #fraction over the baseline nodes allowed
+             'slope':0.35}  #added to the baseline calls growth slope
+ESTIMATE_JOINTS = (3,4,9)  #odd and even chains, a bind chain of 13 sits between result joints
+ESTIMATE_MODES = (('network',{}),  #name : buildSpineRig keyword arguments
+                  ('keys',{'switchMode':'keys'}),
+                  ('matrix',{'constraintMode':'matrix'}),
+                  ('keys matrix',{'switchMode':'keys','constraintMode':'matrix'}),
+                  ('flatten',{'flatten':True}),
+                  ('flatten matrix',{'flatten':True,'constraintMode':'matrix'}),
+                  ('lod',{'bindJointAmount':13}),
+                  ('lod matrix',{'bindJointAmount':13,'constraintMode':'matrix'}),
+                  ('lod flatten',{'bindJointAmount':13,'flatten':True}),
+                  ('lod keys flatten matrix',{'bindJointAmount':13,'switchMode':'keys','flatten':True,'constraintMode':'matrix'}),
+                  ('lod curvature',{'bindJointAmount':13,'distribution':'curvature'}),
+                  ('lod curvature matrix',{'bindJointAmount':13,'distribution':'curvature','constraintMode':'matrix'}),
+                  ('aim',{'aimJoints':True}),
+                  ('length',{'distribution':'length'}))
+_SUFFIX = re.compile(r'^(.+)_(\d{2,})$')
+def namePrefixes(charName):
+    """Find the name prefixes a build uses.
+    
+    Builds a small rig in an empty scene and strips the _01 style suffixes off the names it made.
+    
+    Arguments:
+        charName {string} -- The character name the build will use.
+    
+    Returns:
+        list -- The prefixes, sorted.
+    """
+    scene = MemoryScene()
+    previous = spineRig.setBackend(scene)
+    try:
+        rig = spineRig.BuildRigs(charName)
+        rig.buildSpineRig('mainRig',rig.buildFitRig('fitRig'),3)
+    finally:
+        spineRig.setBackend(previous)
+    prefixes = set()
+    for name in scene.nodes:
+        match = _SUFFIX.match(name)
+        if match and name.startswith(charName):
+            prefixes.add(match.group(1))
+    return sorted(prefixes)
+def padScene(scene,prefixes,amount):
+    """Fill a scene with nodes named like the ones the build makes.
+    
+    The prefixes are used in turn, each getting the next free suffix, so a build into the scene has to step over all of them.
+    
+    Arguments:
+        scene {MemoryScene} -- The scene to fill.
+        prefixes {list} -- Name prefixes, see namePrefixes.
+        amount {int} -- How many nodes to add.
+    """
+    for i in range(amount):
+        scene.createNode('transform',n='{}_{:02d}'.format(prefixes[i % len(prefixes)],i // len(prefixes) + 1),ss=1)
+def runCase(jointAmount,padding,prefixes,charName='bench',repeat=1):
+    """Build one rig and measure it.
+    
+    Arguments:
+        jointAmount {int} -- The spine joint amount.
+        padding {int} -- Nodes to put in the scene first.
+        prefixes {list} -- Name prefixes for the padding, see namePrefixes.
+    
+    Keyword Arguments:
+        charName {string} -- The character name to build with. (default: {'bench'})
+        repeat {int} -- Builds to run, the fastest one is kept. (default: {1})
+    
+    Returns:
+        OrderedDict -- 'time' in seconds, 'calls' to cmds, 'nodes' created and 'stages' calls by build stage.
+    """
+    best = None
+    for _ in range(max(repeat,1)):
+        scene = MemoryScene()
+        padScene(scene,prefixes,padding)
+        before = len(scene.nodes)
+        buildProfiler = profiler.Profiler()
+        previous = spineRig.setBackend(scene)
+        spineRig.setProfiler(buildProfiler)
+        try:
+            start = _clock()
+            rig = spineRig.BuildRigs(charName)
+            rig.buildSpineRig('mainRig',rig.buildFitRig('fitRig'),jointAmount)
+            seconds = _clock() - start
+        finally:
+            spineRig.setProfiler(None)
+            spineRig.setBackend(previous)
+        if best is not None and seconds >= best['time']:
+            continue
+        report = buildProfiler.report()
+        best = OrderedDict([('time',seconds),('calls',report['total']['calls']),('nodes',len(scene.nodes) - before),
+                            ('stages',OrderedDict((path,stage['calls']) for path, stage in report['stages'].items()))])
+    return best
+def compareModes(jointAmount,switchMode='network',charName='bench'):
+    """Build the same rig in every constraint mode and count what each one makes.
+    
+    Arguments:
+        jointAmount {int} -- The spine joint amount.
+    
+    Keyword Arguments:
+        switchMode {string} -- How the ik/fk switch is wired, 'network' or 'keys'. (default: {'network'})
+        charName {string} -- The character name to build with. (default: {'bench'})
+    
+    Returns:
+        OrderedDict -- Per constraint mode, 'nodes' in the scene, 'constraints' and 'matrix' nodes among them, 'calls' to cmds and 'types' node amounts by type.
+    """
+    out = OrderedDict()
+    for mode in spineRig.CONSTRAINT_MODES:
+        scene = MemoryScene()
+        buildProfiler = profiler.Profiler()
+        previous = spineRig.setBackend(scene)
+        spineRig.setProfiler(buildProfiler)
+        try:
+            rig = spineRig.BuildRigs(charName)
+            rig.buildSpineRig('mainRig',rig.buildFitRig('fitRig'),jointAmount,switchMode,constraintMode=mode)
+        finally:
+            spineRig.setProfiler(None)
+            spineRig.setBackend(previous)
+        types = OrderedDict()
+        for node in scene.nodes.values():
+            types[node.type] = types.get(node.type,0) + 1
+        out[mode] = OrderedDict([('nodes',len(scene.nodes)),('constraints',sum(v for k, v in types.items() if k.endswith('Constraint'))),
+                                 ('matrix',sum(v for k, v in types.items() if k.endswith('Matrix'))),('calls',buildProfiler.report()['total']['calls']),
+                                 ('types',OrderedDict(sorted(types.items())))])
+    return out
+def estimateErrors(joints=ESTIMATE_JOINTS,modes=ESTIMATE_MODES,charName='bench'):
+    """Check what dry runs say a build makes against counted builds.
+    
+    Each mode is planned and then built from the same bent fit rig, the plan's calls and nodes by type must match what the build made.
+    The build sessions own calls (selection, undo and refresh) aren't in the plan and aren't counted.
+    
+    Keyword Arguments:
+        joints {list} -- Joint amounts. (default: {ESTIMATE_JOINTS})
+        modes {list} -- (name, buildSpineRig keyword arguments) for each mode. (default: {ESTIMATE_MODES})
+        charName {string} -- The character name to build with. (default: {'bench'})
+    
+    Returns:
+        list -- A message for every estimate that is off, empty if there are none.
+    """
+    errors = []
+    for name, kwargs in modes:
+        for amount in joints:
+            scene = MemoryScene()
+            buildProfiler = profiler.Profiler()
+            previous = spineRig.setBackend(scene)
+            try:
+                rig = spineRig.BuildRigs(charName)
+                fitRig = rig.buildFitRig('fitRig')
+                scene.xform(str(fitRig.chestCtrl),t=(0,3,0))
+                for axis in 'xyz':
+                    scene.setAttr('{}.r{}'.format(fitRig.chestFinderLoc,axis),lock=0)
+                scene.xform(str(fitRig.chestFinderLoc),ro=(30,0,0))  #bend the spine curve so the distributions differ
+                fit = rig.captureFitRig(fitRig)
+                scene = MemoryScene()  #the build alone, the fit rig is left out
+                spineRig.setBackend(scene)
+                planned = rig.spineRigJob('mainRig',fit,amount,**kwargs).plan.summary()  #what a dry run prints
+                spineRig.setProfiler(buildProfiler)
+                rig.buildSpineRig('mainRig',fit,amount,**kwargs)
+            finally:
+                spineRig.setProfiler(None)
+                spineRig.setBackend(previous)
+            calls = sum(stage['calls'] for path, stage in buildProfiler.report()['stages'].items() if not path.endswith('/session'))
+            nodes = OrderedDict()
+            for node in scene.nodes.values():
+                nodes[node.type] = nodes.get(node.type,0) + 1
+            key = '{} joints={}'.format(name,amount)
+            if calls != planned['calls']:
+                errors.append('{}: {} calls, estimated {}'.format(key,calls,planned['calls']))
+            for nodeType in sorted(set(nodes) | set(planned['nodes'])):
+                if nodes.get(nodeType,0) != planned['nodes'].get(nodeType,0):
+                    errors.append('{}: {} {} nodes, estimated {}'.format(key,nodes.get(nodeType,0),nodeType,planned['nodes'].get(nodeType,0)))
+    return errors
+def caseKey(jointAmount,padding):
+    """The name a case is stored under."""
+    return 'joints={} padding={}'.format(jointAmount,padding)
+def slope(x0,y0,x1,y1):
+    """The growth between two points on a log-log plot, 1 is linear and 2 is quadratic."""
+    if min(x0,y0,x1,y1) <= 0 or x0 == x1:
+        return 0.0
+    return math.log(float(y1) / y0) / math.log(float(x1) / x0)
+def growth(cases,joints,padding):
+    """Work out how the build scales.
+    
+    Arguments:
+        cases {dict} -- Results by caseKey.
+        joints {list} -- The joint amounts that were run.
+        padding {list} -- The paddings that were run.
+    
+    Returns:
+        OrderedDict -- 'calls' and 'time' slopes between the two largest joint amounts for each padding,
+                       and 'scene' time in the most padded scene over time in the least for each joint amount.
+    """
+    joints = sorted(joints)
+    padding = sorted(padding)
+    out = OrderedDict([('calls',OrderedDict()),('time',OrderedDict()),('scene',OrderedDict())])
+    if len(joints) > 1:
+        for pad in padding:
+            low, high = cases[caseKey(joints[-2],pad)], cases[caseKey(joints[-1],pad)]
+            out['calls'][str(pad)] = slope(joints[-2],low['calls'],joints[-1],high['calls'])
+            out['time'][str(pad)] = slope(joints[-2],low['time'],joints[-1],high['time'])
+    if len(padding) > 1:
+        for amount in joints:
+            out['scene'][str(amount)] = cases[caseKey(amount,padding[-1])]['time'] / max(cases[caseKey(amount,padding[0])]['time'],1e-9)
+    return out
+def run(joints=JOINTS,padding=PADDING,repeat=1,log=None):
+    """Run every joint amount in every padded scene.
+    
+    Keyword Arguments:
+        joints {list} -- Joint amounts. (default: {JOINTS})
+        padding {list} -- Scene paddings. (default: {PADDING})
+        repeat {int} -- Builds per case, the fastest is kept. (default: {1})
+        log {file} -- Where to write a line per case as it finishes, None is quiet. (default: {None})
+    
+    Returns:
+        OrderedDict -- 'joints', 'padding', 'cases' by caseKey and 'growth', see growth.
+    """
+    prefixes = namePrefixes('bench')
+    cases = OrderedDict()
+    for pad in padding:
+        for amount in joints:
+            result = cases[caseKey(amount,pad)] = runCase(amount,pad,prefixes,repeat=repeat)
+            if log is not None:
+                log.write('{:<28}{:>10.3f}s{:>10} calls{:>8} nodes\n'.format(caseKey(amount,pad),result['time'],result['calls'],result['nodes']))
+    return OrderedDict([('joints',list(joints)),('padding',list(padding)),('cases',cases),('growth',growth(cases,joints,padding))])
+def compare(results,baseline,tolerance=None):
+    """Check results against a baseline.
+    
+    Only calls and nodes are checked, see timings for the times.
+    Cases the baseline doesn't have are skipped, growth is only checked when the same joint amounts and paddings were run.
+    
+    Arguments:
+        results {dict} -- From run.
+        baseline {dict} -- A stored run.
+    
+    Keyword Arguments:
+        tolerance {dict} -- Overrides for TOLERANCE. (default: {None})
+    
+    Returns:
+        list -- A message for every regression, empty if there are none.
+    """
+    limits = dict(TOLERANCE)
+    limits.update(tolerance or {})
+    failures = []
+    for key, case in results['cases'].items():
+        old = baseline['cases'].get(key)
+        if old is None:
+            continue
+        for metric in ('calls','nodes'):
+            if case[metric] > old[metric] * (1 + limits[metric]):
+                failures.append('{}: {} {} > baseline {}'.format(key,metric,case[metric],old[metric]))
+    for pad, value in results['growth']['calls'].items():
+        old = sameGrowth(results,baseline).get('calls',{}).get(pad)
+        if old is not None and value > old + limits['slope']:
+            failures.append('padding={}: calls grow with joints at {:.2f}, baseline {:.2f}'.format(pad,value,old))
+    return failures
+def timings(results,baseline):
+    """Put the time growth next to the baselines, for reading only.
+    
+    Arguments:
+        results {dict} -- From run.
+        baseline {dict} -- A stored run.
+    
+    Returns:
+        list -- A line for the empty scenes time growth and each joint amounts scene growth the baseline has too.
+    """
+    oldGrowth = sameGrowth(results,baseline)
+    lines = []
+    pad = str(min(results['padding']))
+    old = oldGrowth.get('time',{}).get(pad)
+    if old is not None and pad in results['growth']['time']:  #only the empty scene times the build alone
+        lines.append('padding={}: time grows with joints at {:.2f}, baseline {:.2f}'.format(pad,results['growth']['time'][pad],old))
+    for amount, value in results['growth']['scene'].items():
+        old = oldGrowth.get('scene',{}).get(amount)
+        if old is not None:
+            lines.append('joints={}: {:.1f}x slower in a padded scene, baseline {:.1f}x'.format(amount,value,old))
+    return lines
+def sameGrowth(results,baseline):
+    """The baselines growth, empty unless it was measured over the same joint amounts and paddings as the results."""
+    if sorted(results['joints']) == sorted(baseline['joints']) and sorted(results['padding']) == sorted(baseline['padding']):
+        return baseline.get('growth',{})
+    return {}
+def load(path=BASELINE):
+    """Read a stored run, None if there isn't one."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f,object_pairs_hook=OrderedDict)
+def save(results,path=BASELINE):
+    """Store a run as json."""
+    with open(path,'w') as f:
+        json.dump(results,f,indent=2)
+def main(argv=None):
+    """Command line entry point, returns the exit code."""
+    parser = argparse.ArgumentParser(prog='python -m autoRig.benchmark',description='Scaling benchmarks for the spine auto rig.')
+    parser.add_argument('--joints',type=int,nargs='+',default=list(JOINTS),help='joint amounts to build')
+    parser.add_argument('--padding',type=int,nargs='+',default=list(PADDING),help='nodes to put in the scene before building')
+    parser.add_argument('--repeat',type=int,default=1,help='builds per case, the fastest is kept')
+    parser.add_argument('--baseline',default=BASELINE,help='the stored run to check against')
+    parser.add_argument('--update',action='store_true',help='store this run as the baseline instead of checking it')
+    parser.add_argument('--output',help='also write the results to this json file')
+    parser.add_argument('--compare-modes',action='store_true',help='count the nodes of a constraint and a matrix build for each joint amount instead')
+    args = parser.parse_args(argv)
+    if args.compare_modes:
+        results = OrderedDict((str(amount),compareModes(amount)) for amount in args.joints)
+        for amount, modes in results.items():
+            for mode, counts in modes.items():
+                sys.stdout.write('joints={:<6}{:<13}{:>7} nodes{:>6} constraints{:>6} matrix{:>8} calls\n'.format(amount,mode,counts['nodes'],counts['constraints'],counts['matrix'],counts['calls']))
+        if args.output:
+            save(results,args.output)
+        return 0
+    results = run(args.joints,args.padding,args.repeat,sys.stdout)
+    for metric, values in results['growth'].items():
+        if values:
+            sys.stdout.write('{} growth: {}\n'.format(metric,', '.join('{}={:.2f}'.format(k,v) for k, v in values.items())))
+    if args.output:
+        save(results,args.output)
+    if args.update:
+        save(results,args.baseline)
+        sys.stdout.write('baseline written to {}\n'.format(args.baseline))
+        return 0
+    baseline = load(args.baseline)
+    if baseline is None:
+        sys.stdout.write('no baseline at {}, run with --update to make one\n'.format(args.baseline))
+        return 0
+    for line in timings(results,baseline):
+        sys.stdout.write('timing {}\n'.format(line))
+    failures = compare(results,baseline)
+    for failure in failures:
+        sys.stdout.write('REGRESSION {}\n'.format(failure))
+    errors = estimateErrors()
+    for error in errors:
+        sys.stdout.write('ESTIMATE {}\n'.format(error))
+    failures += errors
+    return 1 if failures else 0
+if __name__ == '__main__':
+    sys.exit(main())
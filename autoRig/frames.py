@@ -0,0 +1,233 @@
+"""
+Whole chain frames for the spine auto rig.
+
+Every node of a chain worked out in one call: positions, world rotations, joint orients, world matrices and up vectors.
+Uses numpy when it can be imported (mayapy ships it from maya 2022), otherwise the same maths runs in pure python with autoRig.geometry.
+Numpy is only imported the first time a chain is long enough to use it, so importing the builder stays quick for chains that never are.
+Both give the same numbers, numpy is only quicker for aimed chains long enough to make up for setting up its arrays.
+A chain that copies the start rotation only has two rotations to work out, so it is always pure python.
+
+    from autoRig import frames
+    chain = frames.chainFrames(hipMatch,chestMatch,7,aim='y')
+    for position, orient in zip(chain.positions,chain.orients):
+        ...
+"""
+from collections import namedtuple
+from autoRig import geometry
+numpy = None  #imported by _loadNumpy the first time it is needed
+NUMPY_FROM = 16  #fewer nodes than this are quicker in pure python, numpy's cost per call is more than the loop it saves
+ChainFrames = namedtuple('ChainFrames',('positions','rotations','orients','matrices','upVectors'))  #a list per field, one item per node
+_useNumpy = True  #turned off with useNumpy
+_numpyLoaded = None  #whether numpy could be imported, None until it has been tried
+def _loadNumpy():
+    """Import numpy the first time it is needed, returns whether it is there."""
+    global numpy, _numpyLoaded
+    if _numpyLoaded is None:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+        _numpyLoaded = module is not None
+    return _numpyLoaded
+def useNumpy(enabled=True):
+    """Turn the numpy maths on or off, it stays off when numpy can't be imported.
+    
+    Numpy is imported here if it hasn't been yet, to find out whether it is there.
+    
+    Keyword Arguments:
+        enabled {bool} -- Use numpy for long chains. (default: {True})
+    
+    Returns:
+        bool -- Whether numpy was in use before.
+    """
+    global _useNumpy
+    previous = _useNumpy and _loadNumpy()
+    _useNumpy = bool(enabled) and _loadNumpy()
+    return previous
+def _batched(amount):
+    return amount >= NUMPY_FROM and _useNumpy and _loadNumpy()
+def _axisIndex(axis):
+    if axis not in geometry.AXIS:
+        raise ValueError('unknown axis {!r}, use x, y or z'.format(axis))
+    return geometry.AXIS[axis]
+def chainFrames(start,end,amount,aim=None,up='z',parented=False,positions=None):
+    """Where every node of a chain goes and how it is oriented.
+    
+    The positions are evenly spaced from start to end, the same as geometry.chainPositions.
+    Without an aim axis every node takes the start rotation and the last node the end rotation, the same as geometry.chainPlacements.
+    With one, each node points that axis at the next node (the last one carries on the same way) and turns its up axis as close as it can to the starts.
+    
+    Arguments:
+        start {list} -- Translation and rotation values of the start, as matchNodes returns them.
+        end {list} -- Translation and rotation values of the end, as matchNodes returns them.
+        amount {int} -- The amount of nodes, anything under 2 still gives the start and end.
+    
+    Keyword Arguments:
+        aim {string} -- The axis ('x','y' or 'z') that points down the chain, None copies the start rotation. (default: {None})
+        up {string} -- The axis that follows the starts same axis. (default: {'z'})
+        parented {bool} -- Work out the orients for a chain built as a hierarchy, each node relative to the one before it. (default: {False})
+        positions {list} -- Where each node goes, instead of evenly spaced from start to end (see geometry.curvePositions), amount is then ignored. (default: {None})
+    
+    Returns:
+        ChainFrames -- The positions, world rotations (xyz), joint orients, world matrices and up vectors (the up axis of each matrix).
+    """
+    upIndex = _axisIndex(up)
+    aimIndex = None if aim is None else _axisIndex(aim)
+    if aimIndex == upIndex:
+        raise ValueError('the aim and up axis are both {}'.format(aim))
+    amount = max(amount,2) if positions is None else len(positions)
+    if aimIndex is not None and _batched(amount):
+        return _numpyFrames(start,end,amount,aimIndex,upIndex,parented,positions)
+    positions = geometry.chainPositions(start[0],end[0],amount) if positions is None else [list(p) for p in positions]
+    if aimIndex is None:
+        rotations = [list(start[1])] * (amount - 1) + [list(end[1])]
+        rotationMatrices = [geometry.eulerMatrix(rotations[0])] * (amount - 1) + [geometry.eulerMatrix(rotations[-1])]
+    else:
+        hint = geometry.eulerMatrix(start[1])
+        rotationMatrices = []
+        for i in range(amount):
+            a, b = (i, i + 1) if i < amount - 1 else (i - 1, i)
+            rotationMatrices.append(_aimMatrix([positions[b][c] - positions[a][c] for c in range(3)],hint,aimIndex,upIndex))
+        rotations = [geometry.eulerFromMatrix(m) for m in rotationMatrices]
+    matrices = []
+    for m, p in zip(rotationMatrices,positions):
+        m = list(m)
+        m[12:15] = p
+        matrices.append(m)
+    if parented:
+        orients = [list(rotations[0])] + [geometry.relativeEuler(rotations[i],rotations[i-1]) for i in range(1,amount)]
+    else:
+        orients = [list(r) for r in rotations]
+    upVectors = [m[upIndex * 4:upIndex * 4 + 3] for m in rotationMatrices]
+    return ChainFrames(positions,[list(r) for r in rotations],orients,matrices,upVectors)
+def _aimMatrix(direction,hint,aimIndex,upIndex):
+    """A rotation matrix with its aim axis along direction and its up axis as close to the hint matrix's as it can be."""
+    rows = [None,None,None]
+    rows[aimIndex] = _normal(direction)
+    for axis in (upIndex,3 - aimIndex - upIndex):  #the up axis, or the other one when the up axis is along the aim
+        h = hint[axis * 4:axis * 4 + 3]
+        d = sum(h[c] * rows[aimIndex][c] for c in range(3))
+        u = [h[c] - d * rows[aimIndex][c] for c in range(3)]
+        if sum(v * v for v in u) > 1e-12:
+            break
+    rows[upIndex] = _normal(u)
+    other = 3 - aimIndex - upIndex
+    i, j = (aimIndex, upIndex) if (upIndex - aimIndex) % 3 == 1 else (upIndex, aimIndex)  #keep the rows right handed
+    rows[other] = _cross(rows[i],rows[j])
+    return rows[0] + [0.0] + rows[1] + [0.0] + rows[2] + [0.0,0.0,0.0,0.0,1.0]
+def _normal(v):
+    length = sum(c * c for c in v) ** .5 or 1.0
+    return [c / length for c in v]
+def _cross(a,b):
+    return [a[1] * b[2] - a[2] * b[1],a[2] * b[0] - a[0] * b[2],a[0] * b[1] - a[1] * b[0]]
+def placementMatrices(placements,order=0):
+    """The local matrix of each placement, geometry.composeTransform for a list of them.
+    
+    Arguments:
+        placements {list} -- Translation, rotation and (optional) scale values, as matchNodes returns them.
+    
+    Keyword Arguments:
+        order {int} -- The rotate order of every rotation. (default: {0})
+    
+    Returns:
+        list -- A matrix for each placement.
+    """
+    if not _batched(len(placements)):
+        return [geometry.composeTransform(p[0],p[1],p[2] if len(p) > 2 else (1,1,1),order) for p in placements]
+    t = numpy.array([p[0] for p in placements],dtype=float)
+    s = numpy.array([p[2] if len(p) > 2 else (1,1,1) for p in placements],dtype=float)
+    m = numpy.zeros((len(placements),4,4))
+    m[:,:3,:3] = _rotationMatrices(numpy.array([p[1] for p in placements],dtype=float),order) * s[:,:,None]  #scale each row
+    m[:,3,:3] = t
+    m[:,3,3] = 1.0
+    return m.reshape(-1,16).tolist()
+def matrixAxes(matrices,axis):
+    """One axis of each matrix, scale included, as xform returns them (the z axis is [8:11]).
+    
+    Arguments:
+        matrices {list} -- The matrices.
+        axis {string} -- 'x', 'y' or 'z'.
+    
+    Returns:
+        list -- An (x,y,z) vector for each matrix.
+    """
+    i = _axisIndex(axis) * 4
+    return [list(m[i:i + 3]) for m in matrices]
+#------------------------------------------------------------ numpy ------------------------------------------------------------#
+def _numpyFrames(start,end,amount,aimIndex,upIndex,parented,positions=None):
+    if positions is None:
+        t = numpy.linspace(0.0,1.0,amount)[:,None]
+        positions = numpy.array(start[0],dtype=float) * (1.0 - t) + numpy.array(end[0],dtype=float) * t
+        positions[-1] = end[0]  #exactly on the end, as chainPositions gives it
+    else:
+        positions = numpy.array(positions,dtype=float)
+    hint = _rotationMatrices(numpy.array([start[1]],dtype=float))[0]
+    direction = numpy.diff(positions,axis=0)
+    direction = numpy.vstack((direction,direction[-1:]))  #the last node carries on the same way
+    rotationMatrices = numpy.zeros((amount,3,3))
+    rotationMatrices[:,aimIndex] = direction / _lengths(direction)
+    aimRows = rotationMatrices[:,aimIndex]
+    u = hint[upIndex] - aimRows.dot(hint[upIndex])[:,None] * aimRows
+    other = 3 - aimIndex - upIndex
+    fallback = hint[other] - aimRows.dot(hint[other])[:,None] * aimRows
+    flat = (u * u).sum(axis=1) <= 1e-12  #the up axis is along the aim
+    u[flat] = fallback[flat]
+    rotationMatrices[:,upIndex] = u / _lengths(u)
+    i, j = (aimIndex, upIndex) if (upIndex - aimIndex) % 3 == 1 else (upIndex, aimIndex)
+    rotationMatrices[:,other] = numpy.cross(rotationMatrices[:,i],rotationMatrices[:,j])
+    rotations = _eulers(rotationMatrices)
+    matrices = numpy.zeros((amount,4,4))
+    matrices[:,:3,:3] = rotationMatrices
+    matrices[:,3,:3] = positions
+    matrices[:,3,3] = 1.0
+    if parented:
+        relative = numpy.matmul(rotationMatrices[1:],rotationMatrices[:-1].transpose(0,2,1))  #the transpose of a rotation is its inverse
+        orients = numpy.vstack((rotations[:1],_eulers(relative)))
+        same = (rotations[1:] == rotations[:-1]).all(axis=1)  #nodes with the same rotation as their parent have no orient, as relativeEuler gives it
+        orients[1:][same] = 0.0
+    else:
+        orients = rotations
+    return ChainFrames(positions.tolist(),rotations.tolist(),orients.tolist(),matrices.reshape(-1,16).tolist(),rotationMatrices[:,upIndex].tolist())
+def _lengths(v):
+    lengths = numpy.sqrt((v * v).sum(axis=1))[:,None]
+    lengths[lengths == 0] = 1.0
+    return lengths
+def _axisMatrices(axis,degrees):
+    a = numpy.radians(degrees)
+    c, s = numpy.cos(a), numpy.sin(a)
+    m = numpy.zeros((len(a),3,3))
+    i, j = [k for k in range(3) if k != axis]
+    m[:,axis,axis] = 1.0
+    m[:,i,i] = c
+    m[:,j,j] = c
+    sign = -1.0 if axis == 1 else 1.0  #matches geometry.axisMatrix
+    m[:,i,j] = sign * s
+    m[:,j,i] = -sign * s
+    return m
+def _rotationMatrices(rotations,order=0):
+    """geometry.eulerMatrix for an (n,3) array of rotations, as (n,3,3) matrices."""
+    if not isinstance(order,str):
+        order = geometry.ROTATE_ORDERS[order]
+    m = numpy.repeat(numpy.eye(3)[None],len(rotations),axis=0)
+    for axis in order:
+        i = geometry.AXIS[axis]
+        m = numpy.matmul(m,_axisMatrices(i,rotations[:,i]))
+    return m
+def _eulers(m,order=0):
+    """geometry.eulerFromMatrix for (n,3,3) rotation matrices, as an (n,3) array."""
+    if not isinstance(order,str):
+        order = geometry.ROTATE_ORDERS[order]
+    m = m / _lengths(m.reshape(-1,3)).reshape(-1,3,1)  #scale is removed first
+    i, j, k = geometry.AXIS[order[0]], geometry.AXIS[order[1]], geometry.AXIS[order[2]]
+    e = 1.0 if (j - i) % 3 == 1 else -1.0
+    b = numpy.arcsin(numpy.clip(-e * m[:,i,k],-1.0,1.0))
+    a = numpy.arctan2(e * m[:,j,k],m[:,k,k])
+    c = numpy.arctan2(e * m[:,i,j],m[:,i,i])
+    locked = numpy.abs(numpy.cos(b)) <= 1e-8  #gimbal locked, put everything in the first axis
+    a[locked] = numpy.arctan2(-e * m[locked,k,j],m[locked,j,j])
+    c[locked] = 0.0
+    out = numpy.zeros((len(m),3))
+    out[:,i], out[:,j], out[:,k] = numpy.degrees(a), numpy.degrees(b), numpy.degrees(c)
+    return out
+    
\ No newline at end of file
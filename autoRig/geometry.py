@@ -0,0 +1,525 @@
+"""
+Geometry helpers for the spine auto rig.
+
+Pure python maths used to work out where nodes go before anything is created in the scene.
+Matrices are flat lists of 16 floats in the same row major order xform returns them, points are row vectors.
+"""
+import bisect
+import math
+from collections import namedtuple
+ROTATE_ORDERS = ('xyz','yzx','zxy','xzy','yxz','zyx')  #matches the rotateOrder enum
+AXIS = {'x':0,'y':1,'z':2}
+def identity():
+    """A new identity matrix."""
+    return [1.0,0.0,0.0,0.0, 0.0,1.0,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0]
+def multMatrix(a,b):
+    """Multiply two 4x4 matrices (a * b)."""
+    a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12, a13, a14, a15 = a
+    b0, b1, b2, b3, b4, b5, b6, b7, b8, b9, b10, b11, b12, b13, b14, b15 = b
+    return [a0 * b0 + a1 * b4 + a2 * b8 + a3 * b12, a0 * b1 + a1 * b5 + a2 * b9 + a3 * b13,
+            a0 * b2 + a1 * b6 + a2 * b10 + a3 * b14, a0 * b3 + a1 * b7 + a2 * b11 + a3 * b15,
+            a4 * b0 + a5 * b4 + a6 * b8 + a7 * b12, a4 * b1 + a5 * b5 + a6 * b9 + a7 * b13,
+            a4 * b2 + a5 * b6 + a6 * b10 + a7 * b14, a4 * b3 + a5 * b7 + a6 * b11 + a7 * b15,
+            a8 * b0 + a9 * b4 + a10 * b8 + a11 * b12, a8 * b1 + a9 * b5 + a10 * b9 + a11 * b13,
+            a8 * b2 + a9 * b6 + a10 * b10 + a11 * b14, a8 * b3 + a9 * b7 + a10 * b11 + a11 * b15,
+            a12 * b0 + a13 * b4 + a14 * b8 + a15 * b12, a12 * b1 + a13 * b5 + a14 * b9 + a15 * b13,
+            a12 * b2 + a13 * b6 + a14 * b10 + a15 * b14, a12 * b3 + a13 * b7 + a14 * b11 + a15 * b15]
+def inverseMatrix(m):
+    """Invert a 4x4 matrix using gauss jordan elimination."""
+    a = [list(m[r*4:r*4+4]) + [1.0 if r == c else 0.0 for c in range(4)] for r in range(4)]
+    for col in range(4):
+        pivot = max(range(col,4), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            raise ValueError('Matrix can not be inverted.')
+        a[col], a[pivot] = a[pivot], a[col]
+        p = a[col][col]
+        a[col] = [v / p for v in a[col]]
+        for r in range(4):
+            if r != col and a[r][col]:
+                f = a[r][col]
+                a[r] = [v - f * w for v, w in zip(a[r],a[col])]
+    return [a[r][c] for r in range(4) for c in range(4,8)]
+def transformPoint(p,m):
+    """Move a point by a matrix."""
+    x, y, z = p
+    return [x * m[0] + y * m[4] + z * m[8] + m[12],
+            x * m[1] + y * m[5] + z * m[9] + m[13],
+            x * m[2] + y * m[6] + z * m[10] + m[14]]
+def translateMatrix(t):
+    m = identity()
+    m[12], m[13], m[14] = t[0], t[1], t[2]
+    return m
+def scaleMatrix(s):
+    m = identity()
+    m[0], m[5], m[10] = s[0], s[1], s[2]
+    return m
+def axisMatrix(axis,degrees):
+    """Rotation around a single axis (0,1,2 for x,y,z)."""
+    a = math.radians(degrees)
+    c, s = math.cos(a), math.sin(a)
+    if axis == 0:
+        return [1.0,0.0,0.0,0.0, 0.0,c,s,0.0, 0.0,-s,c,0.0, 0.0,0.0,0.0,1.0]
+    if axis == 1:
+        return [c,0.0,-s,0.0, 0.0,1.0,0.0,0.0, s,0.0,c,0.0, 0.0,0.0,0.0,1.0]
+    return [c,s,0.0,0.0, -s,c,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0]
+def eulerMatrix(rotation,order=0):
+    """Build a rotation matrix from euler angles (degrees) in a rotate order (0-5 or 'xyz' ect)."""
+    if not isinstance(order,str):
+        order = ROTATE_ORDERS[order]
+    m = identity()
+    for axis in order:
+        i = AXIS[axis]
+        if rotation[i]:
+            m = multMatrix(m,axisMatrix(i,rotation[i]))
+    return m
+def eulerFromMatrix(m,order=0):
+    """Get euler angles (degrees) in a rotate order from a matrix, scale is removed first."""
+    if not isinstance(order,str):
+        order = ROTATE_ORDERS[order]
+    rows = []
+    for r in (0,4,8):
+        length = math.sqrt(m[r] ** 2 + m[r+1] ** 2 + m[r+2] ** 2) or 1.0
+        rows.append((m[r] / length,m[r+1] / length,m[r+2] / length))
+    col = lambda r, c: rows[c][r]  #the column vector form of the same rotation
+    i, j, k = AXIS[order[0]], AXIS[order[1]], AXIS[order[2]]
+    e = 1.0 if (j - i) % 3 == 1 else -1.0  #cyclic orders (xyz,yzx,zxy) flip no signs
+    b = math.asin(max(-1.0,min(1.0,-e * col(k,i))))
+    if abs(math.cos(b)) > 1e-8:
+        a = math.atan2(e * col(k,j),col(k,k))
+        c = math.atan2(e * col(j,i),col(i,i))
+    else:  #gimbal locked, put everything in the first axis
+        a = math.atan2(-e * col(j,k),col(j,j))
+        c = 0.0
+    out = [0.0,0.0,0.0]
+    out[i], out[j], out[k] = math.degrees(a), math.degrees(b), math.degrees(c)
+    return out
+def composeTransform(t,r,s,order=0,rp=(0.0,0.0,0.0),sp=(0.0,0.0,0.0)):
+    """Local matrix of a transform, [-sp] * [S] * [sp] * [-rp] * [R] * [rp] * [T]."""
+    m = multMatrix(translateMatrix([-v for v in sp]),scaleMatrix(s))
+    m = multMatrix(m,translateMatrix([a - b for a, b in zip(sp,rp)]))
+    m = multMatrix(m,eulerMatrix(r,order))
+    m[12] += rp[0] + t[0]
+    m[13] += rp[1] + t[1]
+    m[14] += rp[2] + t[2]
+    return m
+def composeJoint(t,r,s,jo,order=0):
+    """Local matrix of a joint, [S] * [R] * [JO] * [T]."""
+    m = multMatrix(multMatrix(scaleMatrix(s),eulerMatrix(r,order)),eulerMatrix(jo))
+    m[12] += t[0]
+    m[13] += t[1]
+    m[14] += t[2]
+    return m
+def matrixScale(m):
+    return [math.sqrt(m[r] ** 2 + m[r+1] ** 2 + m[r+2] ** 2) for r in (0,4,8)]
+def transformPlacement(placement,m):
+    """Move a placement by a matrix.
+    
+    Arguments:
+        placement {list} -- Translation, rotation and scale values, as matchNodes returns them.
+        m {list} -- The matrix to move it by.
+    
+    Returns:
+        list -- The moved [translation,rotation,scale].
+    """
+    moved = multMatrix(composeTransform(placement[0],placement[1],placement[2]),m)
+    return [moved[12:15],eulerFromMatrix(moved),matrixScale(moved)]
+def relativeEuler(child,parent,order=0):
+    """Get the rotation of one orientation relative to another.
+    
+    Used to find the joint orient a child needs to end up with a world rotation under a parent.
+    
+    Arguments:
+        child {list} -- The world rotation (x,y,z) of the child.
+        parent {list} -- The world rotation (x,y,z) of the parent.
+    
+    Keyword Arguments:
+        order {int} -- The rotate order of both rotations. (default: {0})
+    
+    Returns:
+        list -- The child rotation in the parents space.
+    """
+    if list(child) == list(parent):
+        return [0.0,0.0,0.0]
+    parentMatrix = eulerMatrix(parent,order)
+    inverse = [parentMatrix[0],parentMatrix[4],parentMatrix[8],0.0,  #the transpose of a rotation is its inverse
+               parentMatrix[1],parentMatrix[5],parentMatrix[9],0.0,
+               parentMatrix[2],parentMatrix[6],parentMatrix[10],0.0,
+               0.0,0.0,0.0,1.0]
+    return eulerFromMatrix(multMatrix(eulerMatrix(child,order),inverse),order)
+def quaternionFromMatrix(m):
+    """Get the rotation of a matrix as a unit quaternion (x,y,z,w), scale is removed first."""
+    rows = []
+    for r in (0,4,8):
+        length = math.sqrt(m[r] ** 2 + m[r+1] ** 2 + m[r+2] ** 2) or 1.0
+        rows.append([m[r] / length,m[r+1] / length,m[r+2] / length])
+    trace = rows[0][0] + rows[1][1] + rows[2][2]
+    if trace > 0.0:
+        s = math.sqrt(trace + 1.0) * 2.0
+        q = [(rows[1][2] - rows[2][1]) / s,(rows[2][0] - rows[0][2]) / s,(rows[0][1] - rows[1][0]) / s,s / 4.0]
+    else:  #build from the largest diagonal so s never gets small
+        i = max(range(3),key=lambda n: rows[n][n])
+        j, k = (i + 1) % 3, (i + 2) % 3
+        s = math.sqrt(1.0 + rows[i][i] - rows[j][j] - rows[k][k]) * 2.0
+        q = [0.0,0.0,0.0,(rows[j][k] - rows[k][j]) / s]
+        q[i] = s / 4.0
+        q[j] = (rows[i][j] + rows[j][i]) / s
+        q[k] = (rows[i][k] + rows[k][i]) / s
+    return q
+def quaternionMatrix(q):
+    """Build a rotation matrix from a quaternion (x,y,z,w)."""
+    x, y, z, w = q
+    return [1.0 - 2.0 * (y * y + z * z),2.0 * (x * y + z * w),2.0 * (x * z - y * w),0.0,
+            2.0 * (x * y - z * w),1.0 - 2.0 * (x * x + z * z),2.0 * (y * z + x * w),0.0,
+            2.0 * (x * z + y * w),2.0 * (y * z - x * w),1.0 - 2.0 * (x * x + y * y),0.0,
+            0.0,0.0,0.0,1.0]
+def slerp(a,b,weight):
+    """Spherical blend between two quaternions, taking the short way round."""
+    dot = sum(i * j for i, j in zip(a,b))
+    if dot < 0.0:
+        b, dot = [-i for i in b], -dot
+    if dot > 0.9995:  #close enough to blend straight and normalise
+        q = [i + (j - i) * weight for i, j in zip(a,b)]
+    else:
+        angle = math.acos(dot)
+        sa, sb = math.sin(angle * (1.0 - weight)), math.sin(angle * weight)
+        q = [i * sa + j * sb for i, j in zip(a,b)]
+    length = math.sqrt(sum(i * i for i in q)) or 1.0
+    return [i / length for i in q]
+def blendMatrix(a,b,weight,translate=1.0,rotate=1.0,scale=1.0):
+    """Blend one matrix towards another the way a blendMatrix node blends a target, shear is dropped.
+    
+    Arguments:
+        a {list} -- The matrix blended from.
+        b {list} -- The matrix blended to.
+        weight {float} -- How far to blend, 0 is a and 1 is b.
+    
+    Keyword Arguments:
+        translate {float} -- Multiplies the weight for translation. (default: {1.0})
+        rotate {float} -- Multiplies the weight for rotation. (default: {1.0})
+        scale {float} -- Multiplies the weight for scale. (default: {1.0})
+    
+    Returns:
+        list -- The blended matrix.
+    """
+    q = slerp(quaternionFromMatrix(a),quaternionFromMatrix(b),weight * rotate)
+    s = [i + (j - i) * weight * scale for i, j in zip(matrixScale(a),matrixScale(b))]
+    m = multMatrix(scaleMatrix(s),quaternionMatrix(q))
+    m[12:15] = [i + (j - i) * weight * translate for i, j in zip(a[12:15],b[12:15])]
+    return m
+def chainPositions(start,end,amount):
+    """Evenly spaced points from start to end.
+    
+    Arguments:
+        start {list} -- The first point (x,y,z).
+        end {list} -- The last point (x,y,z).
+        amount {int} -- The amount of points, anything under 2 still gives the start and end.
+    
+    Returns:
+        list -- The points, start and end included.
+    """
+    gaps = max(amount - 1,1)
+    step = [(end[i] - start[i]) / float(gaps) for i in range(3)]
+    points = [[start[0] + step[0] * i,start[1] + step[1] * i,start[2] + step[2] * i] for i in range(gaps)]
+    points.append(list(end))
+    return points
+def chainPlacements(start,end,amount):
+    """Where each node of a chain goes.
+    
+    The same placements createChain gives its nodes, so a chain's positions can be used without making it.
+    
+    Arguments:
+        start {list} -- Translation and rotation values of the start, as matchNodes returns them.
+        end {list} -- Translation and rotation values of the end, as matchNodes returns them.
+        amount {int} -- The amount of nodes in the chain.
+    
+    Returns:
+        list -- A [translation,rotation] pair for each node, the rotation stays the same as the start until the end.
+    """
+    positions = chainPositions(start[0],end[0],amount)
+    rotations = [list(start[1])] * (len(positions) - 1) + [list(end[1])]
+    return [[positions[i],rotations[i]] for i in range(len(positions))]
+def circlePoints(radius=1.0,sections=8,sweep=360,degree=3,normal=(0,0,1),center=(0,0,0)):
+    """The cvs and knots of a nurbs circle, the same curve the circle command makes.
+    
+    A full circle is periodic with its first cv at 45 degrees.
+    An arc is open like the circle commands, sections + degree cvs on clamped knots, starting on the axis,
+    the cubic one passes through the circle at every knot and leaves its ends along it.
+    
+    Keyword Arguments:
+        radius {float} -- The size of the circle. (default: {1.0})
+        sections {int} -- The amount of spans. (default: {8})
+        sweep {float} -- How much of the circumference is created, in degrees. (default: {360})
+        degree {int} -- The curve degree, an arc is 1 or 3 like the circle command. (default: {3})
+        normal {list} -- The axis the circle faces. (default: {(0,0,1)})
+        center {list} -- The middle of the circle. (default: {(0,0,0)})
+    
+    Returns:
+        list,list,bool -- The cvs, the knots and if the curve is periodic (the first cvs are repeated at the end).
+    """
+    length = math.sqrt(sum(v * v for v in normal)) or 1.0
+    n = [v / length for v in normal]
+    u = [0.0,0.0,1.0] if abs(n[2]) < 0.9 else [1.0,0.0,0.0]  #build a plane around the normal
+    dot = sum(a * b for a, b in zip(u,n))
+    u = [u[0] - n[0] * dot,u[1] - n[1] * dot,u[2] - n[2] * dot]
+    ul = math.sqrt(sum(v * v for v in u))
+    u = [v / ul for v in u]
+    w = [n[1] * u[2] - n[2] * u[1],n[2] * u[0] - n[0] * u[2],n[0] * u[1] - n[1] * u[0]]
+    plane = lambda ca, sa, origin: tuple(origin[k] + u[k] * ca + w[k] * sa for k in range(3))
+    if sweep >= 360:
+        hull = radius * (1.108194 if sections == 8 else 1.0 / math.cos(math.pi / sections))  #cvs sit outside the circle so the curve passes through it
+        points = []
+        for i in range(sections):
+            a = math.radians(sweep * i / float(sections) + 45)
+            points.append(plane(math.cos(a) * hull,math.sin(a) * hull,center))
+        points += points[:degree]
+        return points, list(range(-degree + 1,len(points))), True
+    if degree not in (1,3):
+        raise ValueError('an arc is degree 1 or 3, not {}'.format(degree))
+    step = math.radians(sweep) / sections  #the angle of a span
+    arc = [plane(math.cos(step * i) * radius,math.sin(step * i) * radius,center) for i in range(sections + 1)]  #on the circle at each knot
+    knots = [0] * degree + list(range(1,sections)) + [sections] * degree
+    if degree == 1:
+        return arc, knots, False
+    tangent = lambda a: plane(-math.sin(a) * radius * step / 3.0,math.cos(a) * radius * step / 3.0,(0,0,0))  #a clamped cubics end cv leaves along a third of its derivative
+    first = tuple(arc[0][k] + tangent(0)[k] for k in range(3))
+    last = tuple(arc[-1][k] - tangent(step * sections)[k] for k in range(3))
+    points = [arc[0],first] + _interpolate(knots,arc[1:-1],first,last) + [last,arc[-1]]
+    return points, knots, False
+def _basis(knots,i,t,degree=3):
+    """The value of the i'th b-spline basis function at t, Cox-de Boor."""
+    if degree == 0:
+        return 1.0 if knots[i] <= t < knots[i + 1] else 0.0
+    value = 0.0
+    if knots[i + degree] != knots[i]:
+        value += (t - knots[i]) / float(knots[i + degree] - knots[i]) * _basis(knots,i,t,degree - 1)
+    if knots[i + degree + 1] != knots[i + 1]:
+        value += (knots[i + degree + 1] - t) / float(knots[i + degree + 1] - knots[i + 1]) * _basis(knots,i + 1,t,degree - 1)
+    return value
+def _interpolate(knots,targets,first,last):
+    """The inner cvs of a clamped cubic whose two cvs at each end are known, so it passes through a target at each inner knot.
+    
+    Arguments:
+        knots {list} -- The knots, in the circle commands form (no phantom end knots).
+        targets {list} -- A point (x,y,z) for each inner knot 1, 2, ...
+        first {tuple} -- The second cv.
+        last {tuple} -- The second to last cv.
+    
+    Returns:
+        list -- The cvs between first and last, one per target.
+    """
+    full = [knots[0]] + list(knots) + [knots[-1]]  #the basis functions want the end knots degree + 1 times
+    count = len(targets)
+    rows = []
+    for k, target in enumerate(targets):
+        weights = [_basis(full,i,k + 1.0) for i in range(count + 4)]
+        rhs = [target[a] - weights[1] * first[a] - weights[-2] * last[a] for a in range(3)]  #the first and last cvs are 0 at inner knots
+        rows.append(weights[2:-2] + rhs)
+    for col in range(count):  #gaussian elimination, the rows are diagonally dominant so no pivoting
+        for row in range(col + 1,count):
+            scale = rows[row][col] / rows[col][col]
+            if scale:
+                rows[row] = [a - scale * b for a, b in zip(rows[row],rows[col])]
+    points = [None] * count
+    for row in range(count - 1,-1,-1):
+        points[row] = tuple((rows[row][count + a] - sum(rows[row][c] * points[c][a] for c in range(row + 1,count))) / rows[row][row] for a in range(3))
+    return points
+def chainParameters(points):
+    """The normalised distance along a chain of points.
+    
+    Arguments:
+        points {list} -- The points (x,y,z) in chain order.
+    
+    Returns:
+        list -- A value from 0 to 1 for each point, 0 at the first point and 1 at the last.
+    """
+    lengths = [0.0]
+    for i in range(1,len(points),1):
+        lengths.append(lengths[-1] + math.sqrt(sum((points[i][a] - points[i-1][a]) ** 2 for a in range(3))))
+    if lengths[-1] == 0.0:
+        return [0.0 for p in points]
+    return [l / lengths[-1] for l in lengths]
+FALLOFFS = ('linear','smoothstep','dropoff')
+def falloff(u,curve='linear'):
+    """Blend value between two influences.
+    
+    'dropoff' is the inverse distance falloff a skinCluster bound with a dropoff rate of 4 gives between two joints.
+    The original fk setup bound all three controls (mi=4) but only constrained each joint to the two either side of it, and a constraint normalises its weights.
+    With inverse distance weights the third controls share cancels out of that, so blending only the two closest gives the same result.
+    
+    Arguments:
+        u {float} -- How far from the first influence to the second, 0 to 1.
+    
+    Keyword Arguments:
+        curve {string} -- One of FALLOFFS. (default: {'linear'})
+    
+    Returns:
+        float -- The weight of the second influence, the first gets 1 minus this.
+    """
+    u = min(max(u,0.0),1.0)
+    if curve == 'linear':
+        return u
+    if curve == 'smoothstep':
+        return u * u * (3.0 - 2.0 * u)
+    if curve == 'dropoff':
+        a = u ** 4
+        b = (1.0 - u) ** 4
+        return a / (a + b)
+    raise ValueError('Unknown falloff "{}", use one of {}'.format(curve,', '.join(FALLOFFS)))
+def fkWeights(params,curve='dropoff',centre=.5):
+    """Weights of three controls spread along a chain.
+    
+    The first control sits at 0, the second at centre and the third at 1.
+    Each point is only weighted to the two controls either side of it.
+    
+    Arguments:
+        params {list} -- The parameter of each point, see chainParameters.
+    
+    Keyword Arguments:
+        curve {string} -- The falloff between controls, one of FALLOFFS, 'dropoff' matches the original skinCluster bind. (default: {'dropoff'})
+        centre {float} -- The parameter of the middle control. (default: {.5})
+    
+    Returns:
+        list -- (first,second,third) weights for each point.
+    """
+    weights = []
+    for t in params:
+        if t <= centre:
+            w = falloff(t / centre,curve)
+            weights.append((1.0 - w,w,0.0))
+        else:
+            w = falloff((t - centre) / (1.0 - centre),curve)
+            weights.append((0.0,1.0 - w,w))
+    return weights
+def chainInterpolation(params,driverParams):
+    """Where each point of a dense chain sits between the points of a sparser one.
+    
+    Arguments:
+        params {list} -- The parameter of each dense point, see chainParameters.
+        driverParams {list} -- The parameter of each driver point, at least two.
+    
+    Returns:
+        list -- (index,weight) for each dense point, it sits between driver index and index + 1 and weight is how far towards index + 1.
+    """
+    out = []
+    last = len(driverParams) - 2
+    for t in params:
+        i = 0
+        while i < last and t > driverParams[i + 1]:
+            i += 1
+        span = driverParams[i + 1] - driverParams[i]
+        w = min(max((t - driverParams[i]) / span,0.0),1.0) if span else 0.0
+        out.append((i,w))
+    return out
+DISTRIBUTIONS = ('line','length','curvature')  #how a chain's joints are spread from start to end, see curvePositions
+CURVATURE_BIAS = .9  #how much of the spacing curvature decides in 'curvature' mode, the rest is spread by length so a chain through an s bend keeps joints at the bends middle
+CurveTable = namedtuple('CurveTable',('cvs','params','points','lengths','curvatures'))  #a curve sampled once, see curveTable
+def spineCurve(start,end):
+    """The cvs of the bezier curve a spine follows from start to end.
+    
+    The curve leaves start along its y axis and arrives at end along its y axis, each inner cv a third of the way from start to end.
+    When both y axes point from start to end the cvs are evenly spaced on the straight line, the same as chainPositions(start,end,4).
+    
+    Arguments:
+        start {list} -- Translation and rotation values of the start, as matchNodes returns them.
+        end {list} -- Translation and rotation values of the end, as matchNodes returns them.
+    
+    Returns:
+        list -- The 4 cvs (x,y,z).
+    """
+    reach = math.sqrt(sum((end[0][i] - start[0][i]) ** 2 for i in range(3))) / 3.0
+    startAxis, endAxis = eulerMatrix(start[1])[4:7], eulerMatrix(end[1])[4:7]
+    return [list(start[0]),[start[0][i] + startAxis[i] * reach for i in range(3)],[end[0][i] - endAxis[i] * reach for i in range(3)],list(end[0])]
+def bezierPoint(cvs,t):
+    """The point on a cubic bezier curve (4 cvs, the d=3 k=[0,0,0,1,1,1] curve createIkSpline makes) at parameter t."""
+    u = 1.0 - t
+    w = (u * u * u,3.0 * u * u * t,3.0 * u * t * t,t * t * t)
+    return [sum(w[j] * cvs[j][i] for j in range(4)) for i in range(3)]
+def bezierCurvature(cvs,t):
+    """The curvature (1 / radius) of a cubic bezier curve at parameter t."""
+    u = 1.0 - t
+    d1 = [3.0 * u * u * (cvs[1][i] - cvs[0][i]) + 6.0 * u * t * (cvs[2][i] - cvs[1][i]) + 3.0 * t * t * (cvs[3][i] - cvs[2][i]) for i in range(3)]
+    d2 = [6.0 * u * (cvs[2][i] - 2.0 * cvs[1][i] + cvs[0][i]) + 6.0 * t * (cvs[3][i] - 2.0 * cvs[2][i] + cvs[1][i]) for i in range(3)]
+    speed = math.sqrt(sum(v * v for v in d1))
+    if speed < 1e-12:
+        return 0.0
+    cross = (d1[1] * d2[2] - d1[2] * d2[1],d1[2] * d2[0] - d1[0] * d2[2],d1[0] * d2[1] - d1[1] * d2[0])
+    return math.sqrt(sum(v * v for v in cross)) / speed ** 3
+def curveTable(cvs,samples=64):
+    """Sample a cubic bezier curve once so joints can be placed along it without working it out again.
+    
+    Arguments:
+        cvs {list} -- The 4 cvs, see spineCurve.
+    
+    Keyword Arguments:
+        samples {int} -- The amount of spans the curve is cut into. (default: {64})
+    
+    Returns:
+        CurveTable -- The cvs and, at each sample, its parameter, point, length along the curve and curvature.
+    """
+    params = [i / float(samples) for i in range(samples + 1)]
+    points = [bezierPoint(cvs,t) for t in params]
+    lengths = [0.0]
+    for i in range(1,len(points)):
+        lengths.append(lengths[-1] + math.sqrt(sum((points[i][a] - points[i-1][a]) ** 2 for a in range(3))))
+    return CurveTable([list(cv) for cv in cvs],params,points,lengths,[bezierCurvature(cvs,t) for t in params])
+def curveParams(table,amount,mode='length'):
+    """Where along a curve each joint of a chain goes.
+    
+    'length' spaces the joints evenly along the curve.
+    'curvature' puts more of them where the curve bends, spacing them by the square root of its curvature (which keeps the chain the same distance from the curve all the way along) mixed with their length by CURVATURE_BIAS.
+    
+    Arguments:
+        table {CurveTable} -- The sampled curve, see curveTable.
+        amount {int} -- The amount of joints, anything under 2 still gives the start and end.
+    
+    Keyword Arguments:
+        mode {string} -- 'length' or 'curvature'. (default: {'length'})
+    
+    Returns:
+        list -- The curve parameter of each joint, 0 at the start and 1 at the end.
+    """
+    if mode not in ('length','curvature'):
+        raise ValueError('unknown distribution {!r}, use length or curvature'.format(mode))
+    measure = table.lengths
+    bend = [math.sqrt(k) for k in table.curvatures]
+    totalBend = sum((bend[i] + bend[i-1]) * (measure[i] - measure[i-1]) * .5 for i in range(1,len(measure)))
+    if mode == 'curvature' and totalBend > 1e-9:
+        density = [(1.0 - CURVATURE_BIAS) + CURVATURE_BIAS * b * table.lengths[-1] / totalBend for b in bend]  #both parts add up to the curves length
+        measure = [0.0]
+        for i in range(1,len(density)):
+            measure.append(measure[-1] + (density[i] + density[i-1]) * (table.lengths[i] - table.lengths[i-1]) * .5)
+    gaps = max(amount - 1,1)
+    params = [0.0]
+    for i in range(1,gaps):
+        target = measure[-1] * i / float(gaps)
+        j = min(max(bisect.bisect_right(measure,target) - 1,0),len(measure) - 2)
+        span = measure[j + 1] - measure[j]
+        params.append(table.params[j] + (table.params[j + 1] - table.params[j]) * ((target - measure[j]) / span if span else 0.0))
+    params.append(1.0)
+    return params
+def curvePositions(table,amount,mode='length'):
+    """The world position of each joint of a chain along a curve, see curveParams."""
+    return [bezierPoint(table.cvs,t) for t in curveParams(table,amount,mode)]
+def curveDeviation(table,points):
+    """How far a chain strays from a curve.
+    
+    The chain is taken as the straight lines between its points, each curve sample is measured to the closest of them.
+    
+    Arguments:
+        table {CurveTable} -- The sampled curve, see curveTable.
+        points {list} -- The chains points (x,y,z) in order.
+    
+    Returns:
+        float -- The largest distance from the curve to the chain.
+    """
+    worst = 0.0
+    segments = [(points[i],[points[i+1][a] - points[i][a] for a in range(3)]) for i in range(len(points) - 1)]
+    for p in table.points:
+        closest = None
+        for start, d in segments:
+            dd = sum(v * v for v in d)
+            t = min(max(sum((p[a] - start[a]) * d[a] for a in range(3)) / dd,0.0),1.0) if dd else 0.0
+            distance = sum((p[a] - start[a] - d[a] * t) ** 2 for a in range(3))
+            closest = distance if closest is None else min(closest,distance)
+        worst = max(worst,math.sqrt(closest or 0.0))
+    return worst
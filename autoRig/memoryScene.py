@@ -0,0 +1,1061 @@
+"""
+In memory scene that stands in for maya.cmds.
+
+Gives the builder a pure python scene graph so rigs can be built, timed and checked without a maya session.
+Only the commands and flags the auto rig uses are supported, the signatures mirror maya.cmds so the builder runs unchanged.
+
+    import JasonWhyttes_autoRig as autoRig
+    from autoRig.memoryScene import MemoryScene
+    autoRig.setBackend(MemoryScene())
+
+What is modelled:
+    DAG hierarchy of transforms, joints, curves, locators, cluster and ik handles.
+    Attributes with lock, keyable and channel box state, plus user attributes from addAttr.
+    Local and world matrices (rotate order, pivots, joint orient, inheritsTransform, offsetParentMatrix).
+    Connections between plugs.
+    multMatrix, blendMatrix, pickMatrix and composeMatrix nodes evaluate, so matrix rigs driving offsetParentMatrix can be posed and checked.
+    Constraints, skinClusters, clusters and ik handles are stored as records, they don't evaluate.
+    Constraints can be queried for their targets (tl), weight aliases (wal) and a targets weight (w), other query flags raise NotImplementedError.
+    Set driven keys are stored as animCurve nodes holding their keys.
+
+Like maya, locked or connected attributes can't be set and xform won't move locked channels.
+"""
+import fnmatch
+import math
+import re
+from .geometry import (identity as _identity, multMatrix, inverseMatrix, transformPoint, translateMatrix, scaleMatrix, eulerMatrix,
+                       eulerFromMatrix, composeTransform, composeJoint, matrixScale, circlePoints, blendMatrix,
+                       quaternionFromMatrix, quaternionMatrix)
+COMPOUNDS = {}  #compound attribute : its x,y,z children
+for _compound in ('translate','rotate','scale','rotatePivot','scalePivot','jointOrient','localPosition','localScale','dWorldUpVector','dWorldUpVectorEnd'):
+    COMPOUNDS[_compound] = tuple(_compound + axis for axis in 'XYZ')
+AFFECTS_MATRIX = set(['rotateOrder','inheritsTransform','offsetParentMatrix'])  #attributes that move a node and its children
+for _compound in ('translate','rotate','scale','rotatePivot','scalePivot','jointOrient'):
+    AFFECTS_MATRIX.update(COMPOUNDS[_compound])
+COMPOUND_PARENT = {}  #child attribute : its compound
+for _compound in COMPOUNDS:
+    for _child in COMPOUNDS[_compound]:
+        COMPOUND_PARENT[_child] = _compound
+ALIASES = {'t':'translate','tx':'translateX','ty':'translateY','tz':'translateZ',
+           'r':'rotate','rx':'rotateX','ry':'rotateY','rz':'rotateZ',
+           's':'scale','sx':'scaleX','sy':'scaleY','sz':'scaleZ',
+           'jo':'jointOrient','jox':'jointOrientX','joy':'jointOrientY','joz':'jointOrientZ',
+           'rp':'rotatePivot','rpx':'rotatePivotX','rpy':'rotatePivotY','rpz':'rotatePivotZ',
+           'sp':'scalePivot','spx':'scalePivotX','spy':'scalePivotY','spz':'scalePivotZ',
+           'v':'visibility','ro':'rotateOrder','it':'inheritsTransform','ove':'overrideEnabled',
+           'ovc':'overrideColor','opm':'offsetParentMatrix','radi':'radius','wm':'worldMatrix',
+           'm':'matrix','pm':'parentMatrix','wim':'worldInverseMatrix','im':'inverseMatrix'}
+COMPUTED = ('matrix','inverseMatrix','worldMatrix','worldInverseMatrix','parentMatrix','parentInverseMatrix','message')
+MATRIX_NODES = {'multMatrix':'matrixSum','blendMatrix':'outputMatrix','pickMatrix':'outputMatrix','composeMatrix':'outputMatrix'}  #matrix nodes that evaluate : their output
+_MULTI = re.compile(r'^(\w+)\[(\d+)\]')
+SHAPE_COMPUTED = ('degree','spans','worldSpace')
+_TRANSFORM = [('translateX',0.0,1),('translateY',0.0,1),('translateZ',0.0,1),
+              ('rotateX',0.0,1),('rotateY',0.0,1),('rotateZ',0.0,1),
+              ('scaleX',1.0,1),('scaleY',1.0,1),('scaleZ',1.0,1),
+              ('visibility',True,1),('rotateOrder',0,0),
+              ('rotatePivotX',0.0,0),('rotatePivotY',0.0,0),('rotatePivotZ',0.0,0),
+              ('scalePivotX',0.0,0),('scalePivotY',0.0,0),('scalePivotZ',0.0,0),
+              ('inheritsTransform',True,0),('overrideEnabled',False,0),('overrideColor',0,0),
+              ('offsetParentMatrix',_identity(),0)]
+_SHAPE = [('visibility',True,0),('overrideEnabled',False,0),('overrideColor',0,0),('intermediateObject',False,0)]
+SCHEMAS = {'transform':_TRANSFORM,
+           'joint':_TRANSFORM + [('jointOrientX',0.0,0),('jointOrientY',0.0,0),('jointOrientZ',0.0,0),
+                                 ('radius',1.0,0),('segmentScaleCompensate',True,0)],
+           'ikHandle':_TRANSFORM + [('dTwistControlEnable',False,0),('dWorldUpType',0,0),('dForwardAxis',0,0),
+                                    ('dWorldUpAxis',0,0),('dWorldUpVectorX',0.0,0),('dWorldUpVectorY',1.0,0),
+                                    ('dWorldUpVectorZ',0.0,0),('dWorldUpVectorEndX',0.0,0),('dWorldUpVectorEndY',1.0,0),
+                                    ('dWorldUpVectorEndZ',0.0,0),('dWorldUpMatrix',_identity(),0),
+                                    ('dWorldUpMatrixEnd',_identity(),0),('twist',0.0,1),('roll',0.0,1)],
+           'ikEffector':_TRANSFORM,
+           'nurbsCurve':_SHAPE,
+           'locator':_SHAPE + [('localPositionX',0.0,0),('localPositionY',0.0,0),('localPositionZ',0.0,0),
+                               ('localScaleX',1.0,0),('localScaleY',1.0,0),('localScaleZ',1.0,0)],
+           'clusterHandle':_SHAPE}
+SHAPE_TYPES = ('nurbsCurve','locator','clusterHandle')
+CONSTRAINT_CHANNELS = {'parentConstraint':('translate','rotate'),  #the channels each constraint type drives
+                       'pointConstraint':('translate',),
+                       'orientConstraint':('rotate',),
+                       'aimConstraint':('rotate',),
+                       'scaleConstraint':('scale',)}
+def _flatten(items):
+    out = []
+    for item in items:
+        if isinstance(item,(list,tuple)):
+            out.extend(_flatten(item))
+        elif item is not None:
+            out.append(item)
+    return out
+def _flag(kwargs,longName,shortName=None,default=None):
+    """Read a command flag given by either its long or short name."""
+    if longName in kwargs:
+        return kwargs[longName]
+    if shortName is not None and shortName in kwargs:
+        return kwargs[shortName]
+    return default
+#------------------------------------------------ scene graph ------------------------------------------------#
+class Attr():
+    """A single attribute value and its channel box state."""
+    def __init__(self,value,keyable=False):
+        self.value = list(value) if isinstance(value,list) else value
+        self.keyable = bool(keyable)
+        self.channelBox = False
+        self.locked = False
+        self.minValue = None
+        self.maxValue = None
+class Node():
+    """A node in the scene.
+
+    Nodes with a schema (transforms, joints, shapes ect) only have the attributes maya would give them plus user attributes.
+    Every other node type (constraints, utility nodes, deformers, animCurves) takes any attribute it is given.
+    """
+    def __init__(self,name,nodeType,uuid,dag):
+        self.name = name
+        self.type = nodeType
+        self.uuid = uuid
+        self.dag = dag
+        self.parent = None
+        self.children = []
+        self.strict = nodeType in SCHEMAS
+        self.attrs = {}
+        self.aliases = {}  #user attribute short names
+        self.data = {}  #records for nodes that don't evaluate (constraint targets, keys, weights ect)
+        self.owned = []  #nodes deleted along with this one
+        for attrName, default, keyable in SCHEMAS.get(nodeType,()):
+            self.attrs[attrName] = Attr(default,keyable)
+class MemoryScene():
+    """A scene graph that answers the maya.cmds calls the auto rig makes."""
+    def __init__(self):
+        self.clear()
+    def clear(self):
+        """Empty the scene."""
+        self.nodes = {}  #short name : node
+        self.byUuid = {}
+        self.selection = []
+        self.refreshSuspended = False
+        self.inputs = {}  #(node, attr) : (node, attr) driving it
+        self.outputs = {}  #(node, attr) : [(node, attr)] it drives
+        self.worldCache = {}  #node : world matrix, cleared for a node and its children when they move
+        self.matrixDriven = 0  #offsetParentMatrix connections, while there are any every change clears the whole cache
+        self.uuidCount = 0
+    def stats(self):
+        """Count the nodes in the scene by type.
+
+        Returns:
+            dict -- node type : amount.
+        """
+        counts = {}
+        for node in self.nodes.values():
+            counts[node.type] = counts.get(node.type,0) + 1
+        return counts
+    #--------------------------------------------- internals ---------------------------------------------#
+    def _uniqueName(self,name):
+        if name not in self.nodes:
+            return name
+        base, digits = re.match(r'(.*?)(\d*)$',name).groups()
+        n = int(digits) + 1 if digits else 1
+        while '{}{}'.format(base,n) in self.nodes:
+            n += 1
+        return '{}{}'.format(base,n)
+    def _create(self,nodeType,name=None,parent=None,dag=True):
+        self.uuidCount += 1
+        uuid = '{:08X}-0000-4000-8000-{:012X}'.format(id(self) & 0xFFFFFFFF,self.uuidCount)
+        node = Node(self._uniqueName(name or nodeType + '1'),nodeType,uuid,dag)
+        self.nodes[node.name] = node
+        self.byUuid[uuid] = node
+        if parent is not None:
+            node.parent = parent
+            parent.children.append(node)
+        return node
+    def _addShape(self,transform,shapeType):
+        return self._create(shapeType,transform.name + 'Shape',transform)
+    def _node(self,name):
+        if not isinstance(name,Node):
+            node = self.nodes.get(name.split('|')[-1]) or self.byUuid.get(name)
+            if node is None:
+                raise ValueError('No object matches name: {}'.format(name))
+            return node
+        return name
+    def _shapes(self,node):
+        return [child for child in node.children if child.type in SHAPE_TYPES]
+    def _path(self,node):
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(names))
+    def _descendants(self,node):
+        out = []
+        stack = list(node.children)
+        while stack:
+            child = stack.pop()
+            out.append(child)
+            stack.extend(child.children)
+        return out
+    def _resolve(self,node,attr):
+        """Get the attribute key for a node, falling through to the shape like maya does."""
+        attr = node.aliases.get(attr,ALIASES.get(attr,attr))
+        if not node.strict:
+            return node, attr
+        attr = re.sub(r'\[\d+\]$','',attr)  #worldMatrix[0] ect
+        attr = ALIASES.get(attr,attr)
+        if attr in node.attrs or attr in COMPOUNDS and COMPOUNDS[attr][0] in node.attrs or attr in COMPUTED:
+            return node, attr
+        if node.type in SHAPE_TYPES and attr in SHAPE_COMPUTED:
+            return node, attr
+        for shape in self._shapes(node):
+            if attr in shape.attrs or attr in SHAPE_COMPUTED:
+                return shape, attr
+        raise ValueError('No object matches name: {}.{}'.format(node.name,attr))
+    def _plug(self,plug):
+        name, attr = plug.split('.',1)
+        return self._resolve(self._node(name),attr)
+    def _incoming(self,node,attr):
+        src = self.inputs.get((node,attr))
+        if src is None and attr in COMPOUND_PARENT:
+            src = self.inputs.get((node,COMPOUND_PARENT[attr]))
+        return src
+    def _attr(self,node,attr):
+        if attr not in node.attrs:
+            if node.strict:
+                raise ValueError('No object matches name: {}.{}'.format(node.name,attr))
+            node.attrs[attr] = Attr(0.0,True)
+        return node.attrs[attr]
+    def _value(self,node,attr):
+        if attr in COMPUTED or attr in SHAPE_COMPUTED:
+            return self._computed(node,attr)
+        if attr in COMPOUNDS:
+            return [tuple(self._value(node,child) for child in COMPOUNDS[attr])]
+        src = self._incoming(node,attr)
+        if src is not None and src[0].type in MATRIX_NODES:
+            return self._evaluate(src[0])
+        if src is not None and src[0].strict and (src[1] in src[0].attrs or src[1] in COMPOUNDS or src[1] in COMPUTED[:-1]):  #plain attribute to attribute connections pass their value through
+            return self._value(src[0],src[1])
+        value = self._attr(node,attr).value
+        return list(value) if isinstance(value,list) else value
+    def _computed(self,node,attr):
+        if attr == 'matrix':
+            return self._localMatrix(node)
+        if attr == 'inverseMatrix':
+            return inverseMatrix(self._localMatrix(node))
+        if attr == 'worldMatrix':
+            return list(self._worldMatrix(node))
+        if attr == 'worldInverseMatrix':
+            return inverseMatrix(self._worldMatrix(node))
+        if attr == 'parentMatrix':
+            return list(self._worldMatrix(node.parent)) if node.parent is not None else _identity()
+        if attr == 'parentInverseMatrix':
+            return inverseMatrix(self._computed(node,'parentMatrix'))
+        if attr == 'degree':
+            return node.data.get('degree',1)
+        if attr == 'spans':
+            return len(node.data.get('points',())) - node.data.get('degree',1)
+        raise RuntimeError('{}.{} can not be read directly.'.format(node.name,attr))
+    def _input(self,node,attr,default):
+        """The value of a matrix node input, the default when it has never been set or connected."""
+        if (node,attr) not in self.inputs and attr not in node.attrs:
+            return default
+        value = self._value(node,attr)
+        return value[0] if isinstance(value,list) and len(value) == 1 and isinstance(value[0],tuple) else value  #compounds come back as [(x,y,z)]
+    def _multi(self,node,name):
+        """The set and connected indices of a multi attribute, in order."""
+        indices = set()
+        for attr in list(node.attrs) + [key[1] for key in self.inputs if key[0] is node]:
+            match = _MULTI.match(attr)
+            if match and match.group(1) == name:
+                indices.add(int(match.group(2)))
+        return sorted(indices)
+    def _evaluate(self,node):
+        """Work out the output matrix of a matrix node."""
+        if node.type == 'multMatrix':
+            m = _identity()
+            for i in self._multi(node,'matrixIn'):
+                m = multMatrix(m,self._input(node,'matrixIn[{}]'.format(i),_identity()))
+            return m
+        if node.type == 'composeMatrix':
+            return composeTransform(self._input(node,'inputTranslate',(0.0,0.0,0.0)),self._input(node,'inputRotate',(0.0,0.0,0.0)),
+                                    self._input(node,'inputScale',(1.0,1.0,1.0)),int(self._input(node,'inputRotateOrder',0)))
+        m = self._input(node,'inputMatrix',_identity())
+        if node.type == 'pickMatrix':
+            picked = multMatrix(scaleMatrix(matrixScale(m)) if self._input(node,'useScale',1) else _identity(),
+                                quaternionMatrix(quaternionFromMatrix(m)) if self._input(node,'useRotate',1) else _identity())
+            if self._input(node,'useTranslate',1):
+                picked[12:15] = m[12:15]
+            return picked
+        envelope = self._input(node,'envelope',1.0)
+        for i in self._multi(node,'target'):
+            target = 'target[{}].'.format(i)
+            m = blendMatrix(m,self._input(node,target + 'targetMatrix',_identity()),self._input(node,target + 'weight',1.0) * envelope,
+                            self._input(node,target + 'translateWeight',1.0),self._input(node,target + 'rotateWeight',1.0),self._input(node,target + 'scaleWeight',1.0))
+        return m
+    def _writable(self,node,attr):
+        a = self._attr(node,attr)
+        if a.locked:
+            raise RuntimeError('setAttr: The attribute \'{}.{}\' is locked or connected and cannot be modified.'.format(node.name,attr))
+        src = self._incoming(node,attr)
+        if src is not None and not src[0].type.startswith('animCurve'):  #driven keys can still be set, everything else can't
+            raise RuntimeError('setAttr: The attribute \'{}.{}\' is locked or connected and cannot be modified.'.format(node.name,attr))
+        return a
+    def _set(self,node,attr,value):
+        a = self._writable(node,attr)
+        if a.minValue is not None:
+            value = max(a.minValue,value)
+        if a.maxValue is not None:
+            value = min(a.maxValue,value)
+        a.value = list(value) if isinstance(value,(list,tuple)) else value
+        if attr in AFFECTS_MATRIX or self.matrixDriven:
+            self._dirty(node)
+    def _dirty(self,node):
+        """Forget the cached world matrices of a node and everything under it."""
+        if self.matrixDriven:  #anything could feed a matrix node, so nothing cached can be trusted
+            self.worldCache.clear()
+            return
+        cache = self.worldCache
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if cache.pop(item,None) is not None or item is node:  #children are only cached after their parents, so uncached branches can be skipped
+                stack.extend(item.children)
+    def _vector(self,node,compound):
+        attrs = node.attrs
+        x, y, z = COMPOUNDS[compound]
+        return [attrs[x].value,attrs[y].value,attrs[z].value]
+    def _setChannels(self,node,compound,values,check=True):
+        """Write x,y,z channels, only channels that actually change are checked for locks."""
+        for attr, value in zip(COMPOUNDS[compound],values):
+            a = node.attrs[attr]
+            if abs(a.value - value) > 1e-9:
+                if check:
+                    self._writable(node,attr)
+                a.value = float(value)
+                if attr in AFFECTS_MATRIX:
+                    self._dirty(node)
+    def _localMatrix(self,node):
+        if node.type not in SCHEMAS or node.type in SHAPE_TYPES:
+            return _identity()
+        order = node.attrs['rotateOrder'].value
+        if node.type == 'joint':
+            return composeJoint(self._vector(node,'translate'),self._vector(node,'rotate'),self._vector(node,'scale'),
+                                self._vector(node,'jointOrient'),order)
+        return composeTransform(self._vector(node,'translate'),self._vector(node,'rotate'),self._vector(node,'scale'),order,
+                                self._vector(node,'rotatePivot'),self._vector(node,'scalePivot'))
+    def _parentSpace(self,node):
+        """The matrix a nodes local matrix is multiplied by to get to world space."""
+        if node.type in SHAPE_TYPES:
+            return self._worldMatrix(node.parent) if node.parent is not None else _identity()
+        if 'offsetParentMatrix' not in node.attrs:
+            m = _identity()
+        elif (node,'offsetParentMatrix') in self.inputs:
+            m = self._value(node,'offsetParentMatrix')
+        else:
+            m = node.attrs['offsetParentMatrix'].value
+        if node.parent is not None and node.attrs.get('inheritsTransform',Attr(True)).value:
+            m = multMatrix(m,self._worldMatrix(node.parent))
+        return list(m)
+    def _worldMatrix(self,node):
+        if node is None or not node.dag:
+            return _identity()
+        m = self.worldCache.get(node)
+        if m is None:
+            uncached = []
+            parent = node.parent
+            while parent is not None and parent.dag and parent not in self.worldCache:
+                uncached.append(parent)
+                parent = parent.parent
+            for parent in reversed(uncached):  #top down, matrix nodes would otherwise recurse once per node in a long chain
+                self.worldCache[parent] = multMatrix(self._localMatrix(parent),self._parentSpace(parent))
+            m = self.worldCache[node] = multMatrix(self._localMatrix(node),self._parentSpace(node))
+        return m
+    def _setLocalMatrix(self,node,m,check=True):
+        """Decompose a local matrix back onto a nodes channels."""
+        order = node.attrs['rotateOrder'].value
+        scale = matrixScale(m)
+        if node.type == 'joint':  #keep the rotate values and put the difference into the joint orient
+            rotate = eulerMatrix(self._vector(node,'rotate'),order)
+            rows = [[rotate[r*4+c] for r in range(3)] + [0.0] for c in range(3)]  #transpose is the inverse of a rotation
+            inv = rows[0] + rows[1] + rows[2] + [0.0,0.0,0.0,1.0]
+            unscaled = list(m)
+            for r in range(3):
+                for c in range(3):
+                    unscaled[r*4+c] /= scale[r] or 1.0
+            self._setChannels(node,'jointOrient',eulerFromMatrix(multMatrix(inv,unscaled)),check)
+            self._setChannels(node,'scale',scale,check)
+            self._setChannels(node,'translate',m[12:15],check)
+            return
+        rotate = eulerFromMatrix(m,order)
+        offset = composeTransform([0.0,0.0,0.0],rotate,scale,order,self._vector(node,'rotatePivot'),self._vector(node,'scalePivot'))[12:15]  #where the pivots put the origin with no translation
+        self._setChannels(node,'rotate',rotate,check)
+        self._setChannels(node,'scale',scale,check)
+        self._setChannels(node,'translate',[m[12] - offset[0],m[13] - offset[1],m[14] - offset[2]],check)
+    def _connect(self,src,dst,force=False):
+        if dst in self.inputs:
+            if self.inputs[dst] == src:
+                return
+            if not force:
+                raise RuntimeError('connectAttr: {}.{} already has an incoming connection.'.format(dst[0].name,dst[1]))
+            self._disconnect(self.inputs[dst],dst)
+        if dst[1] in dst[0].attrs and dst[0].attrs[dst[1]].locked:
+            raise RuntimeError('connectAttr: The attribute \'{}.{}\' is locked.'.format(dst[0].name,dst[1]))
+        self.inputs[dst] = src
+        self.outputs.setdefault(src,[]).append(dst)
+        if dst[1] == 'offsetParentMatrix':
+            self.matrixDriven += 1
+            self._dirty(dst[0])
+        elif self.matrixDriven:
+            self.worldCache.clear()
+    def _disconnect(self,src,dst):
+        if self.inputs.get(dst) == src:
+            del self.inputs[dst]
+            self.outputs[src].remove(dst)
+            if not self.outputs[src]:
+                del self.outputs[src]
+            if dst[1] == 'offsetParentMatrix':
+                self.matrixDriven -= 1
+                self.worldCache.clear()
+            elif self.matrixDriven:
+                self.worldCache.clear()
+    def _keepValue(self,dst):
+        """What a driven attribute holds once it is disconnected, like maya it keeps the value it was last given."""
+        node, attr = dst
+        if node.strict and attr == 'offsetParentMatrix':
+            return self._value(node,attr)
+        return None
+    def _points(self,node):
+        """The points of a curve shape in world space."""
+        m = self._worldMatrix(node)
+        return [transformPoint(p,m) for p in node.data.get('points',())]
+    def _component(self,component):
+        """Split 'curve.cv[2]' or 'curve.cv[0:3]' into the shape and a list of cv indices."""
+        name, comp = component.split('.',1)
+        node = self._node(name)
+        if node.type not in SHAPE_TYPES:
+            node = self._shapes(node)[0]
+        match = re.match(r'cv\[(\d+)(?::(\d+))?\]$',comp)
+        if match is None:
+            raise ValueError('Unsupported component: {}'.format(component))
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        return node, list(range(start,end + 1))
+    def _select(self,nodes):
+        self.selection = list(nodes)
+    #--------------------------------------------- queries ---------------------------------------------#
+    def objExists(self,name):
+        if '.' in name:
+            try:
+                self._plug(name)
+                return True
+            except ValueError:
+                return False
+        return name.split('|')[-1] in self.nodes or name in self.byUuid
+    def nodeType(self,name):
+        return self._node(name.split('.')[0]).type
+    objectType = nodeType
+    def ls(self,*patterns,**kwargs):
+        nodeType = _flag(kwargs,'type','typ')
+        longNames = _flag(kwargs,'long','l')
+        if _flag(kwargs,'selection','sl'):
+            nodes = list(self.selection)
+        elif patterns:
+            nodes = []
+            for pattern in _flatten(patterns):
+                if pattern in self.byUuid:
+                    nodes.append(self.byUuid[pattern])
+                elif any(ch in pattern for ch in '*?['):
+                    nodes.extend(self.nodes[n] for n in fnmatch.filter(self.nodes,pattern.split('|')[-1]))
+                elif pattern.split('|')[-1] in self.nodes:
+                    nodes.append(self.nodes[pattern.split('|')[-1]])
+        else:
+            nodes = list(self.nodes.values())
+        if nodeType is not None:
+            types = set(_flatten([nodeType]))
+            nodes = [n for n in nodes if n.type in types]
+        if _flag(kwargs,'uuid'):
+            return [n.uuid for n in nodes]
+        return [self._path(n) if longNames and n.dag else n.name for n in nodes]
+    def listRelatives(self,*nodes,**kwargs):
+        out = []
+        for name in _flatten(nodes) or [n.name for n in self.selection]:
+            node = self._node(name)
+            if _flag(kwargs,'parent','p'):
+                found = [node.parent] if node.parent is not None else []
+            elif _flag(kwargs,'allDescendents','ad'):
+                found = self._descendants(node)
+            elif _flag(kwargs,'shapes','s'):
+                found = self._shapes(node)
+            else:
+                found = list(node.children)
+            nodeType = _flag(kwargs,'type')
+            if nodeType is not None:
+                found = [n for n in found if n.type in _flatten([nodeType])]
+            out.extend(self._path(n) if _flag(kwargs,'fullPath','f') else n.name for n in found)
+        return out or None  #maya.cmds returns None rather than an empty list
+    def listConnections(self,target,**kwargs):
+        source = _flag(kwargs,'source','s',True)
+        destination = _flag(kwargs,'destination','d',True)
+        nodeType = _flag(kwargs,'type','t')
+        plugs = _flag(kwargs,'plugs','p')
+        pairs = []
+        if '.' in target:
+            keys = [self._plug(target)]
+        else:
+            node = self._node(target)
+            keys = [key for key in list(self.inputs) + list(self.outputs) if key[0] is node]
+        for key in keys:
+            if source and key in self.inputs:
+                pairs.append(self.inputs[key])
+            if destination:
+                pairs.extend(self.outputs.get(key,()))
+        out = []
+        for node, attr in pairs:
+            if nodeType is not None and not (node.type == nodeType or node.type.startswith(nodeType)):
+                continue
+            item = '{}.{}'.format(node.name,attr) if plugs else node.name
+            if item not in out:
+                out.append(item)
+        return out or None
+    def getAttr(self,plug,**kwargs):
+        node, attr = self._plug(plug)
+        if _flag(kwargs,'lock','l'):
+            attr = COMPOUNDS.get(attr,(attr,))[0]
+            return self._attr(node,attr).locked
+        if _flag(kwargs,'keyable','k'):
+            return self._attr(node,COMPOUNDS.get(attr,(attr,))[0]).keyable
+        if _flag(kwargs,'channelBox','cb'):
+            return self._attr(node,COMPOUNDS.get(attr,(attr,))[0]).channelBox
+        return self._value(node,attr)
+    def listAttr(self,name,**kwargs):
+        node = self._node(name)
+        names = list(node.attrs)
+        if _flag(kwargs,'locked','l'):
+            names = [a for a in names if node.attrs[a].locked]
+        if _flag(kwargs,'keyable','k'):
+            names = [a for a in names if node.attrs[a].keyable]
+        if _flag(kwargs,'userDefined','ud'):
+            names = [a for a in names if a not in dict((n, 1) for n, d, k in SCHEMAS.get(node.type,()))]
+        return names or None
+    def attributeQuery(self,attr,**kwargs):
+        node = self._node(_flag(kwargs,'node','n'))
+        try:
+            self._resolve(node,attr)
+            exists = True
+        except ValueError:
+            exists = False
+        if not node.strict:
+            exists = node.aliases.get(attr,attr) in node.attrs
+        return exists
+    #--------------------------------------------- attributes ---------------------------------------------#
+    def setAttr(self,plug,*values,**kwargs):
+        if _flag(kwargs,'type') == 'nurbsCurve':  #curve data, degree spans form rational dimension knotCount knots cvCount cvs
+            node = self._node(plug.split('.')[0])
+            shape = node if node.type == 'nurbsCurve' else self._shapes(node)[0]
+            values = _flatten(values)
+            degree, form, knotCount = int(values[0]), int(values[2]), int(values[5])
+            knots = values[6:6 + knotCount]
+            flat = values[7 + knotCount:]
+            shape.data.update(points=[tuple(float(v) for v in flat[i:i+3]) for i in range(0,len(flat),3)],degree=degree,knots=list(knots),
+                              form=('open','closed','periodic')[form])
+            return
+        node, attr = self._plug(plug)
+        children = COMPOUNDS.get(attr,(attr,))
+        if attr in COMPUTED or attr in SHAPE_COMPUTED:
+            raise RuntimeError('setAttr: {}.{} is an output attribute.'.format(node.name,attr))
+        if values:
+            if _flag(kwargs,'type') == 'matrix' or len(values) == 1 and isinstance(values[0],(list,tuple)) and len(values[0]) == 16:
+                self._set(node,attr,list(_flatten(values)))
+            elif len(children) > 1:
+                values = _flatten(values)
+                for child, value in zip(children,values):
+                    self._set(node,child,value)
+            else:
+                self._set(node,attr,values[0])
+        for child in children:
+            a = self._attr(node,child)
+            lock = _flag(kwargs,'lock','l')
+            keyable = _flag(kwargs,'keyable','k')
+            channelBox = _flag(kwargs,'channelBox','cb')
+            if lock is not None:
+                a.locked = bool(lock)
+            if keyable is not None:
+                a.keyable = bool(keyable)
+            if channelBox is not None:
+                a.channelBox = bool(channelBox)
+    def addAttr(self,name,**kwargs):
+        node = self._node(name)
+        longName = _flag(kwargs,'longName','ln')
+        shortName = _flag(kwargs,'shortName','sn')
+        if longName in node.attrs:
+            raise RuntimeError('addAttr: Found a duplicate attribute name: {}.{}'.format(node.name,longName))
+        attrType = _flag(kwargs,'attributeType','at',_flag(kwargs,'dataType','dt','double'))
+        default = _flag(kwargs,'defaultValue','dv',_identity() if attrType == 'matrix' else 0.0)
+        a = Attr(default,_flag(kwargs,'keyable','k',False))
+        a.minValue = _flag(kwargs,'minValue','min')
+        a.maxValue = _flag(kwargs,'maxValue','max')
+        node.attrs[longName] = a
+        if shortName:
+            node.aliases[shortName] = longName
+    def connectAttr(self,src,dst,**kwargs):
+        self._connect(self._plug(src),self._plug(dst),_flag(kwargs,'force','f',False))
+    def disconnectAttr(self,src,dst):
+        dst = self._plug(dst)
+        value = self._keepValue(dst)
+        self._disconnect(self._plug(src),dst)
+        if value is not None:
+            dst[0].attrs[dst[1]].value = value
+    #--------------------------------------------- creation ---------------------------------------------#
+    def createNode(self,nodeType,**kwargs):
+        parent = _flag(kwargs,'parent','p')
+        parent = self._node(parent) if parent else None
+        dag = nodeType in SCHEMAS or parent is not None
+        node = self._create(nodeType,_flag(kwargs,'name','n'),parent,dag)
+        if nodeType in SHAPE_TYPES and parent is None:  #maya makes a transform for parentless shapes
+            transform = self._create('transform',_flag(kwargs,'name','n') and node.name + '_transform')
+            node.parent = transform
+            transform.children.append(node)
+        if not _flag(kwargs,'skipSelect','ss'):
+            self._select([node])
+        return node.name
+    def group(self,*nodes,**kwargs):
+        parent = _flag(kwargs,'parent','p')
+        grp = self._create('transform',_flag(kwargs,'name','n','group1'),self._node(parent) if parent else None)
+        targets = _flatten(nodes) or ([] if _flag(kwargs,'empty','em') else [n.name for n in self.selection])
+        if targets:
+            self.parent(targets,grp.name)
+        self._select([grp])
+        return grp.name
+    def spaceLocator(self,**kwargs):
+        loc = self._create('transform',_flag(kwargs,'name','n','locator1'))
+        shape = self._addShape(loc,'locator')
+        position = _flag(kwargs,'position','p')
+        if position:
+            self._setChannels(shape,'localPosition',position)
+        self._select([loc])
+        return [loc.name]
+    def joint(self,*nodes,**kwargs):
+        if _flag(kwargs,'edit','e'):
+            for name in _flatten(nodes) or [n.name for n in self.selection]:
+                node = self._node(name)
+                orientation = _flag(kwargs,'orientation','o')
+                if orientation is not None:
+                    self._setChannels(node,'jointOrient',orientation)
+                radius = _flag(kwargs,'radius','rad')
+                if radius is not None:
+                    self._set(node,'radius',radius)
+                position = _flag(kwargs,'position','p')
+                if position is not None:
+                    self._setChannels(node,'translate',transformPoint(position,inverseMatrix(self._parentSpace(node))))
+            return
+        parent = self.selection[0] if self.selection and self.selection[0].type == 'joint' else None  #new joints go under a selected joint
+        jnt = self._create('joint',_flag(kwargs,'name','n','joint1'),parent)
+        position = _flag(kwargs,'position','p')
+        if position is not None:
+            self._setChannels(jnt,'translate',transformPoint(position,inverseMatrix(self._parentSpace(jnt))))
+        orientation = _flag(kwargs,'orientation','o')
+        if orientation is not None:
+            self._setChannels(jnt,'jointOrient',orientation)
+        radius = _flag(kwargs,'radius','rad')
+        if radius is not None:
+            jnt.attrs['radius'].value = radius
+        self._select([jnt])
+        return jnt.name
+    def curve(self,**kwargs):
+        points = [tuple(float(v) for v in p) for p in _flag(kwargs,'point','p')]
+        degree = _flag(kwargs,'degree','d',3)
+        knots = _flag(kwargs,'knot','k')
+        crv = self._create('transform',_flag(kwargs,'name','n','curve1'))
+        shape = self._addShape(crv,'nurbsCurve')
+        shape.data.update(points=points,degree=degree,knots=list(knots) if knots is not None else None,
+                          form='periodic' if _flag(kwargs,'periodic','per') else 'open')
+        self._select([crv])
+        return crv.name
+    def circle(self,**kwargs):
+        radius = float(_flag(kwargs,'radius','r',1.0))
+        sections = _flag(kwargs,'sections','s',8)
+        degree = _flag(kwargs,'degree','d',3)
+        sweep = _flag(kwargs,'sweep','sw',360)
+        center = _flag(kwargs,'center','c',(0,0,0))
+        normal = _flag(kwargs,'normal','nr',(0,0,1))
+        points, knots, periodic = circlePoints(radius,sections,sweep,degree,normal,center)
+        crv = self._create('transform',_flag(kwargs,'name','n','nurbsCircle1'))
+        shape = self._addShape(crv,'nurbsCurve')
+        shape.data.update(points=points,degree=degree,knots=knots,form='periodic' if periodic else 'open')
+        self._select([crv])
+        return [crv.name]
+    def rename(self,old,new):
+        node = self._node(old)
+        del self.nodes[node.name]
+        node.name = self._uniqueName(new)
+        self.nodes[node.name] = node
+        return node.name
+    def _copy(self,node,parent,name):
+        copy = self._create(node.type,name,parent,node.dag)
+        for attrName, attr in node.attrs.items():
+            new = Attr(attr.value,attr.keyable)
+            new.channelBox, new.locked, new.minValue, new.maxValue = attr.channelBox, attr.locked, attr.minValue, attr.maxValue
+            copy.attrs[attrName] = new
+        copy.aliases = dict(node.aliases)
+        copy.data = dict((k,list(v) if isinstance(v,list) else v) for k, v in node.data.items())
+        for child in node.children:
+            self._copy(child,copy,copy.name + 'Shape' if child.type in SHAPE_TYPES else child.name)
+        return copy
+    def duplicate(self,*nodes,**kwargs):
+        """Copy nodes and everything under them, connections are not copied (like -rr)."""
+        name = _flag(kwargs,'name','n')
+        out = []
+        for item in _flatten(nodes) or [n.name for n in self.selection]:
+            node = self._node(item)
+            out.append(self._copy(node,node.parent,name or node.name))
+        self._select(out)
+        return [n.name for n in out]
+    #--------------------------------------------- hierarchy ---------------------------------------------#
+    def parent(self,*nodes,**kwargs):
+        nodes = _flatten(nodes)
+        world = _flag(kwargs,'world','w')
+        relative = _flag(kwargs,'relative','r')
+        if world:
+            children, parent = nodes, None
+        else:
+            children, parent = nodes[:-1], self._node(nodes[-1])
+        out = []
+        for name in children:
+            node = self._node(name)
+            if node.parent is parent:
+                raise RuntimeError('parent: Object \'{}\' is already a child of \'{}\'.'.format(node.name,parent.name if parent else 'world'))
+            check = parent
+            while check is not None:
+                if check is node:
+                    raise RuntimeError('parent: Cannot parent \'{}\' under itself.'.format(node.name))
+                check = check.parent
+            if node.type in SHAPE_TYPES:  #shapes move as is (parent -s -r)
+                world = None
+            else:
+                world = self._worldMatrix(node)
+            if node.parent is not None:
+                node.parent.children.remove(node)
+            node.parent = parent
+            if parent is not None:
+                parent.children.append(node)
+            self._dirty(node)
+            if world is not None and not relative:
+                self._setLocalMatrix(node,multMatrix(world,inverseMatrix(self._parentSpace(node))),False)
+            out.append(node.name)
+        self.selection = [self._node(n) for n in out]
+        return out
+    def delete(self,*nodes,**kwargs):
+        doomed = []
+        for name in _flatten(nodes):
+            node = self._node(name)
+            for item in [node] + self._descendants(node):
+                doomed.append(item)
+                doomed.extend(item.owned)
+        doomed = [n for n in doomed if self.nodes.get(n.name) is n]
+        gone = set(doomed)
+        keys = [k for k in self.inputs if k[0] in gone or self.inputs[k][0] in gone]
+        kept = [(key,self._keepValue(key)) for key in keys if key[0] not in gone]  #worked out before anything upstream goes
+        for key in keys:
+            self._disconnect(self.inputs[key],key)
+        for (node, attr), value in kept:
+            if value is not None:
+                node.attrs[attr].value = value
+        for node in doomed:
+            if self.nodes.get(node.name) is not node:
+                continue
+            if node.parent is not None and node.parent not in gone:
+                node.parent.children.remove(node)
+            del self.nodes[node.name]
+            del self.byUuid[node.uuid]
+            self.worldCache.pop(node,None)
+        self.selection = [n for n in self.selection if n not in gone]
+    def select(self,*nodes,**kwargs):
+        if _flag(kwargs,'clear','cl'):
+            self.selection = []
+            return
+        found = [self._node(n) for n in _flatten(nodes)]
+        if _flag(kwargs,'add'):
+            self.selection += [n for n in found if n not in self.selection]
+        elif _flag(kwargs,'deselect','d'):
+            self.selection = [n for n in self.selection if n not in found]
+        else:
+            self.selection = found
+    def undoInfo(self,**kwargs):
+        """There is no undo queue, state always queries as off and chunks are ignored."""
+        if _flag(kwargs,'query','q'):
+            return False
+    def refresh(self,**kwargs):
+        """Nothing is drawn, only the suspend state is kept."""
+        suspend = _flag(kwargs,'suspend','su')
+        if suspend is not None:
+            self.refreshSuspended = bool(suspend)
+    #--------------------------------------------- transforms ---------------------------------------------#
+    def xform(self,*nodes,**kwargs):
+        names = _flatten(nodes) or [n.name for n in self.selection]
+        worldSpace = _flag(kwargs,'worldSpace','ws')
+        relative = _flag(kwargs,'relative','r')
+        if _flag(kwargs,'query','q'):
+            node = self._node(names[0])
+            if _flag(kwargs,'matrix','m'):
+                return list(self._worldMatrix(node)) if worldSpace else self._localMatrix(node)
+            if _flag(kwargs,'translation','t'):
+                if worldSpace:
+                    return transformPoint(self._vector(node,'translate'),self._parentSpace(node))
+                return self._vector(node,'translate')
+            if _flag(kwargs,'rotation','ro'):
+                if worldSpace:
+                    return eulerFromMatrix(self._worldMatrix(node),node.attrs['rotateOrder'].value)
+                return self._vector(node,'rotate')
+            if _flag(kwargs,'scale','s'):
+                return matrixScale(self._worldMatrix(node)) if worldSpace else self._vector(node,'scale')
+            pivots = []
+            for compound, flags in (('rotatePivot',('rotatePivot','rp')),('scalePivot',('scalePivot','sp'))):
+                if _flag(kwargs,*flags) or _flag(kwargs,'pivots','piv'):
+                    pivot = self._vector(node,compound)
+                    pivots += transformPoint(pivot,self._worldMatrix(node)) if worldSpace else pivot
+            if pivots:
+                return pivots
+            if _flag(kwargs,'boundingBox','bb'):
+                return self._boundingBox(node,self._worldMatrix(node))
+            raise RuntimeError('xform: Unsupported query flags {}'.format(sorted(kwargs)))
+        for name in names:
+            node = self._node(name)
+            if _flag(kwargs,'centerPivots','cp'):
+                box = self._boundingBox(node,_identity())
+                centre = [(box[i] + box[i+3]) * 0.5 for i in range(3)]
+                self._setChannels(node,'rotatePivot',centre)
+                self._setChannels(node,'scalePivot',centre)
+            pivot = _flag(kwargs,'pivots','piv')
+            if pivot is not None:
+                self._setChannels(node,'rotatePivot',pivot[:3])
+                self._setChannels(node,'scalePivot',pivot[:3])
+            matrix = _flag(kwargs,'matrix','m')
+            if matrix is not None:
+                if worldSpace:
+                    matrix = multMatrix(matrix,inverseMatrix(self._parentSpace(node)))
+                self._setLocalMatrix(node,list(matrix))
+            translation = _flag(kwargs,'translation','t')
+            if translation is not None:
+                if relative:
+                    translation = [a + b for a, b in zip(self._vector(node,'translate'),translation)]
+                elif worldSpace:
+                    translation = transformPoint(translation,inverseMatrix(self._parentSpace(node)))
+                self._setChannels(node,'translate',translation)
+            rotation = _flag(kwargs,'rotation','ro')
+            if rotation is not None:
+                if relative:
+                    rotation = [a + b for a, b in zip(self._vector(node,'rotate'),rotation)]
+                elif worldSpace:
+                    local = multMatrix(eulerMatrix(rotation,node.attrs['rotateOrder'].value),inverseMatrix(self._parentSpace(node)))
+                    if node.type == 'joint':
+                        local = multMatrix(local,inverseMatrix(eulerMatrix(self._vector(node,'jointOrient'))))
+                    rotation = eulerFromMatrix(local,node.attrs['rotateOrder'].value)
+                self._setChannels(node,'rotate',rotation)
+            scale = _flag(kwargs,'scale','s')
+            if scale is not None:
+                if relative:
+                    scale = [a * b for a, b in zip(self._vector(node,'scale'),scale)]
+                self._setChannels(node,'scale',scale)
+    def _boundingBox(self,node,space):
+        """Bounding box of every shape under a node, in the given space."""
+        points = []
+        stack = [(node,space)]
+        while stack:
+            item, m = stack.pop()
+            for child in item.children:
+                if child.type in SHAPE_TYPES:
+                    points.extend(transformPoint(p,m) for p in child.data.get('points',[(0.0,0.0,0.0)]))
+                elif child.dag and child.strict:  #constraints sit under their node but have no transform
+                    stack.append((child,multMatrix(self._localMatrix(child),multMatrix(child.attrs['offsetParentMatrix'].value,m))))
+        if not points:
+            points = [transformPoint((0.0,0.0,0.0),space)]
+        return [min(p[i] for p in points) for i in range(3)] + [max(p[i] for p in points) for i in range(3)]
+    def makeIdentity(self,*nodes,**kwargs):
+        flags = [_flag(kwargs,'translate','t'),_flag(kwargs,'rotate','r'),_flag(kwargs,'scale','s')]
+        if not any(flags):
+            flags = [1,1,1]
+        for name in _flatten(nodes) or [n.name for n in self.selection]:
+            node = self._node(name)
+            t = self._vector(node,'translate') if flags[0] else [0.0,0.0,0.0]
+            r = self._vector(node,'rotate') if flags[1] else [0.0,0.0,0.0]
+            s = self._vector(node,'scale') if flags[2] else [1.0,1.0,1.0]
+            if node.type == 'joint' and flags[1]:  #joints keep the rotation as orientation
+                orient = multMatrix(eulerMatrix(r,node.attrs['rotateOrder'].value),eulerMatrix(self._vector(node,'jointOrient')))
+                self._setChannels(node,'jointOrient',eulerFromMatrix(orient))
+                r = [0.0,0.0,0.0]
+                flags[1] = 0
+            freeze = multMatrix(multMatrix(scaleMatrix(s),eulerMatrix(r,node.attrs['rotateOrder'].value)),translateMatrix(t))
+            for child in node.children:
+                if child.type in SHAPE_TYPES:
+                    child.data['points'] = [tuple(transformPoint(p,freeze)) for p in child.data.get('points',())]
+                elif child.dag:
+                    self._setLocalMatrix(child,multMatrix(self._localMatrix(child),freeze),False)
+            for compound in ('rotatePivot','scalePivot'):
+                self._setChannels(node,compound,transformPoint(self._vector(node,compound),freeze),False)
+            for compound, flag, value in (('translate',flags[0],0.0),('rotate',flags[1],0.0),('scale',flags[2],1.0)):
+                if flag:
+                    self._setChannels(node,compound,[value] * 3)
+    #--------------------------------------------- rigging records ---------------------------------------------#
+    def _constraint(self,kind,nodes,kwargs):
+        if _flag(kwargs,'query','q'):
+            return self._constraintQuery(kind,nodes,kwargs)
+        nodes = _flatten(nodes)
+        targets = [self._node(n) for n in nodes[:-1]]
+        driven = self._node(nodes[-1])
+        weight = float(_flag(kwargs,'weight','w',1.0))
+        const = None
+        for child in driven.children:
+            if child.type == kind:
+                const = child
+        if const is None:
+            for compound in CONSTRAINT_CHANNELS[kind]:
+                for attr in COMPOUNDS[compound]:
+                    if driven.attrs[attr].locked:
+                        raise RuntimeError('{}: \'{}.{}\' is locked, can not constrain it.'.format(kind,driven.name,attr))
+            const = self._create(kind,_flag(kwargs,'name','n','{}_{}1'.format(driven.name,kind)),driven)
+            const.data.update(targets=[],maintainOffset=[],driven=driven)
+            for compound in CONSTRAINT_CHANNELS[kind]:
+                self._connect((const,'constraint' + compound[0].upper() + compound[1:]),(driven,compound))
+            for flags in (('aimVector','aim'),('upVector','u'),('worldUpType','wut'),('worldUpVector','wu'),('worldUpObject','wuo')):
+                if _flag(kwargs,*flags) is not None:
+                    const.data[flags[0]] = _flag(kwargs,*flags)
+        for target in targets:
+            if target in const.data['targets']:
+                index = const.data['targets'].index(target)
+            else:
+                index = len(const.data['targets'])
+                const.data['targets'].append(target)
+                const.data['maintainOffset'].append(bool(_flag(kwargs,'maintainOffset','mo',False)))
+                self._connect((target,'parentMatrix'),(const,'target[{}].targetParentMatrix'.format(index)))
+            const.aliases['{}W{}'.format(target.name,index)] = 'w{}'.format(index)  #maya names the weight w0, w1 ect and aliases it after the target
+            self._attr(const,'w{}'.format(index)).value = weight
+        self._select([const])
+        return [const.name]
+    def _constraintQuery(self,kind,nodes,kwargs):
+        """Answer a constraint command in query mode, given the constraint or the node it drives (with the targets first for w)."""
+        nodes = _flatten(nodes)
+        node = self._node(nodes[-1])
+        const = node if node.type == kind else None
+        for child in node.children:
+            if child.type == kind:
+                const = child
+        if const is None:
+            raise RuntimeError('{}: No {} found on {}.'.format(kind,kind,node.name))
+        targets = const.data['targets']
+        if _flag(kwargs,'targetList','tl'):
+            return [target.name for target in targets]
+        if _flag(kwargs,'weightAliasList','wal'):
+            return ['{}W{}'.format(target.name,i) for i, target in enumerate(targets)]
+        if _flag(kwargs,'weight','w') and len(nodes) > 1:
+            target = self._node(nodes[0])
+            if target not in targets:
+                raise RuntimeError('{}: {} is not a target of {}.'.format(kind,target.name,const.name))
+            return const.attrs['w{}'.format(targets.index(target))].value
+        raise NotImplementedError('{}: query flags {} are not supported by MemoryScene, use tl, wal or a targets w'.format(
+                                  kind,sorted(k for k in kwargs if k not in ('query','q'))))
+    def parentConstraint(self,*nodes,**kwargs):
+        return self._constraint('parentConstraint',nodes,kwargs)
+    def pointConstraint(self,*nodes,**kwargs):
+        return self._constraint('pointConstraint',nodes,kwargs)
+    def orientConstraint(self,*nodes,**kwargs):
+        return self._constraint('orientConstraint',nodes,kwargs)
+    def aimConstraint(self,*nodes,**kwargs):
+        return self._constraint('aimConstraint',nodes,kwargs)
+    def scaleConstraint(self,*nodes,**kwargs):
+        return self._constraint('scaleConstraint',nodes,kwargs)
+    def skinCluster(self,*nodes,**kwargs):
+        nodes = _flatten(nodes)
+        influences = [self._node(n) for n in nodes[:-1]]
+        geometry = self._node(nodes[-1])
+        shape = geometry if geometry.type in SHAPE_TYPES else self._shapes(geometry)[0]
+        dropoff = float(_flag(kwargs,'dropoffRate','dr',4.0))
+        maxInfluences = _flag(kwargs,'maximumInfluences','mi',len(influences))
+        skin = self._create('skinCluster',_flag(kwargs,'name','n','skinCluster1'),dag=False)
+        positions = [self._worldMatrix(n)[12:15] for n in influences]
+        weights = []
+        for point in self._points(shape):  #closest distance bind, weight falls off with distance ^ dropoff
+            distances = [math.sqrt(sum((a - b) ** 2 for a, b in zip(point,p))) for p in positions]
+            if min(distances) < 1e-9:
+                row = [1.0 if d < 1e-9 else 0.0 for d in distances]
+            else:
+                row = [1.0 / d ** dropoff for d in distances]
+            keep = sorted(range(len(row)),key=lambda i: -row[i])[:maxInfluences]
+            row = [row[i] if i in keep else 0.0 for i in range(len(row))]
+            total = sum(row)
+            weights.append([w / total for w in row])
+        skin.data.update(influences=influences,geometry=shape,weights=weights)
+        for i, influence in enumerate(influences):
+            self._connect((influence,'worldMatrix'),(skin,'matrix[{}]'.format(i)))
+        self._connect((skin,'outputGeometry[0]'),(shape,'create'))
+        shape.owned.append(skin)
+        return [skin.name]
+    def skinPercent(self,skin,component,**kwargs):
+        skin = self._node(skin)
+        shape, indices = self._component(component)
+        if shape is not skin.data['geometry']:
+            raise RuntimeError('skinPercent: {} is not deformed by {}.'.format(component,skin.name))
+        if _flag(kwargs,'query','q'):
+            return list(skin.data['weights'][indices[0]])
+        for index in indices:  #transformValue is a list of (influence, weight) pairs
+            row = skin.data['weights'][index]
+            for influence, value in _flag(kwargs,'transformValue','tv',()):
+                row[skin.data['influences'].index(self._node(influence))] = float(value)
+    def cluster(self,*components,**kwargs):
+        points = []
+        shape = None
+        for component in _flatten(components):
+            shape, indices = self._component(component)
+            world = self._points(shape)
+            points.extend(world[i] for i in indices)
+        name = _flag(kwargs,'name','n','cluster1')
+        cls = self._create('cluster',name,dag=False)
+        handle = self._create('transform',cls.name + 'Handle')
+        self._addShape(handle,'clusterHandle')
+        centre = [sum(p[i] for p in points) / len(points) for i in range(3)]
+        self._setChannels(handle,'rotatePivot',centre)
+        self._setChannels(handle,'scalePivot',centre)
+        cls.data.update(geometry=shape,points=points)
+        self._connect((handle,'worldMatrix'),(cls,'matrix'))
+        handle.owned.append(cls)
+        self._select([handle])
+        return [cls.name,handle.name]
+    def ikHandle(self,**kwargs):
+        start = self._node(_flag(kwargs,'startJoint','sj'))
+        end = self._node(_flag(kwargs,'endEffector','ee'))
+        joints = [end]
+        while joints[-1] is not start:
+            if joints[-1].parent is None:
+                raise RuntimeError('ikHandle: {} is not above {} in the hierarchy.'.format(start.name,end.name))
+            joints.append(joints[-1].parent)
+        joints.reverse()
+        handle = self._create('ikHandle',_flag(kwargs,'name','n','ikHandle1'))
+        effector = self._create('ikEffector','effector1',end.parent)
+        self._setChannels(handle,'translate',self._worldMatrix(end)[12:15])
+        handle.data.update(joints=joints,solver=_flag(kwargs,'solver','sol','ikRPsolver'))
+        self._connect((start,'message'),(handle,'startJoint'))
+        self._connect((effector,'handlePath'),(handle,'endEffector'))
+        out = [handle.name,effector.name]
+        crv = _flag(kwargs,'curve','c')
+        if crv is not None:
+            crv = self._node(crv)
+            shape = crv if crv.type in SHAPE_TYPES else self._shapes(crv)[0]
+            self._connect((shape,'worldSpace'),(handle,'inCurve'))
+        elif handle.data['solver'] == 'ikSplineSolver' and _flag(kwargs,'createCurve','ccv',True):
+            out.append(self.curve(d=1,p=[self._worldMatrix(j)[12:15] for j in joints]))
+            self._connect((self._shapes(self._node(out[-1]))[0],'worldSpace'),(handle,'inCurve'))
+        self._select([handle])
+        return out
+    def setDrivenKeyframe(self,*plugs,**kwargs):
+        driver = self._plug(_flag(kwargs,'currentDriver','cd'))
+        driverValue = _flag(kwargs,'driverValue','dv',self._value(*driver))
+        count = 0
+        for plug in _flatten(plugs):
+            node, attr = self._plug(plug)
+            value = _flag(kwargs,'value','v',self._value(node,attr))
+            src = self.inputs.get((node,attr))
+            if src is not None and src[0].type.startswith('animCurve'):
+                crv = src[0]
+            else:
+                crvType = 'animCurveUA' if attr.startswith('rotate') else 'animCurveUL' if attr.startswith('translate') else 'animCurveUU'
+                crv = self._create(crvType,re.sub(r'\W','_','{}_{}'.format(node.name,attr)),dag=False)  #like maya, target[0].weight gives target_0__weight
+                crv.data['keys'] = {}
+                self._connect(driver,(crv,'input'))
+                self._connect((crv,'output'),(node,attr),True)
+            crv.data['keys'][float(driverValue)] = (float(value),_flag(kwargs,'inTangentType','itt','spline'),_flag(kwargs,'outTangentType','ott','spline'))
+            count += 1
+        return count
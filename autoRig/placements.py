@@ -0,0 +1,80 @@
+"""
+Fit rig placements that can be saved and loaded.
+
+The spine rig only needs to know where four of the fit rig nodes ended up, so once those are captured a rig can be rebuilt straight from a file.
+No fit rig is built or positioned and nothing is deleted afterwards.
+
+    import JasonWhyttes_autoRig as autoRig
+    rig = autoRig.BuildRigs('bob')
+    fitRig = rig.buildFitRig('fitRig')
+    ...line the fit rig up with the character...
+    rig.captureFitRig(fitRig,'bob_fit.json')
+    ...later, in any scene...
+    autoRig.BuildRigs('bob').buildSpineRig('mainRig','bob_fit.json',7)
+"""
+import json
+from collections import OrderedDict
+VERSION = 1  #bumped when the file layout changes
+FIT_NODES = OrderedDict([('hip',0),('chest',1),('hipPivot',5),('chestPivot',6)])  #placement : index of its node in what buildFitRig returns
+STRING_TYPES = (str,type(u''))
+class FitPlacements():
+    """world translate, rotate and scale of the fit rig nodes the spine rig is built from.
+    
+    hip, chest -- The hip and chest controls, where the spines ik controls go.
+    hipPivot, chestPivot -- The finder locators, where the joint chains start and end.
+    Each one is [translate, rotate, scale] in world space, the same as EditNodes.matchNodes returns.
+    """
+    def __init__(self,hip,chest,hipPivot,chestPivot,charName=None):
+        self.hip = hip
+        self.chest = chest
+        self.hipPivot = hipPivot
+        self.chestPivot = chestPivot
+        self.charName = charName
+    def toDict(self):
+        """Get the placements as json ready data.
+        
+        Returns:
+            OrderedDict -- 'version', 'charName' and a {'t','r','s'} dict per placement.
+        """
+        data = OrderedDict([('version',VERSION),('charName',self.charName)])
+        for name in FIT_NODES:
+            t, r, s = getattr(self,name)
+            data[name] = OrderedDict([('t',list(t)),('r',list(r)),('s',list(s))])
+        return data
+    @classmethod
+    def fromDict(cls,data):
+        """Make placements from toDict data.
+        
+        Arguments:
+            data {dict} -- The data, placements that are left out sit at the origin.
+        
+        Returns:
+            FitPlacements -- The placements.
+        """
+        if data.get('version',VERSION) > VERSION:
+            raise ValueError('fit placements version {} is newer than this auto rig supports ({})'.format(data['version'],VERSION))
+        values = []
+        for name in FIT_NODES:
+            placement = data.get(name) or {}
+            values.append([list(placement.get('t',(0,0,0))),list(placement.get('r',(0,0,0))),list(placement.get('s',(1,1,1)))])
+        return cls(*values,charName=data.get('charName'))
+    def save(self,path):
+        """Write the placements to a json file.
+        
+        Arguments:
+            path {string} -- The file to write.
+        """
+        with open(path,'w') as f:
+            json.dump(self.toDict(),f,separators=(',',':'))
+    @classmethod
+    def load(cls,path):
+        """Read placements from a json file.
+        
+        Arguments:
+            path {string} -- The file written by save.
+        
+        Returns:
+            FitPlacements -- The placements.
+        """
+        with open(path) as f:
+            return cls.fromDict(json.load(f))
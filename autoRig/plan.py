@@ -0,0 +1,201 @@
+"""
+Build plans for the spine auto rig.
+
+A plan is every step a build will take and the steps each one has to wait for, worked out before anything in the scene is touched.
+Steps refer to the nodes other steps make with a Ref, the name is filled in when the plan is run, and every Ref is a dependency.
+The plan can be described (a dry run) or run by the builders PlanExecutor, which does the steps in batches of the same kind.
+
+    import JasonWhyttes_autoRig as autoRig
+    rig = autoRig.BuildRigs('bob')
+    plan = rig.buildSpineRig('mainRig',fitRig,7,dryRun=True)  #prints what the build would do
+    for kind, steps in plan.order():
+        ...
+
+Step kinds, when steps of more than one kind are ready the one earliest in KINDS goes first:
+    create -- Make a node (or a chain of them) with a MakeNodes method, args are the method name and its arguments.
+    setAttr -- Set one attribute, args are (node, attribute, value).
+    states -- Apply locks, colors and rotation orders recorded in an AttrStates against Refs, args are (AttrStates,).
+    parent -- Parent a node, args are (child, parent). A batch is one parent command for each parent node.
+    place -- Move a node with a matrix, args are (node, matrix). A batch is one placeNodes call.
+    constraint -- Constrain a node with EditNodes.constrain, args are (channels, drivers, driven, weights, constraint mode), what it makes drives the node.
+    connect -- Connect two attributes, args are (source node, attribute, destination node, attribute).
+    key -- Set driven keys, args are (node, attribute, driver node, driver attribute, ((driver value, value), ...)). A batch sets each driver value once for every key on it.
+    call -- Anything else, args are a function and its arguments, the function is given the executor first.
+"""
+from collections import OrderedDict
+KINDS = ('create','setAttr','states','parent','place','constraint','connect','key','call')
+class Ref():
+    """a node made by a step, stands in for its name until the plan is run."""
+    def __init__(self,key,index=None):
+        self.key = key
+        self.index = index  #for steps that make a list of nodes, None is the whole list
+    def __eq__(self,other):
+        return isinstance(other,Ref) and (self.key,self.index) == (other.key,other.index)
+    def __ne__(self,other):
+        return not self == other
+    def __hash__(self):
+        return hash((self.key,self.index))
+    def __repr__(self):
+        return 'Ref({!r})'.format(self.key) if self.index is None else 'Ref({!r},{})'.format(self.key,self.index)
+    def resolve(self,results):
+        """Get the node from what the steps made so far."""
+        value = results[self.key]
+        return value if self.index is None else value[self.index]
+def refs(value):
+    """Find every Ref in a value.
+    
+    Arguments:
+        value {object} -- A Ref, or a list, tuple or dict that may hold them.
+    
+    Returns:
+        list -- The Refs found.
+    """
+    if isinstance(value,Ref):
+        return [value]
+    if isinstance(value,dict):
+        value = list(value.keys()) + list(value.values())
+    if isinstance(value,(list,tuple)):
+        found = []
+        for item in value:
+            found.extend(refs(item))
+        return found
+    return []
+def resolve(value,results):
+    """Swap every Ref in a value for the node it stands for.
+    
+    Arguments:
+        value {object} -- A Ref, or a list, tuple or dict that may hold them.
+        results {dict} -- What the steps made, by key.
+    
+    Returns:
+        object -- A copy of the value with names in place of Refs.
+    """
+    if isinstance(value,Ref):
+        return value.resolve(results)
+    if isinstance(value,dict):
+        return type(value)((resolve(k,results),resolve(v,results)) for k, v in value.items())
+    if isinstance(value,(list,tuple)):
+        return type(value)(resolve(item,results) for item in value)
+    return value
+class Step():
+    """one thing a build does, see BuildPlan.add."""
+    def __init__(self,index,kind,args,key,deps,nodes,calls,label):
+        self.index = index
+        self.kind = kind
+        self.args = args
+        self.key = key
+        self.deps = deps  #indexes of the steps this one waits for
+        self.nodes = nodes
+        self.calls = calls
+        self.label = label
+    def __repr__(self):
+        return '<Step {} {} {}>'.format(self.index,self.kind,self.label or self.key or '')
+class BuildPlan():
+    """the steps of a build and what each one waits for."""
+    def __init__(self,name=''):
+        self.name = name
+        self.steps = []
+        self.keys = {}  #result key : index of the step that makes it
+    def add(self,kind,args=(),key=None,deps=(),nodes=None,calls=1,label=None):
+        """Add a step.
+        
+        The step waits for every step whose Ref is in its args (or in the keys of a states steps AttrStates) and for the deps.
+        
+        Arguments:
+            kind {string} -- One of KINDS.
+        
+        Keyword Arguments:
+            args {tuple} -- What the step works on, see the module doc for each kind. (default: {()})
+            key {string} -- The name Refs use for what this step makes, None if nothing uses it. (default: {None})
+            deps {list} -- More steps to wait for, as Steps, Refs or keys. (default: {()})
+            nodes {dict} -- Node type : amount the step makes, for describe. (default: {None})
+            calls {int} -- Estimated scene calls the step makes, for describe. (default: {1})
+            label {string} -- A name for the step in descriptions. (default: {None})
+        
+        Returns:
+            Step -- The step.
+        """
+        if kind not in KINDS:
+            raise ValueError('unknown step kind {!r}, use one of {}'.format(kind,', '.join(KINDS)))
+        if key is not None and key in self.keys:
+            raise ValueError('a step already makes {!r}'.format(key))
+        scan = [list(states.values) + list(states.states) for states in args] if kind == 'states' else args
+        waitFor = set()
+        for dep in refs(scan) + list(deps):
+            if isinstance(dep,Step):
+                waitFor.add(dep.index)
+                continue
+            dep = dep.key if isinstance(dep,Ref) else dep
+            if dep not in self.keys:
+                raise KeyError('no step makes {!r}, add it first'.format(dep))
+            waitFor.add(self.keys[dep])
+        step = Step(len(self.steps),kind,tuple(args),key,sorted(waitFor),dict(nodes or {}),calls,label)
+        self.steps.append(step)
+        if key is not None:
+            self.keys[key] = step.index
+        return step
+    def order(self):
+        """Put the steps in batches that can be run one after the other.
+        
+        Each batch is every ready step of one kind, in the order they were added.
+        
+        Returns:
+            list -- (kind, [Step]) pairs.
+        """
+        waiting = dict((step.index,set(step.deps)) for step in self.steps)
+        users = dict((step.index,[]) for step in self.steps)
+        for step in self.steps:
+            for dep in step.deps:
+                users[dep].append(step.index)
+        ready = [step.index for step in self.steps if not step.deps]
+        batches = []
+        done = 0
+        while ready:
+            kind = min((self.steps[i].kind for i in ready),key=KINDS.index)
+            batch = sorted(i for i in ready if self.steps[i].kind == kind)
+            ready = [i for i in ready if self.steps[i].kind != kind]
+            for i in batch:
+                for user in users[i]:
+                    waiting[user].discard(i)
+                    if not waiting[user]:
+                        ready.append(user)
+            batches.append((kind,[self.steps[i] for i in batch]))
+            done += len(batch)
+        if done != len(self.steps):
+            raise ValueError('the steps of {} wait on each other: {}'.format(self.name,[self.steps[i] for i in waiting if waiting[i]]))
+        return batches
+    def batchCalls(self,kind,steps):
+        """Estimated scene calls for a batch, parent batches make one call per parent node and key batches set each driver value once."""
+        if kind == 'parent':
+            return len(set(step.args[1] for step in steps))
+        if kind == 'key':
+            drivers = OrderedDict()  #driver : [driver values, keys]
+            for step in steps:
+                driver = drivers.setdefault(step.args[2:4],[set(),0])
+                driver[0].update(value for value, key in step.args[4])
+                driver[1] += len(step.args[4])
+            return sum(len(values) + 1 + 2 * keys for values, keys in drivers.values())  #each value and putting the driver back, a setAttr and a key per key
+        return sum(step.calls for step in steps)
+    def summary(self):
+        """Count what the plan will do.
+        
+        Returns:
+            OrderedDict -- 'name', 'steps' by kind, 'batches' as (kind, steps, calls), 'nodes' by type and the estimated 'calls'.
+        """
+        steps = OrderedDict((kind,0) for kind in KINDS)
+        nodes = OrderedDict()
+        for step in self.steps:
+            steps[step.kind] += 1
+            for nodeType, amount in step.nodes.items():
+                nodes[nodeType] = nodes.get(nodeType,0) + amount
+        batches = [(kind,len(batch),self.batchCalls(kind,batch)) for kind, batch in self.order()]
+        return OrderedDict([('name',self.name),('steps',steps),('batches',batches),('nodes',nodes),('calls',sum(batch[2] for batch in batches))])
+    def describe(self):
+        """The summary as text, what a dry run prints."""
+        summary = self.summary()
+        lines = ['{}: {} steps in {} batches, about {} scene calls'.format(summary['name'],len(self.steps),len(summary['batches']),summary['calls']),
+                 '  nodes: {} ({})'.format(sum(summary['nodes'].values()),', '.join('{} {}'.format(k,v) for k, v in summary['nodes'].items())),
+                 '  steps: {}'.format(', '.join('{} {}'.format(k,v) for k, v in summary['steps'].items() if v))]
+        for i, (kind, amount, calls) in enumerate(summary['batches']):
+            lines.append('  {:>3} {:<8}{:>5} steps{:>7} calls'.format(i + 1,kind,amount,calls))
+        return '\n'.join(lines)
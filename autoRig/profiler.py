@@ -0,0 +1,185 @@
+"""
+Build profiler for the spine auto rig.
+
+Wraps the scene backend so every cmds call is timed and counted against the stage of the build it was made in.
+Stages nest, buildSpineRig is a stage and the marks inside it (plan, create, parent, chains ect) are its sub stages.
+
+    import JasonWhyttes_autoRig as autoRig
+    from autoRig.profiler import Profiler
+    prof = Profiler()
+    autoRig.setProfiler(prof)
+    ...build...
+    autoRig.setProfiler(None)
+    prof.writeReport('build.json')
+    prof.writeStacks('build.folded')  #flamegraph.pl build.folded > build.svg
+
+The report holds the wall time and call count of every stage, and the same again for each cmds function in that stage and across the whole build.
+The stack dump is in the folded format flame graph tools read, one 'stage;sub stage;cmds.function microseconds' line per stack.
+"""
+import json
+import time
+from collections import OrderedDict
+_clock = getattr(time,'perf_counter',time.time)
+class Stage():
+    """context for a stage, does nothing when there is no profiler."""
+    def __init__(self,profiler,name):
+        self.profiler = profiler
+        self.name = name
+    def __enter__(self):
+        if self.profiler is not None:
+            self.profiler.push(self.name)
+        return self
+    def __exit__(self,excType,excValue,traceback):
+        if self.profiler is not None:
+            self.profiler.pop()
+        return False
+class ProfiledBackend():
+    """stands in for a backend, timing every function called on it."""
+    def __init__(self,profiler,backend):
+        self._profiler = profiler
+        self._backend = backend
+        self._wrapped = {}
+    def __getattr__(self,name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        attr = getattr(self._backend,name)
+        if not callable(attr):
+            return attr
+        profiler = self._profiler
+        def call(*args,**kwargs):
+            start = profiler.clock()
+            try:
+                return attr(*args,**kwargs)
+            finally:
+                profiler.record(name,profiler.clock() - start)
+        self._wrapped[name] = call
+        return call
+class Profiler():
+    """records where a build spends its time.
+    
+    Time between stage changes goes to the stage that was current, so each stage holds its own time and not its sub stages.
+    """
+    def __init__(self,clock=None):
+        self.clock = clock or _clock
+        self.reset()
+    def reset(self):
+        """Forget everything recorded."""
+        self.stack = []  #[stage name, current mark] for each open stage
+        self.stages = OrderedDict()  #stage path : {'time','calls','cmds'}
+        self.cmds = OrderedDict()  #cmds function : {'calls','time'}
+        self.last = None
+        self.backend = None
+    def wrap(self,backend):
+        """Get a backend that records every call made on it.
+        
+        Arguments:
+            backend {module} -- maya.cmds or a stand in.
+        
+        Returns:
+            ProfiledBackend -- The wrapped backend.
+        """
+        self.backend = backend
+        return ProfiledBackend(self,backend)
+    def _path(self):
+        path = []
+        for name, mark in self.stack:
+            path.append(name)
+            if mark is not None:
+                path.append(mark)
+        return tuple(path)
+    def _stage(self,path):
+        stage = self.stages.get(path)
+        if stage is None:
+            stage = self.stages[path] = {'time':0.0,'calls':0,'cmds':OrderedDict()}
+        return stage
+    def _tick(self):
+        now = self.clock()
+        if self.last is not None and self.stack:
+            self._stage(self._path())['time'] += now - self.last
+        self.last = now
+    def push(self,name):
+        """Start a stage inside the current one."""
+        self._tick()
+        self.stack.append([name,None])
+    def pop(self):
+        """End the current stage."""
+        self._tick()
+        self.stack.pop()
+    def stage(self,name):
+        """A context that runs its block as a stage.
+        
+        Arguments:
+            name {string} -- The stage name.
+        
+        Returns:
+            Stage -- The context.
+        """
+        return Stage(self,name)
+    def mark(self,name):
+        """Move the current stage on to a new sub stage, it lasts until the next mark or the stage ends.
+        
+        Arguments:
+            name {string} -- The sub stage name, marks with the same name add up.
+        """
+        self._tick()
+        if self.stack:
+            self.stack[-1][1] = name
+        else:
+            self.stack.append([name,None])
+    def record(self,function,seconds):
+        """Add a cmds call to the current stage."""
+        for table in (self._stage(self._path())['cmds'],self.cmds):
+            entry = table.get(function)
+            if entry is None:
+                entry = table[function] = {'calls':0,'time':0.0}
+            entry['calls'] += 1
+            entry['time'] += seconds
+        self._stage(self._path())['calls'] += 1
+    def report(self):
+        """The recorded times and counts.
+        
+        Returns:
+            dict -- 'total' time and calls, 'stages' by path ('buildSpineRig/chains') with their own time, time including sub stages, calls and cmds, and 'cmds' for the whole build.
+        """
+        stages = OrderedDict()
+        for path, stage in self.stages.items():
+            inclusive = sum(other['time'] for otherPath, other in self.stages.items() if otherPath[:len(path)] == path)
+            stages['/'.join(path) or '-'] = OrderedDict([('time',stage['time']),('totalTime',inclusive),('calls',stage['calls']),
+                                                         ('cmds',OrderedDict((k,dict(v)) for k, v in stage['cmds'].items()))])
+        total = OrderedDict([('time',sum(stage['time'] for stage in self.stages.values())),
+                             ('calls',sum(stage['calls'] for stage in self.stages.values()))])
+        return OrderedDict([('total',total),('stages',stages),('cmds',OrderedDict((k,dict(v)) for k, v in self.cmds.items()))])
+    def writeReport(self,path):
+        """Save the report as json.
+        
+        Arguments:
+            path {string} -- The file to write.
+        """
+        with open(path,'w') as f:
+            json.dump(self.report(),f,indent=2)
+    def stacks(self):
+        """The recorded time as folded stacks.
+        
+        Returns:
+            list -- 'stage;sub stage;cmds.function microseconds' lines, a stages own python time is on its own line.
+        """
+        lines = []
+        for path, stage in self.stages.items():
+            inCmds = 0.0
+            path = path or ('-',)  #calls made outside of any stage
+            for function, entry in stage['cmds'].items():
+                lines.append('{};cmds.{} {}'.format(';'.join(path),function,int(round(entry['time'] * 1e6))))
+                inCmds += entry['time']
+            own = int(round(max(stage['time'] - inCmds,0.0) * 1e6))
+            if own:
+                lines.append('{} {}'.format(';'.join(path),own))
+        return lines
+    def writeStacks(self,path):
+        """Save the folded stacks for a flame graph.
+        
+        Arguments:
+            path {string} -- The file to write.
+        """
+        with open(path,'w') as f:
+            f.write('\n'.join(self.stacks()) + '\n')
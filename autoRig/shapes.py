@@ -0,0 +1,185 @@
+"""
+Control curve shapes for the spine auto rig.
+
+Shapes are stored as flat x,y,z float arrays and are only turned into curve data the first time the library is used, after that the data is cached.
+Studios can add their own shapes with registerShape, or from a json file with loadShapes:
+
+    {"star": {"points": [[0,0,1],[0.3,0,0.3],...], "description": "A flat star."},
+     "hoop": {"points": [...], "degree": 3, "knots": [...]}}
+
+Degree defaults to 1 and knots default to a uniform clamped knot vector for the amount of points.
+"""
+import json
+from array import array
+from collections import OrderedDict
+_BUILTIN = (  #name, help string, flat points (x,y,z, x,y,z ...), all linear curves
+    ('sh01','A standard cube.',
+        (-1.5,1.5,1.5, 1.5,1.5,1.5, 1.5,-1.5,1.5, 1.5,-1.5,-1.5, 1.5,1.5,-1.5, -1.5,1.5,-1.5, -1.5,-1.5,-1.5,
+         -1.5,-1.5,1.5, -1.5,1.5,1.5, -1.5,1.5,-1.5, -1.5,-1.5,-1.5, 1.5,-1.5,-1.5, 1.5,1.5,-1.5, 1.5,1.5,1.5,
+         1.5,-1.5,1.5, -1.5,-1.5,1.5)),
+    ('sh02','A short cube.',
+        (-4,0.2,-4, -4,-0.2,-4, 4,-0.2,-4, 4,0.2,-4, 4,0.2,4, 4,-0.2,4, -4,-0.2,4, -4,0.2,4, -4,0.2,-4,
+         -4,-0.2,-4, -4,-0.2,4, -4,0.2,4, 4,0.2,4, 4,-0.2,4, 4,-0.2,-4, 4,0.2,-4, -4,0.2,-4)),
+    ('sh03','A square Pyramid.',
+        (-1,0,-8.74228e-08, 0,2,0, 1.31134e-07,0,-1, -1,0,-8.74228e-08, -4.37114e-08,0,1, 0,2,0, 1,0,0,
+         -4.37114e-08,0,1, 0,2,0, 1.31134e-07,0,-1, 1,0,0)),
+    ('sh04','A Horse Shoe.',
+        (0.934487,1.275837,2.01658e-08, 0.932697,1.247176,-0.35686, 0.920752,1.172835,-0.686003,
+         0.891476,1.068829,-0.978435, 0.840076,0.946678,-1.231929, 0.763591,0.814991,-1.445766,
+         0.661715,0.681111,-1.621424, 0.537155,0.551427,-1.765671, 0.387617,0.433133,-1.880322,
+         0.209586,0.33878,-1.961541, 0,0.297363,-1.993747, -0.209586,0.33878,-1.961541,
+         -0.387617,0.433133,-1.880322, -0.537155,0.551427,-1.765671, -0.661715,0.681111,-1.621424,
+         -0.763591,0.814991,-1.445766, -0.840076,0.946678,-1.231929, -0.891476,1.068829,-0.978435,
+         -0.920752,1.172835,-0.686003, -0.932697,1.247176,-0.35686, -0.934487,1.275837,2.01658e-08,
+         -0.917572,1.470617,0, -0.856971,1.657129,0, -0.758916,1.826965,0, -0.627692,1.972704,0,
+         -0.469036,2.087974,0, -0.28988,2.167739,0, -0.0980551,2.208513,0, 0.0980551,2.208513,0,
+         0.28988,2.167739,0, 0.469036,2.087974,0, 0.627692,1.972704,0, 0.758916,1.826965,0,
+         0.856971,1.657129,0, 0.917572,1.470617,0, 0.934487,1.275837,2.01658e-08, 0.932697,1.247176,0.35686,
+         0.920752,1.172834,0.686003, 0.891476,1.06883,0.978435, 0.840076,0.946678,1.23193,
+         0.763591,0.814992,1.445765, 0.661715,0.68111,1.621426, 0.537155,0.55143,1.765669,
+         0.387617,0.433127,1.880326, 0.209586,0.338788,1.961536, 0,0.297318,1.993775,
+         -0.209586,0.338788,1.961536, -0.387617,0.433127,1.880326, -0.537155,0.55143,1.765669,
+         -0.661715,0.68111,1.621426, -0.763591,0.814992,1.445765, -0.840076,0.946678,1.23193,
+         -0.891476,1.06883,0.978435, -0.920752,1.172834,0.686003, -0.932697,1.247176,0.35686,
+         -0.934487,1.275837,2.01658e-08)),
+    ('sh05','A arrow in Z,Y.',
+        (0,0,4, 0,-2,1, 0,-1,1, 0,-1,-4, 0,1,-4, 0,1,1, 0,2,1, 0,0,4)),
+    ('sh06','A two point line.',
+        (0,0,0, 0,1,0)),
+    ('sh07','A Arrow',
+        (2.57253,0,0, 3.235575,0,-0.738488, 2.552484,0,-0.738488, 2,0,-0.105773, -2.457426,0,-0.102784,
+         -2,0,-1, -4,0,0, -2,0,1, -2.457426,0,0.0956313, 2,0,0.0956313, 2.552484,0,0.738488,
+         3.235575,0,0.738488, 2.57253,0,0)),
+    ('sh08','A Warped, soft square',
+        (3.9925971031188965,-0.7687759399414062,0, 3.985194206237793,-0.6989054679870605,-0.7656424641609192,
+         3.9303150177001953,-0.5181548595428467,-1.5109076499938965,
+         3.795288562774658,-0.2553844451904297,-2.2154181003570557,
+         3.553771495819092,0.03586721420288086,-2.8310279846191406,
+         3.1794209480285645,0.3020601272583008,-3.3095905780792236,
+         2.6914026737213135,0.5162158012390137,-3.6496047973632812,
+         2.108882188796997,0.6513543128967285,-3.8495688438415527,
+         1.451664686203003,0.734534740447998,-3.9495849609375,
+         0.739555299282074,0.7928156852722168,-3.9897541999816895, 0,0.8157315254211426,-3.994877576828003,
+         -0.739555299282074,0.7928156852722168,-3.9897541999816895,
+         -1.451664686203003,0.734534740447998,-3.9495849609375,
+         -2.108882188796997,0.6513543128967285,-3.8495688438415527,
+         -2.6914026737213135,0.5162158012390137,-3.6496047973632812,
+         -3.1794209480285645,0.3020601272583008,-3.3095905780792236,
+         -3.553771495819092,0.03586721420288086,-2.8310279846191406,
+         -3.795288562774658,-0.2553844451904297,-2.2154181003570557,
+         -3.9303150177001953,-0.5181548595428467,-1.5109076499938965,
+         -3.985194206237793,-0.6989054679870605,-0.7656424641609192,
+         -3.9925971031188965,-0.7687759399414062,0, -3.985194206237793,-0.6989054679870605,0.7656424641609192,
+         -3.9303150177001953,-0.5181548595428467,1.5109076499938965,
+         -3.795288562774658,-0.2553844451904297,2.2154181003570557,
+         -3.553771495819092,0.03586721420288086,2.8310279846191406,
+         -3.1794209480285645,0.3020601272583008,3.3095905780792236,
+         -2.6914026737213135,0.5162158012390137,3.6496047973632812,
+         -2.108882188796997,0.6513543128967285,3.8495688438415527,
+         -1.451664686203003,0.734534740447998,3.9495849609375,
+         -0.739555299282074,0.7928156852722168,3.9897541999816895, 0,0.8157315254211426,3.994877576828003,
+         0.739555299282074,0.7928156852722168,3.9897541999816895,
+         1.451664686203003,0.734534740447998,3.9495849609375,
+         2.108882188796997,0.6513543128967285,3.8495688438415527,
+         2.6914026737213135,0.5162158012390137,3.6496047973632812,
+         3.1794209480285645,0.3020601272583008,3.3095905780792236,
+         3.553771495819092,0.03586721420288086,2.8310279846191406,
+         3.795288562774658,-0.2553844451904297,2.2154181003570557,
+         3.9303150177001953,-0.5181548595428467,1.5109076499938965,
+         3.985194206237793,-0.6989054679870605,0.7656424641609192, 3.9925971031188965,-0.7687759399414062,0)),
+    )
+_library = None  #name : curve data, built on first use
+def _knots(count,degree):
+    """A uniform clamped knot vector, the same knots maya gives a curve made with no knots flag."""
+    if degree == 1:
+        return list(range(count))
+    spans = count - degree
+    return [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+def _curveData(points,degree,knots,description):
+    values = array('d',points)
+    if len(values) % 3 or len(values) < 6:
+        raise ValueError('Shape points need to be x,y,z values for at least 2 points.')
+    points = [tuple(values[i:i+3]) for i in range(0,len(values),3)]
+    if len(points) <= degree:
+        raise ValueError('A degree {} curve needs more than {} points.'.format(degree,degree))
+    knots = _knots(len(points),degree) if knots is None else list(knots)
+    if len(knots) != len(points) + degree - 1:  #knot range is len(cv) + d - 1
+        raise ValueError('{} points at degree {} need {} knots, got {}.'.format(len(points),degree,len(points) + degree - 1,len(knots)))
+    return {'points':points,'knots':knots,'degree':degree,'description':description}
+def _flatPoints(points):
+    flat = []
+    for point in points:
+        if isinstance(point,(list,tuple)):
+            flat.extend(point)
+        else:
+            flat.append(point)
+    return flat
+def library():
+    """The shape library, loaded the first time it is needed.
+    
+    Returns:
+        OrderedDict -- Shape name : {'points','knots','degree','description'}.
+    """
+    global _library
+    if _library is None:
+        _library = OrderedDict()
+        for name, description, points in _BUILTIN:
+            _library[name] = _curveData(points,1,None,description)
+    return _library
+def registerShape(name,points,degree=1,knots=None,description='',replace=False):
+    """Add a shape to the library.
+    
+    Arguments:
+        name {string} -- The name createCurve uses for the shape.
+        points {list} -- The cvs, either (x,y,z) points or a flat list of x,y,z values.
+    
+    Keyword Arguments:
+        degree {int} -- The curve degree. (default: {1})
+        knots {list} -- The knot vector, worked out when not given. (default: {None})
+        description {string} -- The help string for the shape. (default: {''})
+        replace {bool} -- Allow an existing shape to be replaced. (default: {False})
+    
+    Returns:
+        string -- The shape name.
+    """
+    shapes = library()
+    if name in shapes and not replace:
+        raise ValueError('Shape "{}" already exists, use replace=True to overwrite it.'.format(name))
+    shapes[name] = _curveData(_flatPoints(points),int(degree),knots,description)
+    return name
+def loadShapes(path,replace=False):
+    """Register every shape in a json file.
+    
+    Arguments:
+        path {string} -- The json file, see the module docstring for the layout.
+    
+    Keyword Arguments:
+        replace {bool} -- Allow shapes in the file to replace existing ones. (default: {False})
+    
+    Returns:
+        list -- The names of the shapes registered.
+    """
+    with open(path) as f:
+        data = json.load(f,object_pairs_hook=OrderedDict)
+    names = []
+    for name in data:
+        shape = data[name]
+        names.append(registerShape(name,shape['points'],shape.get('degree',1),shape.get('knots'),shape.get('description',''),replace))
+    return names
+def getShape(name):
+    """Get the curve data for a shape.
+    
+    Arguments:
+        name {string} -- The shape name.
+    
+    Returns:
+        dict -- {'points','knots','degree','description'}, None if there is no shape with that name.
+    """
+    return library().get(name)
+def availableShapes():
+    """The shape names and their help strings.
+    
+    Returns:
+        OrderedDict -- Shape name : description.
+    """
+    return OrderedDict((name,shape['description']) for name, shape in library().items())
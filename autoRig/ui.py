@@ -0,0 +1,191 @@
+"""
+The spine auto rig window, only imported when the window is shown so the builder itself needs no Qt.
+
+    import JasonWhyttes_autoRig as autoRig
+    autoRig.showWindow()
+"""
+import sys
+import traceback
+from maya import OpenMayaUI
+from shiboken2 import wrapInstance
+from PySide2.QtCore import QTimer, Qt
+from PySide2.QtWidgets import (QLineEdit, QPushButton, QApplication, QWidget,
+    QVBoxLayout, QDialog, QLabel, QProgressBar)
+import JasonWhyttes_autoRig as spineRig
+def maya_main_window():
+    """gets the main window in maya
+    
+    returns the main window for maya so we can parent our gui to it
+    
+    Returns:
+        class -- Maya main window
+    """
+    main_window_ptr=OpenMayaUI.MQtUtil.mainWindow()
+    return wrapInstance(int(main_window_ptr), QWidget)  #return mayas main window
+class Window(QDialog):
+    def __init__(self, parent=None):
+        """Build the GUI.
+        
+        A gui with a build fit button, amount of joints text field, a build spine rig button and the builds progress.
+        Spine rigs are built a piece at a time from a timer (see BuildJob) so the gui keeps drawing and the build can be cancelled.
+        The builds undo chunk stays open between pieces, anything else done to the scene meanwhile would be folded into it and rolled back with it,
+        so the window is application modal while a build runs and closing it cancels the build.
+        
+        Keyword Arguments:
+            parent {QWidget} -- The window to parent to, mayas main window if not given. (default: {None})
+        """
+        if parent is None:
+            parent = maya_main_window()
+        super(Window, self).__init__(parent)  #parent the gui to mayas main window so it stays ontop
+        self.runName = 0
+        self.amount = 0
+        self.runFit = 0
+        res = QApplication.desktop().screenGeometry()  #get desktop size
+        screenWidth, screenHeight, windowWidth, windowHeight = res.width(), res.height(), 400, 100  #position in middle of screen with 400,100 res
+        self.setGeometry(screenWidth//2 - windowWidth, screenHeight//2 - windowHeight, windowWidth, windowHeight)
+        self.characterName = ''  #the text of the name field
+        self.nameInput = QLineEdit('Enter Characters Name')  #character name input field
+        self.fitRigBtn = QPushButton("Create Fit Rig")  #create fit rig button
+        self.amountInput = QLineEdit('Amount Of Joints')  #amount of joints input field
+        self.rigBtn = QPushButton("Create Rig")  #create rig button
+        self.progressBar = QProgressBar()  #batches of the build done
+        self.stageLabel = QLabel('')  #the stage being built, then the summary
+        self.cancelBtn = QPushButton("Cancel")  #cancel and roll back the build
+        self.cancelBtn.setEnabled(False)
+        self.job = None  #the build running, see BuildJob
+        self.buildTimer = QTimer(self)  #runs a piece of the build each time the event loop is free
+        self.buildTimer.setInterval(0)
+        layout = QVBoxLayout()  #layout
+        layout.addWidget(self.nameInput)
+        layout.addWidget(self.fitRigBtn)
+        layout.addWidget(self.amountInput)
+        layout.addWidget(self.rigBtn)
+        layout.addWidget(self.progressBar)
+        layout.addWidget(self.stageLabel)
+        layout.addWidget(self.cancelBtn)
+        self.setLayout(layout)
+        self.fitRigBtn.clicked.connect(self.fitRig)  #connect buttons to functions
+        self.rigBtn.clicked.connect(self.rig)
+        self.cancelBtn.clicked.connect(self.cancelRig)
+        self.buildTimer.timeout.connect(self.rigStep)
+        self.destroyed.connect(self.stopRig)  #a window deleted mid build doesn't leave its session open, does nothing without a build
+        self.amountInput.textChanged.connect(self.jntAmount)
+        self.nameInput.textChanged.connect(self.charName)
+    def charName(self):
+        """Character name input field.
+        
+        Get the characters name.
+        """
+        sender = self.sender()
+        self.characterName = sender.text()  #get the text entered into the field
+        try:
+            (int(self.characterName))  #see if we can convert the first character to int, we dont want this
+            self.runName = 0  #dont allow the fit rig to be built
+            #self.characterName.setStyleSheet("color: red;")  #change field color to red
+        except ValueError:
+            self.runName = 1  #allow the fit rig to be built
+    def jntAmount(self):
+        """Joint amount input field.
+        
+        Get the amount text field.
+        """
+        sender = self.sender()
+        try:
+            self.amount = max(int(sender.text()),0)  #get the text entered into the field and try to convert to int
+        except ValueError:
+            self.amount = 0  #otherwise just use 0 as the usage says
+    def fitRig(self):
+        """Build Fit Rig.
+
+        Command ran to build fit rig and send data to spine rig function.
+
+        """
+        if self.runName == 1:  #if a character name is added
+            self._rig = spineRig.BuildRigs(self.characterName)  #build the fit rig using that name
+            self.fitRigBuild = self._rig.buildFitRig('fitRig')
+            self.runFit = 1  #allow the spine rig to be built
+        else:
+            self.runFit = 0  #dont allow the spine rig to be built
+    def rig(self):
+        """Build spine rig.
+        
+        Command ran to build spine rig, starts the build and leaves the timer to run it.
+        """
+        if self.runFit != 1 or self.job is not None:  #the fit rig wasn't built or a build is already running
+            return
+        try:
+            self.job = self._rig.spineRigJob('mainRig',self.fitRigBuild,self.amount,countNodes=True)  #plan the spine rig
+        except Exception as e:
+            self.stageLabel.setText('Could not plan the rig: {}'.format(e))
+            traceback.print_exc()
+            return
+        self.progressBar.setValue(0)
+        self.stageLabel.setText('Starting')
+        self.setBuilding(True)
+        self.buildTimer.start()
+    def rigStep(self):
+        """Run the next piece of the build and show how far it has got."""
+        try:
+            more = self.job.step()
+        except Exception:
+            traceback.print_exc()  #the whole error goes to the script editor
+            self.endRig()
+            return
+        self.progressBar.setMaximum(self.job.total)
+        self.progressBar.setValue(self.job.done)
+        self.stageLabel.setText('Building {} ({}/{})'.format(self.job.stage,self.job.done + 1,self.job.total))
+        if not more:
+            self.runFit = 0  #since fit rig is deleted we disable the ability to build more spine rigs until its created again
+            self.endRig()
+    def cancelRig(self):
+        """Stop the build, everything it made is rolled back."""
+        if self.job is not None:
+            self.job.cancel()
+            self.endRig()
+    def stopRig(self):
+        """Cancel a running build without updating the gui, for when the window is going."""
+        self.buildTimer.stop()
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.setWindowModality(Qt.NonModal)  #takes effect the next time the window is shown
+    def closeEvent(self,event):
+        """Cancel a running build before the window closes, its undo chunk is closed and everything it made is rolled back."""
+        self.stopRig()
+        super(Window, self).closeEvent(event)
+    def done(self,result):
+        """Cancel a running build when the window is accepted or rejected (escape), see closeEvent."""
+        self.stopRig()
+        super(Window, self).done(result)
+    def endRig(self):
+        """Stop the timer and show the builds summary."""
+        self.buildTimer.stop()
+        self.stageLabel.setText(self.job.summary())
+        if self.job.status == 'finished':
+            self.progressBar.setValue(self.progressBar.maximum())
+        else:
+            self.progressBar.setValue(0)
+        self.job = None
+        self.setBuilding(False)
+    def setBuilding(self,building):
+        """Only allow cancel while a build runs, everything else (maya included) waits for it."""
+        for widget in (self.nameInput,self.fitRigBtn,self.amountInput,self.rigBtn):
+            widget.setEnabled(not building)
+        self.cancelBtn.setEnabled(building)
+        visible = self.isVisible()
+        if visible:  #modality only changes while the window is hidden
+            self.hide()
+        self.setWindowModality(Qt.ApplicationModal if building else Qt.NonModal)
+        if visible:
+            self.show()
+def show():
+    """Show the window, making the Qt application first when there isn't one.
+    
+    Returns:
+        Window -- The window.
+    """
+    if not QApplication.instance():  #Create the Qt Application
+        QApplication(sys.argv)
+    window = Window()  #Create and show the form
+    window.show()
+    return window
@@ -0,0 +1,46 @@
+"""
+The batch builder, a worker per character on the in memory scene.
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autoRig import batch
+buildCharacter = batch.buildCharacter
+def crashOrBuild(job):
+    """Die without a result for 'crash', hang for 'hang', build anything else."""
+    if job[0]['name'] == 'crash':
+        os._exit(3)
+    if job[0]['name'] == 'hang':
+        time.sleep(60)
+    return buildCharacter(job)
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+    def tearDown(self):
+        batch.buildCharacter = buildCharacter
+        shutil.rmtree(self.output)
+    def test_bad_character(self):
+        results = batch.run([{'name':'bob','jointAmount':5},{'name':'tom'}],self.output,2,'memory')
+        self.assertEqual([result['status'] for result in results],['ok','failed'])
+        self.assertTrue(os.path.exists(results[0]['output']))
+        self.assertIn('KeyError',results[1]['error'])
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork','the patched worker only reaches forked processes')
+    def test_dead_worker(self):
+        batch.buildCharacter = crashOrBuild
+        results = batch.run([{'name':'crash','jointAmount':5},{'name':'bob','jointAmount':5}],self.output,1,'memory')  #the crash doesn't take the next job with it
+        self.assertEqual([result['status'] for result in results],['failed','ok'])
+        self.assertIn('exited with code 3',results[0]['error'])
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork','the patched worker only reaches forked processes')
+    def test_timeout(self):
+        batch.buildCharacter = crashOrBuild
+        start = time.time()
+        results = batch.run([{'name':'hang','jointAmount':5},{'name':'bob','jointAmount':5}],self.output,2,'memory',timeout=2)
+        self.assertEqual([result['status'] for result in results],['failed','ok'])
+        self.assertLess(time.time() - start,30)
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+The builders helpers against the in memory scene.
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig.memoryScene import MemoryScene
+class SceneTest(unittest.TestCase):
+    """a fresh memory scene as the backend for every test."""
+    def setUp(self):
+        self.scene = MemoryScene()
+        spineRig.setBackend(self.scene)
+    def tearDown(self):
+        spineRig.setBackend(spineRig.MayaBackend())
+class NameRegistryTest(SceneTest):
+    def test_existing_names(self):
+        for name in ('bob_hip_ctrl_01','bob_hip_ctrl_03','bob_hip_ctrl_01_A','bob_hip_ctrl_007'):
+            self.scene.createNode('transform',n=name)
+        self.scene.createNode('transform',n='bob_hip_ctrl_05',p=self.scene.createNode('transform',n='grp'))
+        queries = []
+        ls = self.scene.ls
+        self.scene.ls = lambda *args, **kwargs: queries.append(args) or ls(*args,**kwargs)
+        names = spineRig.NameRegistry()
+        self.assertEqual(spineRig.checkExists('bob_hip_ctrl'),'bob_hip_ctrl_02')
+        self.assertEqual([names.name('bob_hip_ctrl') for i in range(4)],['bob_hip_ctrl_02','bob_hip_ctrl_04','bob_hip_ctrl_06','bob_hip_ctrl_07'])  #_01_A and _007 aren't this schemes names
+        self.assertEqual(names.name('bob_chest_ctrl'),'bob_chest_ctrl_01')
+        self.assertEqual(len(queries),2)  #one wildcard query per prefix
+class AttrStatesTest(SceneTest):
+    def test_batching(self):
+        node = self.scene.createNode('transform',n='ctrl')
+        states = spineRig.AttrStates()
+        states.setState(node,['tx','ty'],lock=True,keyable=False)
+        states.setState(node,['tx'],lock=True,keyable=False)  #the same again
+        states.setState(node,['ty'],lock=False,keyable=True,channelBox=True)  #replaces the first, keyable after unlocking
+        states.setValue(node,'rotateOrder',2)
+        states.setValue(node,'rotateOrder',3)
+        self.assertEqual(states.calls(),4)
+        report = states.apply()
+        self.assertEqual(report,{'requested':6,'applied':3,'skipped':3,'setAttr':4})
+        self.assertEqual(self.scene.getAttr(node + '.rotateOrder'),3)
+        self.assertEqual((self.scene.getAttr(node + '.tx',l=1),self.scene.getAttr(node + '.tx',k=1)),(True,False))
+        self.assertEqual((self.scene.getAttr(node + '.ty',l=1),self.scene.getAttr(node + '.ty',k=1)),(False,True))
+        self.assertEqual(states.calls(),0)  #applied states are forgotten, the report keeps counting
+        states.setState(node,['tz'],lock=True)
+        self.assertEqual(states.apply()['applied'],4)
+class BuildSessionTest(SceneTest):
+    def setUp(self):
+        super(BuildSessionTest,self).setUp()
+        self.keep = self.scene.createNode('transform',n='keep')
+        self.scene.select(self.keep)
+    def build(self):
+        grp = self.scene.createNode('transform',n='grp')
+        self.scene.createNode('transform',n='child',p=self.keep)
+        self.scene.createNode('joint',n='jnt',p=grp)
+        spineRig.clearSelection()  #left to the session
+        self.assertTrue(self.scene.refreshSuspended)
+    def test_rollback(self):
+        def fail():
+            with spineRig.BuildSession('outer'):
+                with spineRig.BuildSession('inner'):
+                    self.build()
+                    raise RuntimeError('bad build')
+        self.assertRaises(RuntimeError,fail)
+        self.assertEqual(sorted(self.scene.nodes),['keep'])  #everything made is gone, what was there stays
+        self.assertEqual(self.scene.ls(sl=1),['keep'])  #and the selection is back
+        self.assertFalse(self.scene.refreshSuspended)
+        self.assertEqual(spineRig.BuildSession.active,0)
+    def test_finish(self):
+        with spineRig.BuildSession('build'):
+            self.build()
+        self.assertEqual(sorted(self.scene.nodes),['child','grp','jnt','keep'])
+        self.assertEqual(self.scene.ls(sl=1),[])  #builds finish with nothing selected
+        self.assertFalse(self.scene.refreshSuspended)
+class BuildJobTest(SceneTest):
+    def setUp(self):
+        super(BuildJobTest,self).setUp()
+        self.rig = spineRig.BuildRigs('bob')
+        self.fitRig = self.rig.buildFitRig('fitRig')
+        self.before = sorted(self.scene.nodes)
+    def test_cancel(self):
+        job = self.rig.spineRigJob('mainRig',self.fitRig,5)
+        for i in range(10):  #part way through
+            self.assertTrue(job.step())
+        self.assertEqual(job.status,'running')
+        self.assertGreater(len(self.scene.nodes),len(self.before))
+        job.cancel()
+        self.assertEqual(job.status,'cancelled')
+        self.assertFalse(job.step())
+        self.assertEqual(sorted(self.scene.nodes),self.before)  #everything it made is rolled back, the fit rig is still there
+        self.assertEqual(spineRig.BuildSession.active,0)
+        self.assertIsNone(spineRig.NodeHandle.paths)
+    def test_cancel_waiting(self):
+        job = self.rig.spineRigJob('mainRig',self.fitRig,5)
+        job.cancel()
+        self.assertEqual(job.status,'cancelled')
+        self.assertFalse(job.step())
+        self.assertEqual(sorted(self.scene.nodes),self.before)
+    def test_failure(self):
+        job = self.rig.spineRigJob('mainRig',self.fitRig,5)
+        for i in range(4):
+            job.step()
+        self.scene.delete(str(self.fitRig.rootGrp))  #the fit rig is deleted at the end of the build, too soon
+        self.assertRaises(Exception,job.run)
+        self.assertEqual(job.status,'failed')
+        self.assertEqual(sorted(self.scene.nodes),[])  #the build is rolled back, only the deletion stays
+class NodeHandleTest(SceneTest):
+    def test_rename(self):
+        handle = spineRig.NodeHandle.fromName(self.scene.createNode('transform',n='a'))
+        self.scene.rename('a','b')
+        self.assertEqual(str(handle),'|b')
+        self.assertEqual(handle.name,'b')
+    def test_reparent(self):
+        with spineRig.BuildSession('test'):
+            a = spineRig.NodeHandle.atWorld(self.scene.createNode('transform',n='a'))
+            b = a.child(self.scene.createNode('transform',n='b',p=str(a)))
+            ab = spineRig.NodeHandle.atWorld(self.scene.createNode('transform',n='ab'))  #shares a prefix with a, isn't under it
+            c = spineRig.NodeHandle.atWorld(self.scene.createNode('transform',n='c'))
+            spineRig.reparent([a],c)
+            self.assertEqual((a.path,b.path,ab.path),('|c|a','|c|a|b','|ab'))  #cached, nothing is looked up in the session
+            spineRig.reparent([b],ab)
+            self.assertEqual(b.path,'|ab|b')
+            self.assertEqual(self.scene.ls(b.path,long=1),['|ab|b'])
+        self.scene.parent('|ab|b','|c')
+        self.scene.rename('|c|b','d')
+        self.assertEqual(b.path,'|c|d')  #after the session the uuid finds it
+    def test_reparent_outside_session(self):
+        makeNodes = spineRig.MakeNodes()
+        a, b, c = [makeNodes.createGrp('bob',key,'grp') for key in 'abc']
+        spineRig.reparent([b],a)
+        spineRig.reparent([c],b)
+        self.assertEqual(c.path,'|bob_a_grp_01|bob_b_grp_01|bob_c_grp_01')
+    def test_earlier_session(self):
+        with spineRig.BuildSession('first'):
+            a = spineRig.NodeHandle.atWorld(self.scene.createNode('transform',n='a'))
+        self.scene.rename('a','b')  #moved outside of any session
+        with spineRig.BuildSession('second'):
+            c = spineRig.NodeHandle.atWorld(self.scene.createNode('transform',n='c'))
+            self.assertEqual(a.path,'|b')
+            spineRig.reparent([a],c)
+            self.assertEqual(a.path,'|c|b')
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Whole chain frames, numpy against the pure python maths.
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autoRig import frames, geometry
+try:
+    import numpy
+except ImportError:
+    numpy = None
+HIP = [[0.0,9.0,0.0],[10.0,-20.0,5.0]]  #translation and rotation, as matchNodes gives them
+CHEST = [[1.0,14.0,2.0],[-30.0,15.0,40.0]]
+@unittest.skipIf(numpy is None,'numpy is not installed')
+class NumpyParityTest(unittest.TestCase):
+    def setUp(self):
+        self.previous = frames.useNumpy(True)
+    def tearDown(self):
+        frames.useNumpy(self.previous)
+    def both(self,function,*args,**kwargs):
+        """What a function gives with numpy and without."""
+        frames.useNumpy(True)
+        batched = function(*args,**kwargs)
+        frames.useNumpy(False)
+        pure = function(*args,**kwargs)
+        return batched, pure
+    def assertSame(self,a,b,places=6):
+        if isinstance(a,(list,tuple)):
+            self.assertEqual(len(a),len(b))
+            for x, y in zip(a,b):
+                self.assertSame(x,y,places)
+        else:
+            self.assertAlmostEqual(a,b,places)
+    def test_chain_frames(self):
+        curve = geometry.curvePositions(geometry.curveTable(geometry.spineCurve(HIP,CHEST)),40,'curvature')
+        for aim, up in (('y','z'),('x','y'),('z','x'),('y','y')):
+            for parented in (False,True):
+                for positions in (None,curve):
+                    if aim == up:
+                        self.assertRaises(ValueError,frames.chainFrames,HIP,CHEST,40,aim,up)
+                        continue
+                    batched, pure = self.both(frames.chainFrames,HIP,CHEST,40,aim,up,parented,positions)
+                    self.assertSame(list(batched),list(pure))
+    def test_straight_up(self):
+        start = [[0.0,0.0,0.0],[0.0,0.0,0.0]]
+        end = [[0.0,0.0,5.0],[0.0,0.0,0.0]]
+        batched, pure = self.both(frames.chainFrames,start,end,20,'y','z',True)  #the chain runs along the starts up axis, the other axis is used
+        self.assertSame(list(batched),list(pure))
+    def test_placement_matrices(self):
+        placements = [[[i,2.0 * i,-i],[i * 7.0,-i * 3.0,i * 11.0],[1.0,1.0 + i / 10.0,1.0]] for i in range(frames.NUMPY_FROM)]
+        for order in range(6):
+            batched, pure = self.both(frames.placementMatrices,placements,order)
+            self.assertSame(batched,pure)
+    def test_short_chains(self):
+        self.assertFalse(frames._batched(frames.NUMPY_FROM - 1))  #short chains never use numpy
+        self.assertTrue(frames._batched(frames.NUMPY_FROM))
+        frames.useNumpy(False)
+        self.assertFalse(frames._batched(frames.NUMPY_FROM))
+        self.assertFalse(frames.useNumpy(True))
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+The pure python curve and chain maths.
+"""
+import math
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autoRig import geometry
+def curvePoint(points,knots,t):
+    """A point on an open cubic in the circle commands knot form."""
+    full = [knots[0]] + list(knots) + [knots[-1]]
+    return [sum(geometry._basis(full,i,t) * p[a] for i, p in enumerate(points)) for a in range(3)]
+class CirclePointsTest(unittest.TestCase):
+    def test_circle(self):
+        points, knots, periodic = geometry.circlePoints(2.0,8,360,3,(0,1,0))
+        self.assertTrue(periodic)
+        self.assertEqual(len(points),11)
+        self.assertEqual(points[:3],points[-3:])
+        self.assertEqual(knots,list(range(-2,11)))
+    def test_arc(self):
+        points, knots, periodic = geometry.circlePoints(2.0,8,180,3,(0,1,0))  #what the circle command makes, 11 cvs and 8 spans
+        self.assertFalse(periodic)
+        self.assertEqual(len(points),11)
+        self.assertEqual(knots,[0,0,0,1,2,3,4,5,6,7,8,8,8])
+        for a, b in zip(points[0],(0,0,2)):  #starts on the axis
+            self.assertAlmostEqual(a,b,9)
+        for a, b in zip(points[-1],(0,0,-2)):
+            self.assertAlmostEqual(a,b,9)
+        for i in range(81):
+            p = curvePoint(points,knots,min(i / 10.0,8 - 1e-9))
+            self.assertAlmostEqual(math.sqrt(p[0] ** 2 + p[2] ** 2),2.0,3)
+            self.assertAlmostEqual(p[1],0.0,9)
+    def test_linear_arc(self):
+        points, knots, periodic = geometry.circlePoints(1.0,4,90,1)
+        self.assertEqual(len(points),5)
+        self.assertEqual(knots,[0,1,2,3,4])
+        self.assertRaises(ValueError,geometry.circlePoints,1.0,4,90,2)
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+"""
+The in memory scene answering the maya.cmds calls the builder and tools make.
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autoRig.memoryScene import MemoryScene
+class ConstraintQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.scene = MemoryScene()
+        self.ctrlA = self.scene.createNode('transform',n='ctrlA')
+        self.ctrlB = self.scene.createNode('transform',n='ctrlB')
+        self.joint = self.scene.createNode('joint',n='jnt')
+        self.scene.orientConstraint(self.ctrlA,self.joint,w=.25,mo=1)
+        self.const = self.scene.orientConstraint(self.ctrlB,self.joint,w=.75,mo=1)[0]
+    def test_target_list(self):
+        self.assertEqual(self.scene.orientConstraint(self.const,q=1,tl=1),['ctrlA','ctrlB'])
+        self.assertEqual(self.scene.orientConstraint(self.joint,query=True,targetList=True),['ctrlA','ctrlB'])  #the constrained node works too
+    def test_weight_alias_list(self):
+        aliases = self.scene.orientConstraint(self.const,q=1,wal=1)
+        self.assertEqual(aliases,['ctrlAW0','ctrlBW1'])
+        self.assertEqual([self.scene.getAttr('{}.{}'.format(self.const,alias)) for alias in aliases],[.25,.75])
+    def test_weight(self):
+        self.assertEqual(self.scene.orientConstraint(self.ctrlB,self.const,q=1,w=1),.75)
+    def test_unsupported(self):
+        self.assertRaises(NotImplementedError,self.scene.orientConstraint,self.const,q=1,mo=1)
+        self.assertRaises(RuntimeError,self.scene.parentConstraint,self.joint,q=1,tl=1)
+if __name__ == '__main__':
+    unittest.main()
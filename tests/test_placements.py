@@ -0,0 +1,47 @@
+"""
+Fit rig placements saved to a file and spine rigs built from them.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig.memoryScene import MemoryScene
+from autoRig.placements import FitPlacements
+class FitPlacementsTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder,'bob_fit.json')
+        self.scene = MemoryScene()
+        spineRig.setBackend(self.scene)
+        self.rig = spineRig.BuildRigs('bob')
+        self.fitRig = self.rig.buildFitRig('fitRig')
+        self.scene.xform(str(self.fitRig.chestCtrl),t=(0,3,1))
+        self.scene.xform(str(self.fitRig.hipCtrl),t=(0,-1,0))
+    def tearDown(self):
+        spineRig.setBackend(spineRig.MayaBackend())
+        shutil.rmtree(self.folder)
+    def test_round_trip(self):
+        fit = self.rig.captureFitRig(self.fitRig,self.path)
+        loaded = FitPlacements.load(self.path)
+        self.assertEqual(loaded.toDict(),fit.toDict())
+        self.assertEqual(loaded.charName,'bob')
+        with open(self.path,'w') as f:
+            json.dump(dict(fit.toDict(),version=99),f)
+        self.assertRaises(ValueError,FitPlacements.load,self.path)
+    def test_build_from_file(self):
+        self.rig.captureFitRig(self.fitRig,self.path)
+        self.rig.buildSpineRig('mainRig',self.fitRig,5)  #deletes the fit rig
+        scene = MemoryScene()  #no fit rig at all
+        spineRig.setBackend(scene)
+        spineRig.BuildRigs('bob').buildSpineRig('mainRig',self.path,5)
+        self.assertEqual(sorted(scene.nodes),sorted(self.scene.nodes))
+        for node in scene.nodes:
+            if scene.nodes[node].dag:
+                for a, b in zip(scene.xform(node,q=1,m=1,ws=1),self.scene.xform(node,q=1,m=1,ws=1)):
+                    self.assertAlmostEqual(a,b,6,node)
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Build plans, their batches and running them against the in memory scene.
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig.memoryScene import MemoryScene
+from autoRig.plan import BuildPlan, Ref
+def groups(plan,*keys):
+    """Add a create step per key, each making a group."""
+    return [plan.add('create',('createGrp','bob',key,'grp'),key,nodes={'transform':1},calls=2) for key in keys]
+class BuildPlanTest(unittest.TestCase):
+    def test_order(self):
+        plan = BuildPlan('test')
+        groups(plan,'a','b')
+        plan.add('parent',(Ref('b'),Ref('a')))
+        plan.add('setAttr',(Ref('a'),'visibility',0))
+        groups(plan,'c')
+        plan.add('parent',(Ref('c'),Ref('a')))
+        self.assertEqual([(kind,[step.index for step in steps]) for kind, steps in plan.order()],
+                         [('create',[0,1,4]),('setAttr',[3]),('parent',[2,5])])  #ready steps of a kind go together
+        summary = plan.summary()
+        self.assertEqual(summary['nodes'],{'transform':3})
+        self.assertEqual(summary['calls'],8)  #both parents go under a, one parent command
+    def test_bad_steps(self):
+        plan = BuildPlan('test')
+        self.assertRaises(ValueError,plan.add,'delete',('a',))
+        self.assertRaises(KeyError,plan.add,'parent',(Ref('a'),Ref('b')))
+        groups(plan,'a')
+        self.assertRaises(ValueError,groups,plan,'a')  #a key is made once
+    def test_cycle(self):
+        plan = BuildPlan('test')
+        groups(plan,'a','b')
+        first = plan.add('setAttr',(Ref('a'),'visibility',0))
+        second = plan.add('setAttr',(Ref('b'),'visibility',0),deps=[first])
+        first.deps.append(second.index)  #steps can only wait on earlier ones through add, so tie the knot by hand
+        with self.assertRaises(ValueError) as raised:
+            plan.order()
+        self.assertIn('wait on each other',str(raised.exception))
+class PlanExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.scene = MemoryScene()
+        spineRig.setBackend(self.scene)
+    def tearDown(self):
+        spineRig.setBackend(spineRig.MayaBackend())
+    def test_run(self):
+        plan = BuildPlan('test')
+        groups(plan,'a','b','c')
+        plan.add('parent',(Ref('b'),Ref('a')))
+        plan.add('parent',(Ref('c'),Ref('b')))
+        plan.add('setAttr',(Ref('c'),'visibility',0))
+        with spineRig.BuildSession('test'):  #as BuildJob runs it
+            results = spineRig.PlanExecutor().run(plan)
+        self.assertEqual(str(results['c']),'|bob_a_grp_01|bob_b_grp_01|bob_c_grp_01')
+        self.assertEqual(self.scene.getAttr('bob_c_grp_01.visibility'),0)
+    def test_keys(self):
+        plan = BuildPlan('test')
+        groups(plan,'a','b')
+        plan.add('key',(Ref('b'),'sy',Ref('a'),'tx',((0,1),(1,2))),nodes={'animCurveUU':1})
+        plan.add('key',(Ref('b'),'visibility',Ref('a'),'tx',((0,1),(1,0))),nodes={'animCurveUU':1})
+        self.assertEqual(plan.summary()['batches'][-1],('key',2,11))  #each driver value set once, a setAttr and a key per key, the driver put back
+        with spineRig.BuildSession('test'):
+            spineRig.PlanExecutor().run(plan)
+        self.assertEqual(self.scene.ls(type='animCurveUU'),['bob_b_grp_01_scaleY','bob_b_grp_01_visibility'])
+        self.scene.setAttr('bob_a_grp_01.tx',1)
+        self.assertEqual((self.scene.getAttr('bob_b_grp_01.sy'),self.scene.getAttr('bob_b_grp_01.visibility')),(2,0))
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+The build profiler, its report and folded stacks.
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig.memoryScene import MemoryScene
+from autoRig.profiler import Profiler
+class Clock():
+    """a clock that only moves when told to."""
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+class Backend():
+    """a backend whose one command takes as long as it is asked to."""
+    def __init__(self,clock):
+        self.clock = clock
+    def work(self,seconds):
+        self.clock.now += seconds
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.profiler = Profiler(self.clock)
+        backend = self.profiler.wrap(Backend(self.clock))
+        with self.profiler.stage('build'):
+            self.clock.now += 1  #python time in build
+            backend.work(2)
+            self.profiler.mark('chains')
+            backend.work(3)
+            self.clock.now += 1
+        backend.work(1)  #outside of any stage
+    def test_report(self):
+        report = self.profiler.report()
+        self.assertEqual(dict(report['total']),{'time':7.0,'calls':3})
+        self.assertEqual(list(report['stages']),['build','build/chains','-'])
+        build = report['stages']['build']
+        self.assertEqual((build['time'],build['totalTime'],build['calls']),(3.0,7.0,1))  #its own time, and with its marks
+        self.assertEqual(build['cmds'],{'work':{'calls':1,'time':2.0}})
+        self.assertEqual(report['stages']['build/chains']['time'],4.0)
+        self.assertEqual(report['cmds'],{'work':{'calls':3,'time':6.0}})
+    def test_stacks(self):
+        self.assertEqual(self.profiler.stacks(),['build;cmds.work 2000000','build 1000000',
+                                                 'build;chains;cmds.work 3000000','build;chains 1000000',
+                                                 '-;cmds.work 1000000'])  #no line for a stage with no time of its own
+    def test_build(self):
+        scene = MemoryScene()
+        spineRig.setBackend(scene)
+        try:
+            rig = spineRig.BuildRigs('bob')
+            fitRig = rig.buildFitRig('fitRig')
+            profiler = Profiler()
+            self.assertIsNone(spineRig.setProfiler(profiler))
+            rig.buildSpineRig('mainRig',fitRig,5)
+            self.assertIs(spineRig.setProfiler(None),profiler)
+            self.assertIs(spineRig.cmds,scene)  #the backend is put back
+            report = profiler.report()
+            self.assertTrue(all(path.startswith('buildSpineRig') for path in report['stages']))
+            self.assertEqual(report['total']['calls'],sum(entry['calls'] for entry in report['cmds'].values()))
+        finally:
+            spineRig.setProfiler(None)
+            spineRig.setBackend(spineRig.MayaBackend())
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+The control shape library, registering shapes and building them in the in memory scene.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig import shapes
+from autoRig.memoryScene import MemoryScene
+STAR = [[0,0,1],[0.3,0,0.3],[1,0,0],[0.3,0,-0.3],[0,0,-1],[-0.3,0,-0.3],[-1,0,0],[-0.3,0,0.3],[0,0,1]]
+class ShapesTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+    def tearDown(self):
+        shapes._library = None  #back to the built in shapes
+        shutil.rmtree(self.folder)
+    def test_register(self):
+        self.assertEqual(shapes.registerShape('star',STAR,description='A flat star.'),'star')
+        shape = shapes.getShape('star')
+        self.assertEqual((shape['degree'],shape['knots'],shape['points'][1]),(1,list(range(9)),(0.3,0,0.3)))
+        self.assertEqual(shapes.availableShapes()['star'],'A flat star.')
+        self.assertRaises(ValueError,shapes.registerShape,'star',STAR)  #taken
+        shapes.registerShape('star',[v for point in STAR[:4] for v in point],degree=3,replace=True)  #flat values work too
+        self.assertEqual(shapes.getShape('star')['knots'],[0,0,0,1,1,1])
+        self.assertRaises(ValueError,shapes.registerShape,'sh01',STAR)  #built in shapes are taken as well
+    def test_validation(self):
+        self.assertRaises(ValueError,shapes.registerShape,'bad',[0,0,1,0,1])  #not x,y,z values
+        self.assertRaises(ValueError,shapes.registerShape,'bad',[[0,0,0]])  #a single point
+        self.assertRaises(ValueError,shapes.registerShape,'bad',STAR[:3],degree=3)  #not enough points for the degree
+        self.assertRaises(ValueError,shapes.registerShape,'bad',STAR,knots=[0,1,2])
+        self.assertIsNone(shapes.getShape('bad'))
+    def test_load(self):
+        path = os.path.join(self.folder,'shapes.json')
+        with open(path,'w') as f:
+            json.dump({'star':{'points':STAR,'description':'A flat star.'},'hoop':{'points':STAR[:5],'degree':3,'knots':[0,0,0,1,2,2,2]}},f)
+        self.assertEqual(sorted(shapes.loadShapes(path)),['hoop','star'])
+        self.assertEqual(shapes.getShape('hoop')['degree'],3)
+        self.assertRaises(ValueError,shapes.loadShapes,path)  #already there
+        self.assertEqual(sorted(shapes.loadShapes(path,replace=True)),['hoop','star'])
+    def test_build(self):
+        scene = MemoryScene()
+        spineRig.setBackend(scene)
+        try:
+            shapes.registerShape('star',STAR)
+            curve = spineRig.MakeNodes().createCurve('bob','star','spine','ctrl')
+            self.assertEqual((scene.getAttr(str(curve) + '.degree'),scene.getAttr(str(curve) + '.spans')),(1,len(STAR) - 1))
+            self.assertIsNone(spineRig.MakeNodes().createCurve('bob','nothing','spine','ctrl'))  #unknown shapes print the help hint
+        finally:
+            spineRig.setBackend(spineRig.MayaBackend())
+if __name__ == '__main__':
+    unittest.main()
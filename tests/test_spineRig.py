@@ -0,0 +1,71 @@
+"""
+Spine rig builds and updates against the in memory scene, one per build mode.
+
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JasonWhyttes_autoRig as spineRig
+from autoRig import benchmark, geometry
+from autoRig.memoryScene import MemoryScene
+MODES = (('network',{}),  #name : buildSpineRig keyword arguments
+         ('keys',{'switchMode':'keys'}),
+         ('matrix',{'constraintMode':'matrix'}),
+         ('keys matrix',{'switchMode':'keys','constraintMode':'matrix'}),
+         ('flatten',{'flatten':True}),
+         ('flatten matrix',{'flatten':True,'constraintMode':'matrix'}),
+         ('lod',{'bindJointAmount':13}),
+         ('lod matrix',{'bindJointAmount':13,'constraintMode':'matrix'}),
+         ('aim',{'aimJoints':True}),
+         ('smoothstep',{'fkFalloff':'smoothstep'}))
+MODES += tuple(('distribution {}'.format(d),{'distribution':d}) for d in geometry.DISTRIBUTIONS)
+def build(jointAmount,**kwargs):
+    """Build a fit rig, move its chest up and a spine rig from it, returns the scene and builder."""
+    scene = MemoryScene()
+    spineRig.setBackend(scene)
+    rig = spineRig.BuildRigs('bob')
+    fitRig = [str(i) for i in rig.buildFitRig('fitRig')]
+    scene.xform(fitRig[1],t=(0,3,0))
+    rig.buildSpineRig('mainRig',fitRig,jointAmount,**kwargs)
+    return scene, rig
+def connections(scene):
+    return sorted((src[0].name,src[1],dst[0].name,dst[1]) for dst, src in scene.inputs.items())
+class SpineRigTest(unittest.TestCase):
+    def tearDown(self):
+        spineRig.setBackend(spineRig.MayaBackend())
+    def check(self,name,kwargs):
+        scene, rig = build(5,**kwargs)
+        record = rig.findSpineRig('mainRig')
+        self.assertEqual(len(record['chains']['resultChain']),5,name)
+        for key, value in kwargs.items():
+            self.assertEqual(record[key],value,name)
+        rig.updateSpineRig('mainRig',9)  #only the joint amount changes, every other setting is kept from the record
+        record = rig.findSpineRig('mainRig')
+        for key, value in kwargs.items():
+            self.assertEqual(record[key],value,name)
+        fresh, _ = build(9,**kwargs)
+        self.assertEqual(sorted(scene.nodes),sorted(fresh.nodes),name)
+        self.assertEqual(connections(scene),connections(fresh),name)
+        for node in fresh.nodes:
+            if fresh.nodes[node].dag:
+                for a, b in zip(scene.xform(node,q=1,m=1,ws=1),fresh.xform(node,q=1,m=1,ws=1)):
+                    self.assertAlmostEqual(a,b,6,'{} {}'.format(name,node))
+    def test_modes(self):
+        for name, kwargs in MODES:
+            self.check(name,kwargs)
+    def test_update_switches_mode(self):
+        scene, rig = build(5,constraintMode='matrix',bindJointAmount=9)
+        rig.updateSpineRig('mainRig',7,constraintMode='constraints',bindJointAmount=None)
+        fresh, _ = build(7)
+        self.assertEqual(sorted(scene.nodes),sorted(fresh.nodes))
+        self.assertEqual(connections(scene),connections(fresh))
+    def test_estimates(self):
+        self.assertEqual(benchmark.estimateErrors(),[])  #dry runs plan the calls and nodes the builds make
+    def test_unknown_settings(self):
+        for kwargs in ({'constraintMode':'nodes'},{'distribution':'spiral'}):
+            self.assertRaises(ValueError,build,5,**kwargs)
+if __name__ == '__main__':
+    unittest.main()